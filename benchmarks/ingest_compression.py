@@ -0,0 +1,110 @@
+"""Benchmark gzip request compression for event ingestion.
+
+Sends the same synthetic events to a local stand-in for the ingest endpoint,
+once uncompressed and once through ``GzipRequestTransport``, and reports the
+bytes on the wire and wall time for each. The server reads request bodies at
+a capped rate to model an egress-constrained runner.
+
+    python benchmarks/ingest_compression.py --events 50000 --bandwidth 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from polar_sdk import Polar
+
+from polar_cli.client import compressing_http_client
+from polar_cli.ingest import batch_events
+
+
+class IngestHandler(BaseHTTPRequestHandler):
+    bytes_per_second: float = 0.0
+    received = 0
+    lock = threading.Lock()
+
+    def do_POST(self) -> None:
+        length = int(self.headers["Content-Length"])
+        body = self._read(length)
+        with self.lock:
+            type(self).received += length
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        inserted = len(json.loads(body)["events"])
+        payload = json.dumps({"inserted": inserted, "duplicates": 0}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read(self, length: int) -> bytes:
+        if not self.bytes_per_second:
+            return self.rfile.read(length)
+        chunks, chunk_size = [], 16 * 1024
+        while length:
+            chunk = self.rfile.read(min(chunk_size, length))
+            length -= len(chunk)
+            chunks.append(chunk)
+            time.sleep(len(chunk) / self.bytes_per_second)
+        return b"".join(chunks)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def make_events(count: int) -> list[dict[str, object]]:
+    rng = random.Random(42)
+    names = ["api_call", "tokens_used", "storage_gb", "seat_added"]
+    return [
+        {
+            "name": rng.choice(names),
+            "external_customer_id": f"customer-{rng.randrange(5000):05d}",
+            "external_id": f"evt-{i:09d}",
+            "metadata": {"model": rng.choice(["small", "large"]), "tokens": rng.randrange(1, 8000), "region": "eu-west-1"},
+        }
+        for i in range(count)
+    ]
+
+
+def run(url: str, events: list[dict[str, object]], compress: bool) -> tuple[int, float]:
+    IngestHandler.received = 0
+    kwargs = {"client": compressing_http_client()} if compress else {}
+    client = Polar(access_token="benchmark", server_url=url, **kwargs)
+    started = time.perf_counter()
+    for batch in batch_events(events):
+        client.events.ingest(request={"events": batch})
+    return IngestHandler.received, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--bandwidth", type=float, default=10.0, help="Upload bandwidth in Mbit/s (0 for unlimited).")
+    args = parser.parse_args()
+
+    IngestHandler.bytes_per_second = args.bandwidth * 1_000_000 / 8
+    server = ThreadingHTTPServer(("127.0.0.1", 0), IngestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    events = make_events(args.events)
+
+    results = {mode: run(url, events, mode == "gzip") for mode in ("plain", "gzip")}
+    server.shutdown()
+
+    plain_bytes, plain_time = results["plain"]
+    print(f"{'mode':<6} {'bytes on wire':>14} {'seconds':>8} {'events/s':>10}")
+    for mode, (sent, elapsed) in results.items():
+        print(f"{mode:<6} {sent:>14,} {elapsed:>8.2f} {len(events) / elapsed:>10,.0f}")
+    gzip_bytes, gzip_time = results["gzip"]
+    print(f"\nbytes saved: {1 - gzip_bytes / plain_bytes:.0%}, time saved: {1 - gzip_time / plain_time:.0%}")
+
+
+if __name__ == "__main__":
+    main()
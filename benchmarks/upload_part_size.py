@@ -0,0 +1,107 @@
+"""Benchmark fixed versus adaptive part sizing for multipart file uploads.
+
+Uploads the same file to a local stand-in for S3's presigned part URLs, once
+in fixed 5 MiB parts and once in parts sized by ``choose_part_size`` from the
+throughput measured on the fixed run (as ``files upload`` does from earlier
+uploads). It reports the part count, wall time and throughput for each. The
+server adds a fixed delay per request to model S3's per-request round trip
+and caps each connection's read rate to model an upload link.
+
+    python benchmarks/upload_part_size.py --size 1024 --latency 60 --bandwidth 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from polar_cli.upload import (
+    CHUNK_SIZE,
+    MiB,
+    MappedFile,
+    PresignedPart,
+    choose_part_size,
+    part_checksums,
+    plan_parts,
+    upload_http_client,
+    upload_parts,
+)
+
+
+class PartHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency: float = 0.0
+    bytes_per_second: float = 0.0
+
+    def do_PUT(self) -> None:
+        time.sleep(self.latency)
+        length = int(self.headers["Content-Length"])
+        while length:
+            chunk = self.rfile.read(min(256 * 1024, length))
+            length -= len(chunk)
+            if self.bytes_per_second:
+                time.sleep(len(chunk) / self.bytes_per_second)
+        self.send_response(200)
+        self.send_header("ETag", f'"{self.path.strip("/")}"')
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def run(url: str, path: Path, part_size: int, concurrency: int) -> tuple[int, float]:
+    with MappedFile(path) as mapped, upload_http_client(concurrency) as http:
+        parts = plan_parts(mapped.size, part_size)
+        started = time.perf_counter()
+        checksums = part_checksums(mapped, parts)
+        presigned = [PresignedPart(p.number, p.start, p.end, f"{url}/{p.number}") for p in parts]
+        upload_parts(http, mapped, presigned, checksums, concurrency)
+        return len(parts), time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1024, help="File size in MiB.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=60.0, help="Added delay per part request in ms.")
+    parser.add_argument("--bandwidth", type=float, default=200.0, help="Per-connection bandwidth in Mbit/s (0 for unlimited).")
+    args = parser.parse_args()
+
+    PartHandler.latency = args.latency / 1000
+    PartHandler.bytes_per_second = args.bandwidth * 1_000_000 / 8
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PartHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "upload.bin"
+        block = os.urandom(MiB)
+        with open(path, "wb") as f:
+            for _ in range(args.size):
+                f.write(block)
+        size = path.stat().st_size
+
+        results = {"fixed": run(url, path, CHUNK_SIZE, args.concurrency)}
+        parts, elapsed = results["fixed"]
+        measured = size / elapsed / min(args.concurrency, parts)
+        adaptive_size = choose_part_size(size, measured, args.concurrency)
+        results["adaptive"] = run(url, path, adaptive_size, args.concurrency)
+    server.shutdown()
+
+    print(f"file: {size // MiB} MiB, adaptive part size: {adaptive_size // MiB} MiB")
+    print(f"{'mode':<9} {'parts':>6} {'seconds':>8} {'MiB/s':>8}")
+    for mode, (parts, elapsed) in results.items():
+        print(f"{mode:<9} {parts:>6} {elapsed:>8.2f} {size / MiB / elapsed:>8.1f}")
+    (fixed_parts, fixed_time), (adaptive_parts, adaptive_time) = results["fixed"], results["adaptive"]
+    print(f"\nparts saved: {1 - adaptive_parts / fixed_parts:.0%}, time saved: {1 - adaptive_time / fixed_time:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -39,6 +39,7 @@ COMMANDS = [
     ("event-types", "View event types"),
     ("files", "Manage files"),
     ("members", "Manage members"),
+    ("batch", "Run operations from a file"),
 ]
 
 OPTIONS = [
@@ -137,6 +138,7 @@ def main_callback(
 
 # Import and register sub-commands
 from polar_cli.commands.auth import app as auth_app  # noqa: E402
+from polar_cli.commands.batch import run_batch  # noqa: E402
 from polar_cli.commands.benefit_grants import app as benefit_grants_app  # noqa: E402
 from polar_cli.commands.benefits import app as benefits_app  # noqa: E402
 from polar_cli.commands.checkout_links import app as checkout_links_app  # noqa: E402
@@ -183,6 +185,7 @@ app.add_typer(benefit_grants_app)
 app.add_typer(event_types_app)
 app.add_typer(files_app)
 app.add_typer(members_app)
+app.command("batch")(run_batch)
 
 
 def main() -> None:
@@ -0,0 +1,226 @@
+"""Helpers for running one API call over many inputs concurrently."""
+
+from __future__ import annotations
+
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Generic, Iterable, Iterator, TypeVar
+
+import httpx
+import typer
+from rich.console import Console
+
+from polar_cli.client import get_client
+from polar_cli.errors import EXIT_ERROR, CLIError, to_cli_error
+from polar_cli.output import Column, render_detail, render_stream_item
+from polar_cli.utils import get_output_format, resolve_id
+
+if TYPE_CHECKING:
+    from polar_sdk import Polar
+
+console = Console(stderr=True)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_ATTEMPTS = 4
+PAGE_LIMIT = 100
+
+# Statuses worth retrying: throttling, timeouts and transient server errors
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+# Statuses that mean the request was rejected before being applied
+NOT_APPLIED_STATUS_CODES = {429, 503}
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(frozen=True, slots=True)
+class Outcome(Generic[T, R]):
+    """Result of applying a function to one input: either a value or an error."""
+
+    item: T
+    value: R | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _call(fn: Callable[[T], R], item: T) -> Outcome[T, R]:
+    try:
+        return Outcome(item, value=fn(item))
+    except Exception as exc:
+        return Outcome(item, error=exc)
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Whether a failed call may succeed if repeated."""
+    if isinstance(exc, httpx.TransportError):
+        return True
+    return getattr(exc, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def is_not_applied(exc: Exception) -> bool:
+    """Whether a failed call certainly had no effect, so even a non-idempotent one may be repeated."""
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout)):
+        return True
+    return getattr(exc, "status_code", None) in NOT_APPLIED_STATUS_CODES
+
+
+def call_with_retries(
+    fn: Callable[[], R],
+    attempts: int = DEFAULT_ATTEMPTS,
+    base_delay: float = 0.5,
+    max_delay: float = 30.0,
+    retryable: Callable[[Exception], bool] = is_retryable,
+) -> R:
+    """Call ``fn``, retrying failures ``retryable`` accepts with jittered exponential backoff."""
+    if attempts < 1:
+        raise ValueError("attempts must be at least 1")
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn()
+        except Exception as exc:
+            if attempt >= attempts or not retryable(exc):
+                raise
+            delay = min(max_delay, base_delay * 2 ** (attempt - 1))
+            time.sleep(delay * random.uniform(0.5, 1.0))
+    raise AssertionError("unreachable")
+
+
+def run_concurrently(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Iterator[Outcome[T, R]]:
+    """Apply ``fn`` to each item on a thread pool, yielding outcomes in input order.
+
+    At most ``2 * concurrency`` calls are in flight, so ``items`` can be a lazy
+    iterator over a large input and results stream out as soon as the head of
+    the window completes. Exceptions are captured per item, never raised.
+    """
+    concurrency = max(1, concurrency)
+    window: deque[Future[Outcome[T, R]]] = deque()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for item in items:
+            window.append(pool.submit(_call, fn, item))
+            if len(window) >= 2 * concurrency:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart, across threads.
+
+    A rate of zero or less disables the limit.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the caller's slot comes up."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            self._sleep(slot - now)
+
+
+def _page_items(res: Any) -> tuple[list[Any], Any]:
+    # Most list endpoints wrap items in ``result``; a few (events) don't.
+    body = getattr(res, "result", None) or res
+    return body.items, body.pagination
+
+
+def iter_all(
+    list_fn: Callable[..., Any],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    **kwargs: Any,
+) -> Iterator[Any]:
+    """Yield every item of a paginated list endpoint, in page order.
+
+    The first page tells us how many pages there are; the rest are fetched
+    concurrently (with retries) and yielded in order as they arrive.
+    """
+    def fetch(page: int) -> Any:
+        return call_with_retries(lambda: list_fn(page=page, limit=PAGE_LIMIT, **kwargs))
+
+    items, pagination = _page_items(fetch(1))
+    yield from items
+    for outcome in run_concurrently(fetch, range(2, pagination.max_page + 1), concurrency):
+        if outcome.error is not None:
+            raise outcome.error
+        yield from _page_items(outcome.value)[0]
+
+
+def read_ids(ids: list[str] | None, ids_from: str | None) -> list[str]:
+    """Collect IDs from arguments and/or a file (``-`` for stdin), one per line.
+
+    Blank lines and ``#`` comments are skipped; short ID prefixes are expanded.
+    """
+    collected = list(ids or [])
+    if ids_from:
+        text = sys.stdin.read() if ids_from == "-" else Path(ids_from).read_text()
+        for line in text.splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                collected.append(line)
+    if not collected:
+        raise CLIError("No IDs given.", hint="Pass IDs as arguments or use --ids-from FILE")
+    return [resolve_id(id) for id in collected]
+
+
+def get_many(
+    ctx: typer.Context,
+    ids: list[str],
+    fetch: Callable[[Polar, str], object],
+    fields: list[Column],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> None:
+    """Fetch and render one or more resources by ID.
+
+    A single ID behaves like a plain ``get``. With several IDs, requests run
+    concurrently over one client and results stream in input order; failed IDs
+    are reported on stderr without aborting the rest, and the command exits
+    non-zero if any failed.
+    """
+    output_format = get_output_format(ctx)
+    client = get_client(ctx)
+    if len(ids) == 1:
+        with client:
+            obj = fetch(client, ids[0])
+        render_detail(obj, fields, output_format)
+        return
+
+    failed = 0
+    with client:
+        for outcome in run_concurrently(lambda id: fetch(client, id), ids, concurrency):
+            if outcome.ok:
+                render_stream_item(outcome.value, fields, output_format)
+            else:
+                failed += 1
+                err = to_cli_error(outcome.error)
+                console.print(f"[bold red]{outcome.item}:[/bold red] {err.title}: {err.message}")
+    if failed:
+        console.print(f"[bold red]{failed} of {len(ids)} lookups failed.[/bold red]")
+        raise typer.Exit(EXIT_ERROR)
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import gzip
+
+import httpx
 import typer
 from polar_sdk import Polar
 from rich.console import Console
@@ -17,37 +20,107 @@ SERVER_URLS: dict[Environment, str] = {
     Environment.SANDBOX: "https://sandbox-api.polar.sh",
 }
 
+# Request bodies smaller than this aren't worth the CPU to compress
+COMPRESS_MIN_BYTES = 16 * 1024
+COMPRESS_LEVEL = 6
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+class GzipRequestTransport(httpx.BaseTransport):
+    """Transport that gzips large request bodies.
+
+    Bodies of at least ``min_bytes`` on requests that don't already carry a
+    ``Content-Encoding`` are compressed, unless compression doesn't make them
+    smaller. Everything else passes through to the wrapped transport.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport | None = None,
+        min_bytes: int = COMPRESS_MIN_BYTES,
+        level: int = COMPRESS_LEVEL,
+    ) -> None:
+        self._transport = transport or httpx.HTTPTransport()
+        self.min_bytes = min_bytes
+        self.level = level
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._transport.handle_request(self._compress(request))
+
+    def _compress(self, request: httpx.Request) -> httpx.Request:
+        if "content-encoding" in request.headers:
+            return request
+        body = request.read()
+        if len(body) < self.min_bytes:
+            return request
+        compressed = gzip.compress(body, compresslevel=self.level)
+        if len(compressed) >= len(body):
+            return request
+        headers = request.headers.copy()
+        headers["Content-Encoding"] = "gzip"
+        headers["Content-Length"] = str(len(compressed))
+        return httpx.Request(
+            request.method,
+            request.url,
+            headers=headers,
+            content=compressed,
+            extensions=request.extensions,
+        )
 
-def get_client(ctx: typer.Context) -> Polar:
-    """Create a Polar SDK client from the current CLI context."""
+    def close(self) -> None:
+        self._transport.close()
+
+
+def compressing_http_client(min_bytes: int = COMPRESS_MIN_BYTES) -> httpx.Client:
+    """An httpx client that gzips large request bodies and accepts compressed responses."""
+    return httpx.Client(
+        transport=GzipRequestTransport(min_bytes=min_bytes),
+        headers={"Accept-Encoding": ACCEPT_ENCODING},
+        follow_redirects=True,
+    )
+
+
+def get_client(ctx: typer.Context, compress: bool = False) -> Polar:
+    """Create a Polar SDK client from the current CLI context.
+
+    With ``compress``, large request bodies (bulk ingestion, batch writes) are
+    sent gzip-compressed.
+    """
     cli_ctx = get_cli_context(ctx)
     token = _require_token(cli_ctx)
+    kwargs = {"client": compressing_http_client()} if compress else {}
 
     if cli_ctx.base_url:
-        return Polar(access_token=token, server_url=cli_ctx.base_url)
+        return Polar(access_token=token, server_url=cli_ctx.base_url, **kwargs)
 
     server = "sandbox" if cli_ctx.sandbox else "production"
-    return Polar(access_token=token, server=server)
+    return Polar(access_token=token, server=server, **kwargs)
+
 
+def get_base_url(ctx: typer.Context, environment: Environment | None = None) -> str:
+    """Get the API base URL for direct HTTP calls (e.g. SSE).
 
-def get_base_url(ctx: typer.Context) -> str:
-    """Get the API base URL for direct HTTP calls (e.g. SSE)."""
+    ``environment`` overrides the one selected on the command line; a custom
+    ``--base-url`` only applies to the selected environment.
+    """
     cli_ctx = get_cli_context(ctx)
-    if cli_ctx.base_url:
+    environment = environment or cli_ctx.environment
+    if cli_ctx.base_url and environment == cli_ctx.environment:
         return cli_ctx.base_url.rstrip("/")
-    return SERVER_URLS[cli_ctx.environment]
+    return SERVER_URLS[environment]
 
 
-def require_token(ctx: typer.Context) -> str:
-    """Get the access token or exit with an error."""
+def require_token(ctx: typer.Context, environment: Environment | None = None) -> str:
+    """Get the access token (for ``environment`` if given) or exit with an error."""
     cli_ctx = get_cli_context(ctx)
-    return _require_token(cli_ctx)
+    return _require_token(cli_ctx, environment)
 
 
-def _require_token(cli_ctx: CliContext) -> str:
-    token = get_token(cli_ctx.environment)
+def _require_token(cli_ctx: CliContext, environment: Environment | None = None) -> str:
+    environment = environment or cli_ctx.environment
+    token = get_token(environment)
     if token is None:
-        sandbox_flag = " --sandbox" if cli_ctx.sandbox else ""
+        sandbox_flag = " --sandbox" if environment == Environment.SANDBOX else ""
         console.print(
             f"[bold red]Not authenticated.[/bold red] "
             f"Run [bold]polar auth login{sandbox_flag}[/bold] first."
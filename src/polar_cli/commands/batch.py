@@ -0,0 +1,232 @@
+"""Batch command: run many API operations from an NDJSON file."""
+
+
+import hashlib
+import json
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any, Callable, Iterator
+
+import typer
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeRemainingColumn
+
+from polar_cli.bulk import DEFAULT_ATTEMPTS, DEFAULT_CONCURRENCY, call_with_retries, is_not_applied, is_retryable, run_concurrently
+from polar_cli.client import get_client
+from polar_cli.errors import EXIT_ERROR, CLIError, handle_errors, to_cli_error
+
+if TYPE_CHECKING:
+    from polar_sdk import Polar
+
+console = Console()
+
+Headers = dict[str, str]
+Operation = Callable[["Polar", dict[str, Any], Headers], object]
+
+
+def _update(namespace: str, method: str, body_param: str) -> Operation:
+    def call(client: "Polar", args: dict[str, Any], headers: Headers) -> object:
+        args = dict(args)
+        id = args.pop("id")
+        return getattr(getattr(client, namespace), method)(id=id, **{body_param: args}, http_headers=headers)
+    return call
+
+
+def _by_id(namespace: str, method: str) -> Operation:
+    def call(client: "Polar", args: dict[str, Any], headers: Headers) -> object:
+        return getattr(getattr(client, namespace), method)(id=args["id"], http_headers=headers)
+    return call
+
+
+def _request(namespace: str, method: str) -> Operation:
+    def call(client: "Polar", args: dict[str, Any], headers: Headers) -> object:
+        return getattr(getattr(client, namespace), method)(request=args, http_headers=headers)
+    return call
+
+
+# Operation name -> SDK call, mirroring the request shapes of the matching commands.
+OPERATIONS: dict[str, Operation] = {
+    "benefits.create": _request("benefits", "create"),
+    "benefits.update": _update("benefits", "update", "request_body"),
+    "benefits.delete": _by_id("benefits", "delete"),
+    "checkout-links.create": _request("checkout_links", "create"),
+    "checkout-links.update": _update("checkout_links", "update", "checkout_link_update"),
+    "checkout-links.delete": _by_id("checkout_links", "delete"),
+    "checkouts.create": _request("checkouts", "create"),
+    "checkouts.update": _update("checkouts", "update", "checkout_update"),
+    "custom-fields.create": _request("custom_fields", "create"),
+    "custom-fields.update": _update("custom_fields", "update", "custom_field_update"),
+    "custom-fields.delete": _by_id("custom_fields", "delete"),
+    "customers.create": _request("customers", "create"),
+    "customers.update": _update("customers", "update", "customer_update"),
+    "customers.delete": _by_id("customers", "delete"),
+    "discounts.create": _request("discounts", "create"),
+    "discounts.update": _update("discounts", "update", "discount_update"),
+    "discounts.delete": _by_id("discounts", "delete"),
+    "events.ingest": _request("events", "ingest"),
+    "license-keys.update": _update("license_keys", "update", "license_key_update"),
+    "meters.create": _request("meters", "create"),
+    "meters.update": _update("meters", "update", "meter_update"),
+    "orders.update": _update("orders", "update", "order_update"),
+    "products.create": _request("products", "create"),
+    "products.update": _update("products", "update", "product_update"),
+    "refunds.create": _request("refunds", "create"),
+    "subscriptions.create": _request("subscriptions", "create"),
+    "subscriptions.update": _update("subscriptions", "update", "subscription_update"),
+    "subscriptions.revoke": _by_id("subscriptions", "revoke"),
+}
+
+# Operations that add a resource or event on every call. One that timed out or hit a 5xx
+# may have been applied, and repeating it could create a duplicate.
+NON_IDEMPOTENT = frozenset(op for op in OPERATIONS if op.endswith(".create")) | {"events.ingest"}
+
+
+@dataclass(slots=True)
+class BatchOp:
+    line: int
+    op: str = ""
+    args: dict[str, Any] = field(default_factory=dict)
+    key: str = ""
+    error: str | None = None
+    skip: bool = False
+
+
+def _idempotency_key(op: str, args: dict[str, Any]) -> str:
+    canonical = json.dumps({"op": op, "args": args}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+def _parse_line(line_no: int, text: str) -> BatchOp:
+    """Parse one ``{"op": ..., "args": {...}, "key": ...}`` line."""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as exc:
+        return BatchOp(line_no, error=f"Invalid JSON: {exc}")
+    if not isinstance(data, dict):
+        return BatchOp(line_no, error="Expected a JSON object")
+    op = str(data.get("op", "")).replace(" ", ".")
+    args = data.get("args") or {}
+    if op not in OPERATIONS:
+        return BatchOp(line_no, op=op, error=f"Unknown operation: {op or '(missing)'}")
+    if not isinstance(args, dict):
+        return BatchOp(line_no, op=op, error="'args' must be a JSON object")
+    key = str(data.get("key") or _idempotency_key(op, args))
+    return BatchOp(line_no, op=op, args=args, key=key)
+
+
+def _read_ops(source: str) -> Iterator[BatchOp]:
+    stream = nullcontext(sys.stdin) if source == "-" else open(source)
+    with stream as lines:
+        for line_no, text in enumerate(lines, start=1):
+            if text.strip():
+                yield _parse_line(line_no, text)
+
+
+def _completed_keys(results: Path) -> set[str]:
+    """Idempotency keys recorded as succeeded in an earlier results file."""
+    keys: set[str] = set()
+    if not results.exists():
+        return keys
+    for text in results.read_text().splitlines():
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError:
+            continue
+        if record.get("status") == "ok" and record.get("key"):
+            keys.add(record["key"])
+    return keys
+
+
+def _count_lines(source: str) -> int | None:
+    if source == "-":
+        return None
+    with open(source, "rb") as f:
+        return sum(1 for line in f if line.strip())
+
+
+@handle_errors
+def run_batch(
+    ctx: typer.Context,
+    ops_file: Annotated[str, typer.Argument(help="NDJSON file of operations ('-' for stdin).")],
+    results: Annotated[str | None, typer.Option("--results", help="Where to write per-line results (NDJSON). Defaults to <ops_file>.results.ndjson.")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Operations to run in parallel.")] = DEFAULT_CONCURRENCY,
+    attempts: Annotated[int, typer.Option("--attempts", min=1, help="Attempts per operation for transient failures. Creates are only retried when the request was certainly not applied (connection refused, 429, 503).")] = DEFAULT_ATTEMPTS,
+    resume: Annotated[bool, typer.Option("--resume", help="Skip operations that already succeeded in the results file.")] = False,
+    compress: Annotated[bool, typer.Option("--compress", help="Gzip large request bodies (for bandwidth-constrained networks).")] = False,
+) -> None:
+    """Run operations from an NDJSON file.
+
+    Each line is {"op": "customers.create", "args": {...}, "key": "..."}; "key"
+    is an optional idempotency key (derived from op and args when omitted),
+    sent as an Idempotency-Key header and used by --resume. Update and delete
+    operations take the resource "id" inside "args".
+    """
+    if ops_file != "-" and not Path(ops_file).exists():
+        raise CLIError(f"File not found: {ops_file}")
+    if results is None:
+        if ops_file == "-":
+            raise CLIError("Reading operations from stdin requires --results.")
+        results = f"{ops_file}.results.ndjson"
+    results_path = Path(results)
+    done = _completed_keys(results_path) if resume else set()
+    if not resume:
+        results_path.write_text("")
+
+    client = get_client(ctx, compress=compress)
+
+    def execute(batch_op: BatchOp) -> object:
+        if batch_op.error:
+            raise CLIError(batch_op.error)
+        if batch_op.skip:
+            return None
+        headers = {"Idempotency-Key": batch_op.key}
+        retryable = is_not_applied if batch_op.op in NON_IDEMPOTENT else is_retryable
+        return call_with_retries(
+            lambda: OPERATIONS[batch_op.op](client, batch_op.args, headers), attempts, retryable=retryable
+        )
+
+    def ops() -> Iterator[BatchOp]:
+        for batch_op in _read_ops(ops_file):
+            batch_op.skip = batch_op.key in done
+            yield batch_op
+
+    counts = {"ok": 0, "error": 0, "skipped": 0}
+    started = time.monotonic()
+    progress = Progress(
+        TextColumn("[bold]Running[/bold]"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("[green]{task.fields[ok]} ok[/green] [red]{task.fields[failed]} failed[/red]"),
+        TimeRemainingColumn(),
+        console=console,
+    )
+    with client, progress, results_path.open("a") as out:
+        task = progress.add_task("batch", total=_count_lines(ops_file), ok=0, failed=0)
+        for outcome in run_concurrently(execute, ops(), concurrency):
+            batch_op = outcome.item
+            record: dict[str, object] = {"line": batch_op.line, "op": batch_op.op, "key": batch_op.key}
+            if not outcome.ok:
+                err = to_cli_error(outcome.error)
+                record.update(status="error", error=f"{err.title}: {err.message}")
+                counts["error"] += 1
+            elif batch_op.skip:
+                record["status"] = "skipped"
+                counts["skipped"] += 1
+            else:
+                record.update(status="ok", id=getattr(outcome.value, "id", None))
+                counts["ok"] += 1
+            out.write(json.dumps(record, default=str) + "\n")
+            progress.update(task, advance=1, ok=counts["ok"], failed=counts["error"])
+
+    elapsed = time.monotonic() - started
+    total = sum(counts.values())
+    console.print(
+        f"[bold]Done:[/bold] {counts['ok']} ok, {counts['error']} failed, {counts['skipped']} skipped "
+        f"in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} ops/s)"
+    )
+    console.print(f"[dim]Results: {results_path}[/dim]")
+    if counts["error"]:
+        raise typer.Exit(EXIT_ERROR)
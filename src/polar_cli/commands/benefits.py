@@ -6,10 +6,11 @@ from typing import Annotated
 import typer
 from rich.console import Console
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 app = typer.Typer(name="benefits", help="Manage benefits.")
 console = Console()
@@ -57,13 +58,12 @@ def list_benefits(
 @handle_errors
 def get_benefit(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Benefit ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Benefit ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a benefit."""
-    client = get_client(ctx)
-    with client:
-        benefit = client.benefits.get(id=id)
-    render_detail(benefit, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more benefits."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.benefits.get(id=id), DETAIL_FIELDS, concurrency)
 
 
 @app.command("create")
@@ -111,6 +111,7 @@ def delete_benefit(
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation.")] = False,
 ) -> None:
     """Delete a benefit."""
+    id = resolve_id(id)
     if not yes:
         typer.confirm(f"Delete benefit {id}?", abort=True)
     client = get_client(ctx)
@@ -127,6 +128,7 @@ def update_benefit(
     description: Annotated[str | None, typer.Option("--description", help="New description.")] = None,
 ) -> None:
     """Update a benefit."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if description is not None:
         update["description"] = description
@@ -159,6 +161,7 @@ def list_grants(
     limit: Annotated[int, typer.Option(help="Items per page.")] = 20,
 ) -> None:
     """List grants for a benefit."""
+    id = resolve_id(id)
     client = get_client(ctx)
     kwargs: dict[str, object] = {"id": id, "page": page, "limit": limit}
     if is_granted is not None:
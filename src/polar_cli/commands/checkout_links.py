@@ -6,10 +6,11 @@ from typing import Annotated
 import typer
 from rich.console import Console
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 app = typer.Typer(name="checkout-links", help="Manage checkout links.")
 console = Console()
@@ -55,13 +56,12 @@ def list_checkout_links(
 @handle_errors
 def get_checkout_link(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Checkout link ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Checkout link ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a checkout link."""
-    client = get_client(ctx)
-    with client:
-        link = client.checkout_links.get(id=id)
-    render_detail(link, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more checkout links."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.checkout_links.get(id=id), DETAIL_FIELDS, concurrency)
 
 
 @app.command("create")
@@ -94,6 +94,7 @@ def update_checkout_link(
     success_url: Annotated[str | None, typer.Option("--success-url", help="New success URL.")] = None,
 ) -> None:
     """Update a checkout link."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if label is not None:
         update["label"] = label
@@ -117,6 +118,7 @@ def delete_checkout_link(
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation.")] = False,
 ) -> None:
     """Delete a checkout link."""
+    id = resolve_id(id)
     if not yes:
         typer.confirm(f"Delete checkout link {id}?", abort=True)
     client = get_client(ctx)
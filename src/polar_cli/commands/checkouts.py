@@ -6,10 +6,11 @@ from typing import Annotated
 import typer
 from rich.console import Console
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 app = typer.Typer(name="checkouts", help="Manage checkout sessions.")
 console = Console()
@@ -60,13 +61,12 @@ def list_checkouts(
 @handle_errors
 def get_checkout(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Checkout ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Checkout ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a checkout session."""
-    client = get_client(ctx)
-    with client:
-        checkout = client.checkouts.get(id=id)
-    render_detail(checkout, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more checkout sessions."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.checkouts.get(id=id), DETAIL_FIELDS, concurrency)
 
 
 @app.command("create")
@@ -101,6 +101,7 @@ def update_checkout(
     customer_email: Annotated[str | None, typer.Option("--customer-email", help="New customer email.")] = None,
 ) -> None:
     """Update a checkout session."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if customer_email is not None:
         update["customer_email"] = customer_email
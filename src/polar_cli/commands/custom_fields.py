@@ -6,10 +6,11 @@ from typing import Annotated
 import typer
 from rich.console import Console
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 app = typer.Typer(name="custom-fields", help="Manage custom fields.")
 console = Console()
@@ -57,13 +58,12 @@ def list_custom_fields(
 @handle_errors
 def get_custom_field(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Custom field ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Custom field ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a custom field."""
-    client = get_client(ctx)
-    with client:
-        field = client.custom_fields.get(id=id)
-    render_detail(field, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more custom fields."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.custom_fields.get(id=id), DETAIL_FIELDS, concurrency)
 
 
 @app.command("create")
@@ -102,6 +102,7 @@ def update_custom_field(
     name: Annotated[str | None, typer.Option("--name", help="New name.")] = None,
 ) -> None:
     """Update a custom field."""
+    id = resolve_id(id)
     if name is None:
         console.print("[dim]Nothing to update.[/dim]")
         raise typer.Exit()
@@ -124,6 +125,7 @@ def delete_custom_field(
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation.")] = False,
 ) -> None:
     """Delete a custom field."""
+    id = resolve_id(id)
     if not yes:
         typer.confirm(f"Delete custom field {id}?", abort=True)
     client = get_client(ctx)
@@ -1,15 +1,32 @@
-"""Customer commands: list, get, create, update, delete."""
+"""Customer commands: list, get, create, update, delete, import."""
 
 
-from typing import Annotated
+import csv
+import hashlib
+import json
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Annotated, Any
 
 import typer
 from rich.console import Console
+from rich.progress import Progress
+from rich.table import Table
 
+from polar_cli.bulk import (
+    DEFAULT_CONCURRENCY,
+    call_with_retries,
+    get_many,
+    is_not_applied,
+    iter_all,
+    read_ids,
+    run_concurrently,
+)
 from polar_cli.client import get_client
-from polar_cli.errors import handle_errors
+from polar_cli.errors import EXIT_ERROR, CLIError, handle_errors, to_cli_error
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 app = typer.Typer(name="customers", help="Manage customers.")
 console = Console()
@@ -57,13 +74,12 @@ def list_customers(
 @handle_errors
 def get_customer(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Customer ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Customer ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a customer."""
-    client = get_client(ctx)
-    with client:
-        customer = client.customers.get(id=id)
-    render_detail(customer, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more customers."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.customers.get(id=id), DETAIL_FIELDS, concurrency)
 
 
 @app.command("create")
@@ -96,6 +112,7 @@ def update_customer(
     name: Annotated[str | None, typer.Option("--name", help="New name.")] = None,
 ) -> None:
     """Update a customer."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if email is not None:
         update["email"] = email
@@ -119,6 +136,7 @@ def delete_customer(
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation.")] = False,
 ) -> None:
     """Delete a customer."""
+    id = resolve_id(id)
     if not yes:
         typer.confirm(f"Delete customer {id}?", abort=True)
     client = get_client(ctx)
@@ -134,6 +152,7 @@ def get_state(
     id: Annotated[str, typer.Argument(help="Customer ID.")],
 ) -> None:
     """Get the state (active subscriptions, benefits) for a customer."""
+    id = resolve_id(id)
     client = get_client(ctx)
     with client:
         state = client.customers.get_state(id=id)
@@ -153,3 +172,169 @@ def export_customers(
         data = client.customers.export(organization_id=org_id)
     output = data.decode("utf-8") if isinstance(data, bytes) else data
     typer.echo(output)
+
+
+# --- CSV import ---
+
+
+class MatchBy(StrEnum):
+    EMAIL = "email"
+    EXTERNAL_ID = "external_id"
+
+
+IMPORT_FIELDS = ("email", "name", "external_id")
+METADATA_PREFIX = "metadata."
+
+
+@dataclass(slots=True)
+class ImportAction:
+    kind: str  # create, update, unchanged, duplicate
+    row: int
+    key: str
+    id: str | None = None
+    changes: dict[str, Any] = field(default_factory=dict)
+
+
+def _match_key(value: object, match: MatchBy) -> str:
+    key = str(value or "").strip()
+    return key.lower() if match == MatchBy.EMAIL else key
+
+
+def _row_fields(row: dict[str, str]) -> dict[str, Any]:
+    """Fields a CSV row sets; blank cells mean "leave as is"."""
+    fields: dict[str, Any] = {k: row[k].strip() for k in IMPORT_FIELDS if (row.get(k) or "").strip()}
+    metadata = {
+        k[len(METADATA_PREFIX):]: v.strip()
+        for k, v in row.items()
+        if k and k.startswith(METADATA_PREFIX) and (v or "").strip()
+    }
+    if metadata:
+        fields["metadata"] = metadata
+    return fields
+
+
+def _customer_fields(customer: Any) -> dict[str, Any]:
+    fields = {k: getattr(customer, k, None) for k in IMPORT_FIELDS}
+    fields["metadata"] = dict(getattr(customer, "metadata", None) or {})
+    return fields
+
+
+def _normalize(value: Any) -> Any:
+    # CSV cells are strings, so compare metadata values by their string form
+    if isinstance(value, dict):
+        return {k: str(v) for k, v in value.items()}
+    return value
+
+
+def _fingerprint(fields: dict[str, Any]) -> str:
+    normalized = {k: _normalize(v) for k, v in fields.items()}
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _plan_import(
+    rows: list[dict[str, str]],
+    existing: dict[str, tuple[str, dict[str, Any]]],
+    match: MatchBy,
+) -> list[ImportAction]:
+    """Diff CSV rows against existing customers (keyed by the match field)."""
+    actions: list[ImportAction] = []
+    seen: set[str] = set()
+    for row_no, row in enumerate(rows, start=2):  # row 1 is the header
+        wanted = _row_fields(row)
+        key = _match_key(wanted.get(match.value), match)
+        if not key:
+            raise CLIError(f"Row {row_no} has no {match.value}.")
+        if key in seen:
+            actions.append(ImportAction("duplicate", row_no, key))
+            continue
+        seen.add(key)
+
+        if key not in existing:
+            actions.append(ImportAction("create", row_no, key, changes=wanted))
+            continue
+
+        id, current = existing[key]
+        desired = {**current, **{k: v for k, v in wanted.items() if k not in ("metadata", match.value)}}
+        if "metadata" in wanted:
+            desired["metadata"] = {**current["metadata"], **wanted["metadata"]}
+        if _fingerprint(desired) == _fingerprint(current):
+            actions.append(ImportAction("unchanged", row_no, key, id=id))
+            continue
+        changes = {k: desired[k] for k in desired if _normalize(desired[k]) != _normalize(current[k])}
+        actions.append(ImportAction("update", row_no, key, id=id, changes=changes))
+    return actions
+
+
+def _render_plan(actions: list[ImportAction], sample: int = 20) -> None:
+    counts = {kind: sum(1 for a in actions if a.kind == kind) for kind in ("create", "update", "unchanged", "duplicate")}
+    console.print(
+        f"[bold]Plan:[/bold] [green]{counts['create']} to create[/green], "
+        f"[yellow]{counts['update']} to update[/yellow], {counts['unchanged']} unchanged"
+        + (f", [red]{counts['duplicate']} duplicate rows skipped[/red]" if counts["duplicate"] else "")
+    )
+    changes = [a for a in actions if a.kind in ("create", "update")]
+    if not changes:
+        return
+    table = Table(show_header=True, header_style="bold")
+    for header in ("Row", "Action", "Key", "Changes"):
+        table.add_column(header)
+    for action in changes[:sample]:
+        table.add_row(str(action.row), action.kind, action.key, json.dumps(action.changes, default=str))
+    console.print(table)
+    if len(changes) > sample:
+        console.print(f"[dim]... and {len(changes) - sample} more[/dim]")
+
+
+@app.command("import")
+@handle_errors
+def import_customers(
+    ctx: typer.Context,
+    csv_file: Annotated[Path, typer.Argument(help="CSV with email, name, external_id and metadata.<key> columns.")],
+    org: Annotated[str | None, typer.Option("--org", help="Organization ID.")] = None,
+    match: Annotated[MatchBy, typer.Option("--match", help="Column used to match existing customers.")] = MatchBy.EMAIL,
+    dry_run: Annotated[bool, typer.Option("--dry-run", help="Show the plan without making changes.")] = False,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests.")] = DEFAULT_CONCURRENCY,
+) -> None:
+    """Create or update customers from a CSV file, skipping unchanged rows."""
+    org_id = resolve_org_id(ctx, org)
+    with csv_file.open(newline="") as f:
+        reader = csv.DictReader(f)
+        if match.value not in (reader.fieldnames or []):
+            raise CLIError(f"CSV must have a '{match.value}' column.")
+        rows = list(reader)
+
+    client = get_client(ctx)
+    with client:
+        with console.status("Fetching existing customers...", spinner="dots"):
+            existing = {
+                _match_key(getattr(c, match.value, None), match): (c.id, _customer_fields(c))
+                for c in iter_all(client.customers.list, concurrency, organization_id=org_id)
+                if getattr(c, match.value, None)
+            }
+        actions = _plan_import(rows, existing, match)
+        _render_plan(actions)
+        todo = [a for a in actions if a.kind in ("create", "update")]
+        if dry_run or not todo:
+            return
+
+        def apply(action: ImportAction) -> object:
+            if action.kind == "create":
+                request = {**action.changes, "organization_id": org_id}
+                # A create that timed out or hit a 5xx may have been applied; repeating it could duplicate the customer
+                return call_with_retries(lambda: client.customers.create(request=request), retryable=is_not_applied)
+            return call_with_retries(lambda: client.customers.update(id=action.id, customer_update=action.changes))
+
+        failed = 0
+        with Progress(console=console) as progress:
+            task = progress.add_task("Importing", total=len(todo))
+            for outcome in run_concurrently(apply, todo, concurrency):
+                progress.advance(task)
+                if not outcome.ok:
+                    failed += 1
+                    err = to_cli_error(outcome.error)
+                    progress.console.print(f"[bold red]Row {outcome.item.row}:[/bold red] {err.title}: {err.message}")
+
+    console.print(f"[bold green]Imported {len(todo) - failed} customer(s).[/bold green]")
+    if failed:
+        console.print(f"[bold red]{failed} row(s) failed.[/bold red]")
+        raise typer.Exit(EXIT_ERROR)
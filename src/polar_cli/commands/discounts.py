@@ -6,10 +6,11 @@ from typing import Annotated
 import typer
 from rich.console import Console
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 app = typer.Typer(name="discounts", help="Manage discounts.")
 console = Console()
@@ -62,13 +63,12 @@ def list_discounts(
 @handle_errors
 def get_discount(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Discount ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Discount ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a discount."""
-    client = get_client(ctx)
-    with client:
-        discount = client.discounts.get(id=id)
-    render_detail(discount, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more discounts."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.discounts.get(id=id), DETAIL_FIELDS, concurrency)
 
 
 @app.command("create")
@@ -122,6 +122,7 @@ def update_discount(
     max_redemptions: Annotated[int | None, typer.Option("--max-redemptions", help="New max redemptions.")] = None,
 ) -> None:
     """Update a discount."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if name is not None:
         update["name"] = name
@@ -147,6 +148,7 @@ def delete_discount(
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation.")] = False,
 ) -> None:
     """Delete a discount."""
+    id = resolve_id(id)
     if not yes:
         typer.confirm(f"Delete discount {id}?", abort=True)
     client = get_client(ctx)
@@ -5,9 +5,10 @@ from typing import Annotated
 
 import typer
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
-from polar_cli.output import Column, render_detail, render_list
+from polar_cli.output import Column, render_list
 from polar_cli.utils import get_output_format, resolve_org_id
 
 app = typer.Typer(name="disputes", help="View disputes.")
@@ -56,10 +57,9 @@ def list_disputes(
 @handle_errors
 def get_dispute(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Dispute ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Dispute ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a dispute."""
-    client = get_client(ctx)
-    with client:
-        dispute = client.disputes.get(id=id)
-    render_detail(dispute, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more disputes."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.disputes.get(id=id), DETAIL_FIELDS, concurrency)
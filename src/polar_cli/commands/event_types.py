@@ -9,7 +9,7 @@ from rich.console import Console
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 app = typer.Typer(name="event-types", help="Manage event types.")
 console = Console()
@@ -56,6 +56,7 @@ def update_event_type(
     is_archived: Annotated[bool | None, typer.Option("--is-archived/--not-archived", help="Archive or unarchive.")] = None,
 ) -> None:
     """Update an event type."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if is_archived is not None:
         update["is_archived"] = is_archived
@@ -1,19 +1,56 @@
-"""Event commands: list, get, names, ingest."""
+"""Event commands: list, get, names, tail, ingest, flush, export, stats."""
 
 
 import json
-from typing import Annotated
+import shutil
+import sys
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict
+from datetime import UTC, datetime
+from enum import StrEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Callable, Generator, Iterator
 
 import typer
 from rich.console import Console
+from rich.progress import Progress, TextColumn
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, call_with_retries, get_many, iter_all, read_ids
 from polar_cli.client import get_client
-from polar_cli.errors import handle_errors
-from polar_cli.output import Column, render_detail, render_list
+from polar_cli.config import Environment, OutputFormat, get_default_org_id
+from polar_cli.errors import EXIT_ERROR, CLIError, handle_errors, to_cli_error
+from polar_cli.context import get_cli_context
+from polar_cli.dedup import EventDeduper, event_deduper
+from polar_cli.event_store import EventStore, EventStoreWriter, stats_by_code, stats_by_time
+from polar_cli.export import (
+    checkpoint_dir,
+    export_shards,
+    load_merge_state,
+    pinned_end,
+    plan_shards,
+    remove_checkpoints,
+    save_merge_state,
+)
+from polar_cli.ingest import (
+    DEFAULT_INGEST_CONCURRENCY,
+    MAX_BATCH_EVENTS,
+    IngestStats,
+    batch_events,
+    flush_spool,
+    ingest_batches,
+    iter_ndjson,
+)
+from polar_cli.output import Column, render_list, render_stream_item
+from polar_cli.spool import Spool, event_spool
+from polar_cli.tail import DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL, EventPoller
 from polar_cli.utils import get_output_format, resolve_org_id
 
+if TYPE_CHECKING:
+    from polar_sdk import Polar
+
 app = typer.Typer(name="events", help="Manage events.")
 console = Console()
+err_console = Console(stderr=True)
 
 LIST_COLUMNS = [
     Column("ID", "id"),
@@ -61,13 +98,12 @@ def list_events(
 @handle_errors
 def get_event(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Event ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Event ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for an event."""
-    client = get_client(ctx)
-    with client:
-        event = client.events.get(id=id)
-    render_detail(event, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more events."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.events.get(id=id), DETAIL_FIELDS, concurrency)
 
 
 NAME_COLUMNS = [
@@ -96,15 +132,327 @@ def list_names(
     render_list(res.items, NAME_COLUMNS, res.pagination, get_output_format(ctx))
 
 
+@app.command("tail")
+@handle_errors
+def tail_events(
+    ctx: typer.Context,
+    org: Annotated[str | None, typer.Option("--org", help="Organization ID.")] = None,
+    customer_id: Annotated[str | None, typer.Option("--customer-id", help="Filter by customer.")] = None,
+    name: Annotated[str | None, typer.Option("--name", help="Filter by event name.")] = None,
+    lines: Annotated[int, typer.Option("--lines", "-n", help="Recent events to show first (also the page size while following).")] = 20,
+    follow: Annotated[bool, typer.Option("--follow", "-F", help="Keep polling and print new events as they arrive.")] = False,
+    min_interval: Annotated[float, typer.Option("--min-interval", help="Seconds between polls while events are arriving.")] = DEFAULT_MIN_INTERVAL,
+    max_interval: Annotated[float, typer.Option("--max-interval", help="Longest wait between polls when idle.")] = DEFAULT_MAX_INTERVAL,
+) -> None:
+    """Show the most recent events, oldest first; with --follow, stream new ones.
+
+    Prints NDJSON with -o json, YAML documents with -o yaml, and one compact
+    line per event otherwise.
+    """
+    org_id = resolve_org_id(ctx, org)
+    filters: dict[str, object] = {"organization_id": org_id, "sorting": ["-timestamp"], "limit": lines}
+    if customer_id:
+        filters["customer_id"] = customer_id
+    if name:
+        filters["name"] = name
+    output_format = get_output_format(ctx)
+    client = get_client(ctx)
+
+    def fetch_page(since: datetime | None, page: int) -> list[object]:
+        kwargs = {**filters, "page": page}
+        if since is not None:
+            kwargs["start_timestamp"] = since
+        return call_with_retries(lambda: client.events.list(**kwargs)).items
+
+    poller = EventPoller(fetch_page, min_interval=min_interval, max_interval=max_interval)
+    with client:
+        events = poller.follow() if follow else iter(poller.poll())
+        # Not len(poller.seen): that set is capped, so it undercounts long tails
+        printed = 0
+        try:
+            for event in events:
+                _print_tail_event(event, output_format)
+                printed += 1
+        except KeyboardInterrupt:
+            err_console.print(f"[dim]Stopped after {printed} event(s), {poller.polls} request(s).[/dim]")
+
+
+def _print_tail_event(event: object, output_format: OutputFormat) -> None:
+    if output_format == OutputFormat.JSON:
+        typer.echo(json.dumps(event.model_dump(mode="json"), separators=(",", ":"), default=str))
+    elif output_format == OutputFormat.YAML:
+        render_stream_item(event, DETAIL_FIELDS, output_format)
+    else:
+        customer = getattr(event, "external_customer_id", None) or getattr(event, "customer_id", None) or "-"
+        console.print(
+            f"[dim]{event.timestamp:%Y-%m-%d %H:%M:%S}[/dim] [bold]{event.name}[/bold] {customer} [dim]{event.id}[/dim]",
+            highlight=False,
+        )
+
+
 @app.command("ingest")
 @handle_errors
 def ingest_events(
     ctx: typer.Context,
-    events_json: Annotated[str, typer.Argument(help="JSON array of events to ingest.")],
+    events_json: Annotated[str | None, typer.Argument(help="JSON array of events to ingest.", show_default=False)] = None,
+    file: Annotated[str | None, typer.Option("--file", "-f", help="NDJSON file of events, one per line ('-' for stdin).")] = None,
+    batch_size: Annotated[int, typer.Option("--batch-size", help="Maximum events per request.")] = MAX_BATCH_EVENTS,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Requests in flight.")] = DEFAULT_INGEST_CONCURRENCY,
+    use_spool: Annotated[bool, typer.Option("--spool/--no-spool", help="Write batches to the local spool before sending (see 'events flush').")] = True,
+    org: Annotated[str | None, typer.Option("--org", help="Organization the events belong to; keys the local spool and dedup filter (defaults to the default organization).")] = None,
+    dedup: Annotated[bool, typer.Option("--dedup", help="Skip events already ingested by earlier runs (keyed on external_id or content hash).")] = False,
+    dedup_capacity: Annotated[int | None, typer.Option("--dedup-capacity", min=1, help="Keys the dedup filter is sized for when first created (default 20,000,000).", show_default=False)] = None,
+    dedup_rebuild: Annotated[bool, typer.Option("--dedup-rebuild", help="Discard the dedup filter and create a new one sized by --dedup-capacity.")] = False,
+    compress: Annotated[bool, typer.Option("--compress", help="Gzip large request bodies (for bandwidth-constrained networks).")] = False,
+) -> None:
+    """Ingest events from a JSON array, or stream them from an NDJSON file or stdin."""
+    if events_json is None and file is None:
+        raise CLIError("Nothing to ingest.", hint="Pass a JSON array or use --file FILE ('-' for stdin)")
+
+    if events_json is not None:
+        parsed = json.loads(events_json)
+        client = get_client(ctx, compress=compress)
+        with client:
+            client.events.ingest(request={"events": parsed})
+        console.print(f"[bold green]Ingested {len(parsed)} event(s).[/bold green]")
+        return
+
+    environment = get_cli_context(ctx).environment
+    org_id = _local_org_id(environment, org)
+    spool = event_spool(environment, org_id) if use_spool else None
+    deduper = event_deduper(environment, org_id, dedup_capacity, rebuild=dedup_rebuild) if dedup else None
+    _warn_dedup_fill(deduper)
+    events = iter_ndjson(file)
+    client = get_client(ctx, compress=compress)
+    spool_lock = spool.lock(exclusive=False) if spool else nullcontext()
+    with spool_lock, client, deduper or nullcontext(), _progress() as report:
+        stats = ingest_batches(
+            client,
+            batch_events(deduper.filter(events) if deduper else events, max_events=batch_size),
+            concurrency=concurrency,
+            on_progress=report,
+            spool=spool,
+            dedup=deduper,
+        )
+    if deduper and deduper.stats.skipped:
+        console.print(
+            f"[dim]Skipped {deduper.stats.skipped} duplicate event(s) "
+            f"({deduper.stats.probable} matched only by the probabilistic filter).[/dim]"
+        )
+    _warn_dedup_fill(deduper)
+    _report_ingest(stats, "Ingested", spool, org)
+
+
+def _warn_dedup_fill(deduper: EventDeduper | None) -> None:
+    warning = deduper.fill_warning() if deduper else None
+    if warning:
+        err_console.print(f"[yellow]{warning}[/yellow]")
+
+
+@app.command("flush")
+@handle_errors
+def flush_events(
+    ctx: typer.Context,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Requests in flight.")] = DEFAULT_INGEST_CONCURRENCY,
+    dedup: Annotated[bool, typer.Option("--dedup", help="Record flushed events in the dedup filter used by 'ingest --dedup'.")] = False,
+    compress: Annotated[bool, typer.Option("--compress", help="Gzip large request bodies (for bandwidth-constrained networks).")] = False,
+    org: Annotated[str | None, typer.Option("--org", help="Organization the events belong to; keys the local spool and dedup filter (defaults to the default organization).")] = None,
+) -> None:
+    """Re-send event batches left in the spool by a failed or interrupted ingest."""
+    environment = get_cli_context(ctx).environment
+    org_id = _local_org_id(environment, org)
+    spool = event_spool(environment, org_id)
+    if not spool.segments():
+        console.print("[dim]Spool is empty.[/dim]")
+        return
+    deduper = event_deduper(environment, org_id) if dedup else None
+    client = get_client(ctx, compress=compress)
+    with spool.lock(exclusive=True), client, deduper or nullcontext(), _progress() as report:
+        stats = flush_spool(client, spool, concurrency=concurrency, on_progress=report, dedup=deduper)
+    _warn_dedup_fill(deduper)
+    _report_ingest(stats, "Flushed", spool, org)
+
+
+def _local_org_id(environment: Environment, org: str | None) -> str | None:
+    """The organization that keys the local spool and dedup filter."""
+    return org or get_default_org_id(environment)
+
+
+@app.command("export")
+@handle_errors
+def export_events(
+    ctx: typer.Context,
+    file: Annotated[str, typer.Option("--file", "-f", help="Write NDJSON here ('-' for stdout).")] = "-",
+    store: Annotated[str | None, typer.Option("--store", help="Append to a columnar event store in this directory instead (see 'events stats').")] = None,
+    org: Annotated[str | None, typer.Option("--org", help="Organization ID.")] = None,
+    customer_id: Annotated[str | None, typer.Option("--customer-id", help="Filter by customer.")] = None,
+    name: Annotated[str | None, typer.Option("--name", help="Filter by event name.")] = None,
+    start_timestamp: Annotated[str | None, typer.Option("--start", help="Start timestamp (ISO 8601).")] = None,
+    end_timestamp: Annotated[str | None, typer.Option("--end", help="End timestamp (ISO 8601).")] = None,
+    shards: Annotated[int, typer.Option("--shards", help="Split the time range into this many shards crawled in parallel, with resumable checkpoints.")] = 1,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Pages (or shards, with --shards) fetched in parallel.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Ingest events from a JSON array."""
-    parsed = json.loads(events_json)
+    """Export all matching events, oldest first, as NDJSON or into a local event store."""
+    org_id = resolve_org_id(ctx, org)
+    filters: dict[str, object] = {"organization_id": org_id}
+    if customer_id:
+        filters["customer_id"] = customer_id
+    if name:
+        filters["name"] = name
+    start = datetime.fromisoformat(start_timestamp) if start_timestamp else None
+    end = datetime.fromisoformat(end_timestamp) if end_timestamp else None
+
     client = get_client(ctx)
-    with client:
-        client.events.ingest(request={"events": parsed})
-    console.print(f"[bold green]Ingested {len(parsed)} event(s).[/bold green]")
+    with client, Progress(TextColumn("{task.description}"), console=err_console, transient=True) as progress:
+        task = progress.add_task("Exporting...")
+        exported = 0
+
+        def report(count: int) -> None:
+            nonlocal exported
+            exported += count
+            progress.update(task, description=f"Exporting... {exported} events")
+
+        if shards > 1:
+            _export_sharded(client, filters, start, end, shards, concurrency, file, store, report)
+        else:
+            _export_pages(client, filters, start, end, concurrency, file, store, report)
+    err_console.print(f"[bold green]Exported {exported} event(s)[/bold green] to {store or file}")
+
+
+def _export_pages(
+    client: "Polar",
+    filters: dict[str, object],
+    start: datetime | None,
+    end: datetime | None,
+    concurrency: int,
+    file: str,
+    store: str | None,
+    report: Callable[[int], None],
+) -> None:
+    kwargs = {**filters, "sorting": ["timestamp"]}
+    if start:
+        kwargs["start_timestamp"] = start
+    if end:
+        kwargs["end_timestamp"] = end
+
+    def events() -> Iterator[dict[str, object]]:
+        count = 0
+        for event in iter_all(client.events.list, concurrency, **kwargs):
+            count += 1
+            if count % 1000 == 0:
+                report(1000)
+            yield event.model_dump(mode="json")
+        report(count % 1000)
+
+    if store is not None:
+        with EventStoreWriter(Path(store)) as writer:
+            writer.append(events())
+    else:
+        with nullcontext(sys.stdout) if file == "-" else open(file, "w") as out:
+            for event in events():
+                out.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+
+def _export_sharded(
+    client: "Polar",
+    filters: dict[str, object],
+    start: datetime | None,
+    end: datetime | None,
+    shards: int,
+    concurrency: int,
+    file: str,
+    store: str | None,
+    report: Callable[[int], None],
+) -> None:
+    if start is None:
+        first = client.events.list(**filters, sorting=["timestamp"], limit=1).items
+        if not first:
+            return
+        start = first[0].timestamp
+    directory = checkpoint_dir(filters, start, end, shards)
+    end = end or pinned_end(directory, datetime.now(UTC))
+    parts = export_shards(client, plan_shards(start, end, shards), directory, filters, concurrency, report)
+    try:
+        if store is not None:
+            store_path = Path(store)
+            merged, rows = load_merge_state(directory, store_path) or (0, None)
+            with EventStoreWriter(store_path, truncate_to=rows) as writer:
+                for shard, checkpoint in parts:
+                    if shard.index < merged:
+                        continue
+                    writer.append(iter_ndjson(str(checkpoint.part)))
+                    writer.flush()
+                    save_merge_state(directory, store_path, shard.index + 1, writer.rows)
+        else:
+            with nullcontext(sys.stdout) if file == "-" else open(file, "w") as out:
+                for _, checkpoint in parts:
+                    with open(checkpoint.part) as part:
+                        shutil.copyfileobj(part, out)
+    except BaseException:
+        err_console.print("[dim]Progress is checkpointed; rerun the same command to resume.[/dim]")
+        raise
+    remove_checkpoints(directory)
+
+
+class StatsGroup(StrEnum):
+    NAME = "name"
+    CUSTOMER = "customer"
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    YEAR = "year"
+
+
+@app.command("stats")
+@handle_errors
+def event_stats(
+    ctx: typer.Context,
+    store: Annotated[str, typer.Option("--store", help="Event store directory written by 'events export --store'.")],
+    by: Annotated[StatsGroup, typer.Option("--by", help="Group by event name, customer, or a time bucket.")] = StatsGroup.NAME,
+    sum_key: Annotated[str | None, typer.Option("--sum", help="Also sum this numeric metadata key.")] = None,
+    name: Annotated[str | None, typer.Option("--name", help="Only count events with this name.")] = None,
+    start_timestamp: Annotated[str | None, typer.Option("--start", help="Start timestamp (ISO 8601).")] = None,
+    end_timestamp: Annotated[str | None, typer.Option("--end", help="End timestamp (ISO 8601).")] = None,
+    limit: Annotated[int, typer.Option("--limit", help="Show at most this many groups (0 for all).")] = 0,
+) -> None:
+    """Count events (and sum a metadata value) from a local event store."""
+    start = datetime.fromisoformat(start_timestamp) if start_timestamp else None
+    end = datetime.fromisoformat(end_timestamp) if end_timestamp else None
+    with EventStore(Path(store)) as event_store:
+        if by in (StatsGroup.NAME, StatsGroup.CUSTOMER):
+            rows = stats_by_code(event_store, by, sum_key=sum_key, name=name, start=start, end=end)
+        else:
+            rows = stats_by_time(event_store, by, sum_key=sum_key, name=name, start=start, end=end)
+    if limit:
+        rows = rows[:limit]
+    columns = [Column(by.value.capitalize(), "group"), Column("Events", "events")]
+    if sum_key:
+        columns.append(Column(f"Sum of {sum_key}", "sum"))
+    render_list([asdict(row) for row in rows], columns, None, get_output_format(ctx))
+
+
+@contextmanager
+def _progress() -> Generator[Callable[[IngestStats], None], None, None]:
+    with Progress(TextColumn("{task.description}"), console=console, transient=True) as progress:
+        task = progress.add_task("Sending...")
+
+        def report(stats: IngestStats) -> None:
+            progress.update(task, description=f"Sending... {stats.events} events ({stats.rate:,.0f}/s)")
+
+        yield report
+
+
+def _report_ingest(stats: IngestStats, verb: str, spool: Spool | None, org: str | None = None) -> None:
+    console.print(
+        f"[bold green]{verb} {stats.events} event(s)[/bold green] in {stats.batches} batch(es), "
+        f"{stats.elapsed:.1f}s ({stats.rate:,.0f} events/s)"
+    )
+    if not stats.failed_events:
+        return
+    err = to_cli_error(stats.errors[-1])
+    console.print(f"[bold red]{stats.failed_events} event(s) failed:[/bold red] {err.title}: {err.message}")
+    if spool is not None:
+        flush = f"polar events flush --org {org}" if org else "polar events flush"
+        console.print(f"[dim]{len(spool.segments())} batch(es) kept in the spool. Run '{flush}' to retry.[/dim]")
+    raise typer.Exit(EXIT_ERROR)
@@ -1,15 +1,45 @@
-"""File commands: list, create, update, delete."""
+"""File commands: list, create, upload, update, delete."""
 
 
-from typing import Annotated
+import mimetypes
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Generator
 
 import typer
 from rich.console import Console
+from rich.progress import BarColumn, DownloadColumn, Progress, TextColumn, TimeRemainingColumn, TransferSpeedColumn
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY
 from polar_cli.client import get_client
-from polar_cli.errors import handle_errors
+from polar_cli.errors import CLIError, handle_errors
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.upload import (
+    MAX_PART_SIZE,
+    MAX_PARTS,
+    MIN_PART_SIZE,
+    MappedFile,
+    MiB,
+    Part,
+    PartUploadError,
+    PresignedPart,
+    ThroughputEstimate,
+    UploadCheckpoint,
+    UploadState,
+    choose_part_size,
+    min_part_size,
+    part_checksums,
+    plan_parts,
+    sample_fingerprint,
+    upload_http_client,
+    upload_parts,
+)
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
+
+if TYPE_CHECKING:
+    from polar_sdk import Polar
 
 app = typer.Typer(name="files", help="Manage files.")
 console = Console()
@@ -50,27 +80,14 @@ def list_files(
     render_list(res.result.items, LIST_COLUMNS, res.result.pagination, get_output_format(ctx))
 
 
-CHUNK_SIZE = 5 * 1024 * 1024  # 5MB chunks for S3 multipart upload
-
-
-def _compute_upload_parts(size: int) -> list[dict[str, object]]:
+def _compute_upload_parts(planned: list[Part], checksums: dict[int, str] | None = None) -> list[dict[str, object]]:
     """Compute S3 multipart upload parts for a file."""
-    parts = []
-    chunk_number = 1
-    remaining = size
-    chunk_start = 0
-
-    while remaining > 0:
-        chunk_size = min(CHUNK_SIZE, remaining)
-        parts.append({
-            "number": chunk_number,
-            "chunk_start": chunk_start,
-            "chunk_end": chunk_start + chunk_size,
-        })
-        chunk_number += 1
-        chunk_start += chunk_size
-        remaining -= chunk_size
-
+    parts: list[dict[str, object]] = []
+    for part in planned:
+        entry: dict[str, object] = {"number": part.number, "chunk_start": part.start, "chunk_end": part.end}
+        if checksums:
+            entry["checksum_sha256_base64"] = checksums[part.number]
+        parts.append(entry)
     return parts
 
 
@@ -85,7 +102,7 @@ def create_file(
     service: Annotated[str, typer.Option("--service", help="File service: downloadable, product_media, organization_avatar.")] = "downloadable",
 ) -> None:
     """Create a file upload entry (returns upload URLs for multipart upload)."""
-    parts = _compute_upload_parts(size)
+    parts = _compute_upload_parts(plan_parts(size, min_part_size(size)))
     request: dict[str, object] = {
         "service": service,
         "name": name,
@@ -104,6 +121,141 @@ def create_file(
     render_detail(result, DETAIL_FIELDS, get_output_format(ctx))
 
 
+@app.command("upload")
+@handle_errors
+def upload_file(
+    ctx: typer.Context,
+    path: Annotated[Path, typer.Argument(help="File to upload.", exists=True, dir_okay=False, readable=True)],
+    name: Annotated[str | None, typer.Option("--name", help="File name (defaults to the file's name).")] = None,
+    mime_type: Annotated[str | None, typer.Option("--mime-type", help="MIME type (guessed from the extension by default).")] = None,
+    org: Annotated[str | None, typer.Option("--org", help="Organization ID.")] = None,
+    service: Annotated[str, typer.Option("--service", help="File service: downloadable, product_media, organization_avatar.")] = "downloadable",
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parts uploaded in parallel.")] = DEFAULT_CONCURRENCY,
+    resume: Annotated[bool, typer.Option("--resume", help="Continue an interrupted upload of this file, sending only missing parts.")] = False,
+    part_size: Annotated[int | None, typer.Option("--part-size", help="Part size in MiB (chosen from the file size and measured throughput by default).")] = None,
+) -> None:
+    """Upload a file: create the entry, send its parts in parallel, and complete it."""
+    name = name or path.name
+    mime_type = mime_type or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    client = get_client(ctx)
+    checkpoint = UploadCheckpoint(path)
+    throughput = ThroughputEstimate()
+    started = time.monotonic()
+    with MappedFile(path) as mapped, client, upload_http_client(concurrency) as http, _transfer_progress() as progress:
+        task = progress.add_task("Checking", total=None)
+        fingerprint = sample_fingerprint(mapped)
+        state = checkpoint.state if resume else None
+        if state is not None and state.fingerprint != fingerprint:
+            raise CLIError(
+                f"{path} has changed since its upload started.",
+                hint="Run without --resume to upload it from scratch.",
+            )
+        if state is None:
+            if resume:
+                console.print(f"[dim]No interrupted upload of {path}; starting a new one.[/dim]")
+            progress.update(task, description="Hashing")
+            if part_size:
+                chosen = _part_size(mapped.size, part_size)
+            else:
+                chosen = choose_part_size(mapped.size, throughput.value, concurrency)
+            checkpoint.state = state = _create_upload(client, mapped, chosen, fingerprint, name, mime_type, org, service)
+            checkpoint.save()
+        else:
+            console.print(f"[dim]Resuming upload {state.file_id}: {len(state.etags)}/{len(state.parts)} part(s) already sent.[/dim]")
+
+        pending = state.pending()
+        progress.update(task, description="Uploading", total=mapped.size, completed=state.bytes_done())
+        sent = sum(part.chunk_end - part.chunk_start for part in pending)
+        upload_started = time.monotonic()
+        try:
+            upload_parts(
+                http,
+                mapped,
+                pending,
+                concurrency=concurrency,
+                on_bytes=lambda count: progress.advance(task, count),
+                on_part=checkpoint.record,
+            )
+        except PartUploadError as exc:
+            hint = "Run again with --resume to send only the missing parts."
+            if resume and exc.status_code == 403:
+                hint = "The part URLs may have expired; run without --resume to start over."
+            raise CLIError(str(exc), hint=hint) from exc
+        throughput.observe(sent, time.monotonic() - upload_started, min(concurrency, len(pending)))
+        progress.update(task, description="Completing")
+        result = client.files.uploaded(
+            id=state.file_id,
+            file_upload_completed={"id": state.upload_id, "path": state.upload_path, "parts": state.completed_parts()},
+        )
+    checkpoint.delete()
+
+    elapsed = time.monotonic() - started
+    console.print(
+        f"[bold green]File uploaded:[/bold green] {result.id} "
+        f"[dim]({len(pending)}/{len(state.parts)} part(s) sent, {sent / elapsed / 1024 / 1024:.1f} MB/s)[/dim]"
+    )
+    render_detail(result, DETAIL_FIELDS, get_output_format(ctx))
+
+
+def _part_size(size: int, mib: int) -> int:
+    part_size = mib * MiB
+    if not MIN_PART_SIZE <= part_size <= MAX_PART_SIZE:
+        raise CLIError(f"--part-size must be between {MIN_PART_SIZE // MiB} and {MAX_PART_SIZE // MiB} MiB.")
+    if part_size < min_part_size(size):
+        raise CLIError(
+            f"--part-size {mib} would split the file into more than {MAX_PARTS:,} parts.",
+            hint=f"Use at least {min_part_size(size) // MiB} MiB.",
+        )
+    return part_size
+
+
+def _create_upload(
+    client: "Polar",
+    mapped: MappedFile,
+    part_size: int,
+    fingerprint: str,
+    name: str,
+    mime_type: str,
+    org: str | None,
+    service: str,
+) -> UploadState:
+    planned = plan_parts(mapped.size, part_size)
+    checksums = part_checksums(mapped, planned)
+    request: dict[str, object] = {
+        "service": service,
+        "name": name,
+        "mime_type": mime_type,
+        "size": mapped.size,
+        "upload": {"parts": _compute_upload_parts(planned, checksums)},
+    }
+    if org:
+        request["organization_id"] = org
+    created = client.files.create(request=request)
+    return UploadState(
+        fingerprint=fingerprint,
+        size=mapped.size,
+        file_id=created.id,
+        upload_id=created.upload.id,
+        upload_path=created.upload.path,
+        parts=[asdict(PresignedPart.from_sdk(part)) for part in created.upload.parts],
+        checksums={str(number): checksum for number, checksum in checksums.items()},
+    )
+
+
+@contextmanager
+def _transfer_progress() -> Generator[Progress, None, None]:
+    with Progress(
+        TextColumn("[bold]{task.description}[/bold]"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        TimeRemainingColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        yield progress
+
+
 @app.command("update")
 @handle_errors
 def update_file(
@@ -112,6 +264,7 @@ def update_file(
     name: Annotated[str | None, typer.Option("--name", help="New name.")] = None,
 ) -> None:
     """Update a file."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if name is not None:
         update["name"] = name
@@ -133,6 +286,7 @@ def delete_file(
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation.")] = False,
 ) -> None:
     """Delete a file."""
+    id = resolve_id(id)
     if not yes:
         typer.confirm(f"Delete file {id}?", abort=True)
     client = get_client(ctx)
@@ -6,10 +6,11 @@ from typing import Annotated
 import typer
 from rich.console import Console
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 app = typer.Typer(name="license-keys", help="Manage license keys.")
 console = Console()
@@ -71,13 +72,12 @@ def list_license_keys(
 @handle_errors
 def get_license_key(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="License key ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="License key ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a license key (includes activations)."""
-    client = get_client(ctx)
-    with client:
-        lk = client.license_keys.get(id=id)
-    render_detail(lk, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more license keys (includes activations)."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.license_keys.get(id=id), DETAIL_FIELDS, concurrency)
 
 
 @app.command("update")
@@ -89,6 +89,7 @@ def update_license_key(
     limit_usage: Annotated[int | None, typer.Option("--limit-usage", help="Set usage limit.")] = None,
 ) -> None:
     """Update a license key."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if status is not None:
         update["status"] = status
@@ -175,6 +176,8 @@ def get_activation(
     activation_id: Annotated[str, typer.Argument(help="Activation ID.")],
 ) -> None:
     """Get details for a license key activation."""
+    id = resolve_id(id)
+    activation_id = resolve_id(activation_id)
     client = get_client(ctx)
     with client:
         result = client.license_keys.get_activation(id=id, activation_id=activation_id)
@@ -6,10 +6,11 @@ from typing import Annotated
 import typer
 from rich.console import Console
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format
+from polar_cli.utils import get_output_format, resolve_id
 
 app = typer.Typer(name="members", help="Manage organization members.")
 console = Console()
@@ -50,13 +51,12 @@ def list_members(
 @handle_errors
 def get_member(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Member ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Member ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a member."""
-    client = get_client(ctx)
-    with client:
-        member = client.members.get_member(id=id)
-    render_detail(member, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more members."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.members.get_member(id=id), DETAIL_FIELDS, concurrency)
 
 
 @app.command("create")
@@ -83,6 +83,7 @@ def update_member(
     role: Annotated[str | None, typer.Option("--role", help="Member role.")] = None,
 ) -> None:
     """Update a member."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if name is not None:
         update["name"] = name
@@ -106,6 +107,7 @@ def delete_member(
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation.")] = False,
 ) -> None:
     """Delete a member."""
+    id = resolve_id(id)
     if not yes:
         typer.confirm(f"Delete member {id}?", abort=True)
     client = get_client(ctx)
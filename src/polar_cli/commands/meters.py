@@ -1,4 +1,4 @@
-"""Meter commands: list, get, create, update."""
+"""Meter commands: list, get, create, update, quantities, preview."""
 
 
 from typing import Annotated
@@ -6,13 +6,17 @@ from typing import Annotated
 import typer
 from rich.console import Console
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
-from polar_cli.errors import handle_errors
+from polar_cli.errors import CLIError, handle_errors
+from polar_cli.ingest import iter_ndjson
+from polar_cli.meter_eval import evaluate
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 app = typer.Typer(name="meters", help="Manage usage meters.")
 console = Console()
+err_console = Console(stderr=True)
 
 LIST_COLUMNS = [
     Column("ID", "id"),
@@ -57,13 +61,12 @@ def list_meters(
 @handle_errors
 def get_meter(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Meter ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Meter ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a meter."""
-    client = get_client(ctx)
-    with client:
-        meter = client.meters.get(id=id)
-    render_detail(meter, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more meters."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.meters.get(id=id), DETAIL_FIELDS, concurrency)
 
 
 @app.command("create")
@@ -100,6 +103,7 @@ def update_meter(
     name: Annotated[str | None, typer.Option("--name", help="New name.")] = None,
 ) -> None:
     """Update a meter."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if name is not None:
         update["name"] = name
@@ -123,6 +127,7 @@ def get_quantities(
     interval: Annotated[str, typer.Option("--interval", help="Interval: hour, day, week, month, year.")] = "day",
 ) -> None:
     """Get meter quantities over a time range."""
+    id = resolve_id(id)
     import datetime as dt
 
     client = get_client(ctx)
@@ -134,3 +139,47 @@ def get_quantities(
             interval=interval,
         )
     render_detail(result, [], get_output_format(ctx))
+
+
+@app.command("preview")
+@handle_errors
+def preview_meter(
+    ctx: typer.Context,
+    events_file: Annotated[str, typer.Option("--events", help="NDJSON file of events, e.g. from 'events export' ('-' for stdin).")],
+    id: Annotated[str | None, typer.Argument(help="Meter ID to take the filter and aggregation from.", show_default=False)] = None,
+    filter_json: Annotated[str | None, typer.Option("--filter", help="Event filter JSON (overrides the meter's).")] = None,
+    aggregation: Annotated[str | None, typer.Option("--aggregation", help="Aggregation JSON (overrides the meter's).")] = None,
+    start_timestamp: Annotated[str | None, typer.Option("--start", help="Start timestamp (ISO 8601). Defaults to the first matching event.")] = None,
+    end_timestamp: Annotated[str | None, typer.Option("--end", help="End timestamp (ISO 8601). Defaults to the last matching event.")] = None,
+    interval: Annotated[str, typer.Option("--interval", help="Interval: hour, day, week, month, year.")] = "day",
+) -> None:
+    """Compute meter quantities locally from an events file, without creating the meter."""
+    import datetime as dt
+    import json
+
+    if id is None and (filter_json is None or aggregation is None):
+        raise CLIError("Nothing to preview.", hint="Pass a meter ID, or both --filter and --aggregation")
+
+    filter_spec = json.loads(filter_json) if filter_json else None
+    aggregation_spec = json.loads(aggregation) if aggregation else None
+    if id is not None and (filter_spec is None or aggregation_spec is None):
+        client = get_client(ctx)
+        with client:
+            meter = client.meters.get(id=resolve_id(id))
+        filter_spec = filter_spec or meter.filter.model_dump(mode="json", by_alias=True)
+        aggregation_spec = aggregation_spec or meter.aggregation.model_dump(mode="json", by_alias=True)
+
+    result = evaluate(
+        iter_ndjson(events_file),
+        filter_spec,
+        aggregation_spec,
+        interval=interval,
+        start=dt.datetime.fromisoformat(start_timestamp) if start_timestamp else None,
+        end=dt.datetime.fromisoformat(end_timestamp) if end_timestamp else None,
+    )
+    render_detail(result.to_dict(), [], get_output_format(ctx))
+    err_console.print(
+        f"[dim]Scanned {result.scanned} event(s), {result.matched} matched"
+        + (f", {result.skipped} skipped (no timestamp or value)" if result.skipped else "")
+        + ".[/dim]"
+    )
@@ -6,10 +6,11 @@ from typing import Annotated
 import typer
 from rich.console import Console
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 app = typer.Typer(name="orders", help="Manage orders.")
 console = Console()
@@ -61,13 +62,12 @@ def list_orders(
 @handle_errors
 def get_order(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Order ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Order ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for an order."""
-    client = get_client(ctx)
-    with client:
-        order = client.orders.get(id=id)
-    render_detail(order, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more orders."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.orders.get(id=id), DETAIL_FIELDS, concurrency)
 
 
 @app.command("invoice")
@@ -77,6 +77,7 @@ def get_invoice(
     id: Annotated[str, typer.Argument(help="Order ID.")],
 ) -> None:
     """Get the invoice URL for an order."""
+    id = resolve_id(id)
     client = get_client(ctx)
     with client:
         invoice = client.orders.invoice(id=id)
@@ -90,6 +91,7 @@ def generate_invoice(
     id: Annotated[str, typer.Argument(help="Order ID.")],
 ) -> None:
     """Generate a new invoice for an order."""
+    id = resolve_id(id)
     client = get_client(ctx)
     with client:
         client.orders.generate_invoice(id=id)
@@ -104,6 +106,7 @@ def update_order(
     billing_name: Annotated[str | None, typer.Option("--billing-name", help="Billing name.")] = None,
 ) -> None:
     """Update an order."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if billing_name is not None:
         update["billing_name"] = billing_name
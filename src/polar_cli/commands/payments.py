@@ -5,9 +5,10 @@ from typing import Annotated
 
 import typer
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
-from polar_cli.output import Column, render_detail, render_list
+from polar_cli.output import Column, render_list
 from polar_cli.utils import get_output_format, resolve_org_id
 
 app = typer.Typer(name="payments", help="View payments.")
@@ -57,10 +58,9 @@ def list_payments(
 @handle_errors
 def get_payment(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Payment ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Payment ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a payment."""
-    client = get_client(ctx)
-    with client:
-        payment = client.payments.get(id=id)
-    render_detail(payment, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more payments."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.payments.get(id=id), DETAIL_FIELDS, concurrency)
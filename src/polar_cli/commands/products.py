@@ -6,10 +6,11 @@ from typing import Annotated
 import typer
 from rich.console import Console
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 app = typer.Typer(name="products", help="Manage products.")
 console = Console()
@@ -56,13 +57,12 @@ def list_products(
 @handle_errors
 def get_product(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Product ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Product ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a product."""
-    client = get_client(ctx)
-    with client:
-        product = client.products.get(id=id)
-    render_detail(product, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more products."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.products.get(id=id), DETAIL_FIELDS, concurrency)
 
 
 @app.command("create")
@@ -120,6 +120,7 @@ def update_product(
     is_archived: Annotated[bool | None, typer.Option("--is-archived", help="Archive or unarchive.")] = None,
 ) -> None:
     """Update a product."""
+    id = resolve_id(id)
     client = get_client(ctx)
     update: dict[str, object] = {}
     if name is not None:
@@ -147,6 +148,7 @@ def update_benefits(
     benefits: Annotated[list[str], typer.Option("--benefit", help="Benefit IDs (repeat for multiple).")],
 ) -> None:
     """Set the benefits attached to a product."""
+    id = resolve_id(id)
     client = get_client(ctx)
     with client:
         product = client.products.update_benefits(
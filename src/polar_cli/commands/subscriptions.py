@@ -6,10 +6,11 @@ from typing import Annotated
 import typer
 from rich.console import Console
 
+from polar_cli.bulk import DEFAULT_CONCURRENCY, get_many, read_ids
 from polar_cli.client import get_client
 from polar_cli.errors import handle_errors
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 app = typer.Typer(name="subscriptions", help="Manage subscriptions.")
 console = Console()
@@ -62,13 +63,12 @@ def list_subscriptions(
 @handle_errors
 def get_subscription(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Subscription ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Subscription ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a subscription."""
-    client = get_client(ctx)
-    with client:
-        sub = client.subscriptions.get(id=id)
-    render_detail(sub, DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more subscriptions."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.subscriptions.get(id=id), DETAIL_FIELDS, concurrency)
 
 
 @app.command("update")
@@ -80,6 +80,7 @@ def update_subscription(
     cancel_at_period_end: Annotated[bool | None, typer.Option("--cancel-at-period-end/--no-cancel-at-period-end", help="Cancel at end of current period.")] = None,
 ) -> None:
     """Update a subscription."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if product_id is not None:
         update["product_id"] = product_id
@@ -103,6 +104,7 @@ def revoke_subscription(
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation.")] = False,
 ) -> None:
     """Revoke (immediately cancel) a subscription."""
+    id = resolve_id(id)
     if not yes:
         typer.confirm(f"Revoke subscription {id}? This is immediate and cannot be undone.", abort=True)
     client = get_client(ctx)
@@ -1,20 +1,56 @@
-"""Webhook commands: listen (SSE), endpoint CRUD, deliveries."""
+"""Webhook commands: listen (SSE), replay, endpoint CRUD, deliveries, stats."""
 
 
 import json
-from typing import Annotated
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Callable
 
-import httpx
 import typer
-from httpx_sse import connect_sse
 from rich.console import Console
 from rich.panel import Panel
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeRemainingColumn
 from rich.syntax import Syntax
 
+from polar_cli.bulk import (
+    DEFAULT_CONCURRENCY,
+    PAGE_LIMIT,
+    RateLimiter,
+    call_with_retries,
+    get_many,
+    iter_all,
+    read_ids,
+    run_concurrently,
+)
 from polar_cli.client import get_base_url, get_client, require_token
-from polar_cli.errors import handle_errors
+from polar_cli.config import Environment, OutputFormat, get_default_org_id
+from polar_cli.context import get_cli_context
+from polar_cli.delivery_stats import DeliveryStats
+from polar_cli.errors import EXIT_ERROR, CLIError, handle_errors, to_cli_error
+from polar_cli.forwarding import (
+    DEFAULT_FORWARD_CONCURRENCY,
+    DEFAULT_FORWARD_TIMEOUT,
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_QUEUE_SIZE,
+    Forwarder,
+    ForwardResult,
+    ForwardRouter,
+    Route,
+    parse_route,
+    webhook_type,
+)
+from polar_cli.meter_eval import INTERVALS
+from polar_cli.metrics import ListenerMetrics, serve_metrics
 from polar_cli.output import Column, render_detail, render_list
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.recording import EventRecorder, Pacing, paced, percentiles, read_recording
+from polar_cli.sse import DEFAULT_IDLE_TIMEOUT, MultiStream, Reconnecting, ReconnectingStream, StreamStats
+from polar_cli.throttle import DEFAULT_COMPACT_ABOVE, DEFAULT_MAX_LINES, DisplayMode, DisplayThrottle
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
+
+if TYPE_CHECKING:
+    from polar_sdk import Polar
 
 app = typer.Typer(name="webhooks", help="Webhook listener and management.")
 console = Console()
@@ -33,6 +69,10 @@ ENDPOINT_DETAIL_FIELDS = [
     Column("Created", "created_at"),
 ]
 
+# Seconds to keep forwarding queued events after the stream ends
+DRAIN_TIMEOUT = 30.0
+DEFAULT_SUMMARY_EVERY = 30.0
+
 DELIVERY_COLUMNS = [
     Column("ID", "id"),
     Column("Event Type", "event_type"),
@@ -49,50 +89,338 @@ DELIVERY_COLUMNS = [
 @handle_errors
 def listen(
     ctx: typer.Context,
-    org: Annotated[str | None, typer.Option("--org", help="Organization ID.")] = None,
+    orgs: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--org",
+            help="Organization ID; prefix with 'sandbox:' or 'production:' to pick the environment "
+            "('sandbox:' alone for its default org). Repeat to listen to several at once.",
+        ),
+    ] = None,
     forward_to: Annotated[
-        str | None,
-        typer.Option("--forward-to", "-f", help="Local URL to forward webhook payloads to."),
+        list[str] | None,
+        typer.Option(
+            "--forward-to",
+            "-f",
+            help="Local URL to forward webhook payloads to. Append #type,type to send only those event types "
+            "(wildcards allowed, e.g. 'http://localhost:3000#order.*'). Repeat for multiple targets.",
+        ),
     ] = None,
+    forward_concurrency: Annotated[int, typer.Option("--forward-concurrency", help="Parallel forwarding requests per target.")] = DEFAULT_FORWARD_CONCURRENCY,
+    forward_queue: Annotated[int, typer.Option("--forward-queue", help="Events buffered per target before new ones are dropped.")] = DEFAULT_QUEUE_SIZE,
+    forward_timeout: Annotated[float, typer.Option("--forward-timeout", help="Seconds to wait for the local handler.")] = DEFAULT_FORWARD_TIMEOUT,
+    ordered: Annotated[bool, typer.Option("--ordered", help="Forward events about the same resource one at a time, in order.")] = False,
+    max_attempts: Annotated[int, typer.Option("--max-attempts", help="Forward attempts per event before it goes to the dead-letter file (1 disables retries).")] = DEFAULT_MAX_ATTEMPTS,
+    retry_failed: Annotated[bool, typer.Option("--retry-failed", help="Send dead-lettered events for the --forward-to targets again.")] = False,
+    reconnect: Annotated[bool, typer.Option("--reconnect/--no-reconnect", help="Reconnect automatically when the stream drops.")] = True,
+    idle_timeout: Annotated[float, typer.Option("--idle-timeout", help="Reconnect if nothing (not even a heartbeat) arrives for this many seconds.")] = DEFAULT_IDLE_TIMEOUT,
+    record: Annotated[str | None, typer.Option("--record", help="Append every event to this NDJSON file (.gz to compress) for 'webhooks replay'.")] = None,
+    display: Annotated[DisplayMode, typer.Option("--display", help="Event display: full panels, one compact line each, or auto (compact during bursts).")] = DisplayMode.AUTO,
+    max_lines: Annotated[float, typer.Option("--max-lines", help="Events printed per second at most; the rest are summarized (0 for no limit).")] = DEFAULT_MAX_LINES,
+    compact_above: Annotated[float, typer.Option("--compact-above", help="Events per second above which auto display turns compact.")] = DEFAULT_COMPACT_ABOVE,
+    metrics_port: Annotated[int | None, typer.Option("--metrics-port", help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics.")] = None,
+    summary_every: Annotated[float | None, typer.Option("--summary-every", help="Print a throughput and latency summary every N seconds (default 30 with --metrics-port, else off).")] = None,
 ) -> None:
     """Listen for webhook events in real-time via SSE."""
-    org_id = resolve_org_id(ctx, org)
-    token = require_token(ctx)
-    base = get_base_url(ctx)
-    sse_url = f"{base}/v1/cli/listen/{org_id}"
+    routes = [parse_route(spec) for spec in forward_to or []]
+    if retry_failed and not routes:
+        raise CLIError("--retry-failed needs at least one --forward-to target.")
+    if retry_failed and max_attempts < 2:
+        raise CLIError("--retry-failed needs retries; raise --max-attempts above 1.")
+    sources = _listen_sources(ctx, orgs or [])
+    # Tag events with their org only when there is more than one
+    tagged = len(sources) > 1
 
     console.print("[bold]Connecting to event stream...[/bold]")
-    console.print(f"[dim]URL: {sse_url}[/dim]")
-    if forward_to:
-        console.print(f"[dim]Forwarding to: {forward_to}[/dim]")
-
-    headers = {"Authorization": f"Bearer {token}"}
-
-    with httpx.Client(timeout=None) as http_client:
-        with connect_sse(http_client, "GET", sse_url, headers=headers) as event_source:
-            if event_source.response.status_code != 200:
-                console.print(f"[bold red]Failed to connect:[/bold red] HTTP {event_source.response.status_code}")
-                raise typer.Exit(1)
-
-            for sse in event_source.iter_sse():
-                if not sse.data:
-                    continue
-                try:
-                    event: dict[str, object] = json.loads(sse.data)
-                except json.JSONDecodeError:
-                    continue
-
-                key = str(event.get("key", "unknown"))
-
-                if key == "connected":
-                    console.print("[bold green]Connected![/bold green] Listening for events...")
+    for sse_url, _ in sources.values():
+        console.print(f"[dim]URL: {sse_url}[/dim]")
+    for route in routes:
+        console.print(f"[dim]Forwarding to: {route}[/dim]")
+    if record:
+        console.print(f"[dim]Recording to: {record}[/dim]")
+
+    throttle = DisplayThrottle(display, max_lines=max_lines, compact_above=compact_above)
+    if summary_every is None:
+        summary_every = DEFAULT_SUMMARY_EVERY if metrics_port is not None else 0
+    metrics = ListenerMetrics() if metrics_port is not None or summary_every > 0 else None
+    labelled = len(routes) > 1
+
+    def on_forward_result(route: Route, result: ForwardResult) -> None:
+        if metrics:
+            metrics.forward_finished(route.url, webhook_type(result.event) or "", result.ok, result.elapsed)
+        # Successes would double the line count; in compact output only failures are shown
+        if throttle.compact and result.ok:
+            return
+        _print_forward_result(result, route.url if labelled else None)
+
+    # Before the router starts its workers: a failure here must not strand queued forwards
+    stop_summaries = _start_metrics(metrics, metrics_port, summary_every)
+    try:
+        router = (
+            ForwardRouter(
+                routes,
+                on_result=on_forward_result,
+                max_attempts=max_attempts,
+                concurrency=forward_concurrency,
+                queue_size=forward_queue,
+                ordered=ordered,
+                timeout=forward_timeout,
+            )
+            if routes
+            else None
+        )
+    except BaseException:
+        # Another listener holds a target's retry spool
+        stop_summaries()
+        raise
+    if router:
+        if metrics:
+            metrics.queue_depths = lambda: {route.url: forwarder.depth for route, forwarder in router}
+        _resume_retries(router, retry_failed)
+
+    streams = {
+        tag: ReconnectingStream(
+            sse_url,
+            {"Authorization": f"Bearer {token}"},
+            idle_timeout=idle_timeout,
+            reconnect=reconnect,
+            on_connect=lambda stats, label=tag if tagged else None: _print_connected(stats, label),
+            on_disconnect=lambda info, label=tag if tagged else None: _print_reconnecting(info, label),
+        )
+        for tag, (sse_url, token) in sources.items()
+    }
+    recorder = None
+    try:
+        # Opened here so the finally below also stops the router and metrics if it fails
+        recorder = EventRecorder(Path(record)) if record else None
+        for tag, sse in MultiStream(streams):
+            if not sse.data:
+                _print_suppressed(throttle.drain())
+                continue
+            try:
+                event: dict[str, object] = json.loads(sse.data)
+            except json.JSONDecodeError:
+                continue
+
+            key = str(event.get("key", "unknown"))
+
+            if key == "connected":
+                if streams[tag].stats.connects == 1:
+                    where = f" to {tag}" if tagged else ""
+                    console.print(f"[bold green]Connected{where}![/bold green] Listening for events...")
                     console.print(f"[dim]Signing secret: {event.get('secret', '')}[/dim]\n")
-                    continue
+                continue
+            if tagged:
+                event["source"] = tag
+
+            if recorder:
+                recorder.write(event)
+            if metrics:
+                metrics.event_received(webhook_type(event) or key, tag if tagged else "")
+            _show_event(throttle, event, key)
+
+            if router and key == "webhook.created":
+                for route in router.submit(event):
+                    if metrics:
+                        metrics.forward_dropped(route.url)
+                    console.print(f"  [bold red]Forward queue for {route.url} full, event dropped[/bold red]")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _print_suppressed(throttle.drain())
+        if router:
+            _close_router(router)
+        stop_summaries()
+        if recorder:
+            recorder.close()
+            console.print(f"[dim]Recorded {recorder.count} event(s) to {record}.[/dim]")
+        for tag, stream in streams.items():
+            _print_stream_summary(stream.stats, tag if tagged else None)
+
+
+def _start_metrics(
+    metrics: ListenerMetrics | None,
+    port: int | None,
+    summary_every: float,
+) -> Callable[[], None]:
+    """Start the metrics server and summary ticker; returns a function that stops both."""
+    if metrics is None:
+        return lambda: None
+    server = None
+    if port is not None:
+        try:
+            server = serve_metrics(metrics, port)
+        except OSError as exc:
+            raise CLIError(f"Cannot serve metrics on port {port}: {exc.strerror or exc}") from None
+        console.print(f"[dim]Metrics: http://127.0.0.1:{server.server_address[1]}/metrics[/dim]")
+
+    done = threading.Event()
+
+    def tick() -> None:
+        while not done.wait(summary_every):
+            console.print(f"[dim]{metrics.summary()}[/dim]")
+
+    if summary_every > 0:
+        threading.Thread(target=tick, name="listen-summary", daemon=True).start()
+
+    def stop() -> None:
+        done.set()
+        if server:
+            server.shutdown()
+            server.server_close()
+        if summary_every > 0:
+            console.print(f"[dim]{metrics.summary()}[/dim]")
+
+    return stop
+
+
+def _listen_sources(ctx: typer.Context, orgs: list[str]) -> dict[str, tuple[str, str]]:
+    """Tag -> (SSE URL, token) for each --org, or the default org."""
+    environment = get_cli_context(ctx).environment
+    sources: dict[str, tuple[str, str]] = {}
+    for spec in orgs or [resolve_org_id(ctx, None)]:
+        prefix, sep, org_id = spec.partition(":")
+        env = environment
+        if sep:
+            try:
+                env = Environment(prefix)
+            except ValueError:
+                raise CLIError(f"Unknown environment '{prefix}' in --org {spec}. Use 'production:' or 'sandbox:'.") from None
+            org_id = org_id or get_default_org_id(env) or ""
+            if not org_id:
+                raise CLIError(f"No default organization for {env}. Pass --org {env}:<id>.")
+        else:
+            org_id = spec
+        tag = f"{env}:{org_id}" if sep else org_id
+        sources[tag] = (f"{get_base_url(ctx, env)}/v1/cli/listen/{org_id}", require_token(ctx, env))
+    return sources
+
+
+REPLAY_FIELDS = [
+    Column("Events", "events"),
+    Column("Succeeded", "succeeded"),
+    Column("Failed", "failed"),
+    Column("Duration (s)", "duration"),
+    Column("Events/s", "rate"),
+    Column("Latency p50 (ms)", "latency_ms.p50"),
+    Column("Latency p90 (ms)", "latency_ms.p90"),
+    Column("Latency p99 (ms)", "latency_ms.p99"),
+    Column("Latency max (ms)", "latency_ms.max"),
+]
 
-                _display_event(event, key)
 
-                if forward_to and key == "webhook.created":
-                    _forward_event(http_client, forward_to, event)
+@app.command("replay")
+@handle_errors
+def replay(
+    ctx: typer.Context,
+    file: Annotated[str, typer.Argument(help="Recording made with 'webhooks listen --record' ('-' for stdin).")],
+    forward_to: Annotated[str, typer.Option("--forward-to", "-f", help="URL to send the recorded webhooks to.")],
+    rate: Annotated[float | None, typer.Option("--rate", min=0.01, help="Send at a fixed number of events per second.")] = None,
+    max_speed: Annotated[bool, typer.Option("--max", help="Send as fast as the target accepts.")] = False,
+    speed: Annotated[float, typer.Option("--speed", min=0.01, help="Speed-up factor for the original timing.")] = 1.0,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Requests in flight.")] = DEFAULT_FORWARD_CONCURRENCY,
+    timeout: Annotated[float, typer.Option("--timeout", help="Seconds to wait for each response.")] = DEFAULT_FORWARD_TIMEOUT,
+) -> None:
+    """Replay recorded webhooks against a URL and report its latency.
+
+    Uses the original timing by default; --rate and --max turn it into a
+    load generator.
+    """
+    if rate is not None and max_speed:
+        raise CLIError("Use either --rate or --max, not both.")
+    if file != "-" and not Path(file).exists():
+        raise CLIError(f"File not found: {file}")
+    pacing = Pacing(rate=rate, speed=speed, unthrottled=max_speed)
+
+    latencies: list[float] = []
+
+    def on_result(result: ForwardResult) -> None:
+        if result.ok:
+            latencies.append(result.elapsed)
+        else:
+            _print_forward_result(result)
+
+    forwarder = Forwarder(forward_to, concurrency=concurrency, queue_size=concurrency * 2, timeout=timeout, on_result=on_result)
+    started = time.monotonic()
+    sent = 0
+    try:
+        for event in paced(read_recording(Path(file), keys={"webhook.created"}), pacing):
+            forwarder.submit(event, block=True)
+            sent += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        forwarder.close()
+    duration = time.monotonic() - started
+
+    summary = {
+        "events": sent,
+        "succeeded": forwarder.stats.forwarded,
+        "failed": forwarder.stats.failed,
+        "duration": round(duration, 2),
+        "rate": round(sent / duration, 1) if duration else 0.0,
+        "latency_ms": {k: round(v * 1000, 1) for k, v in percentiles(latencies).items()},
+    }
+    render_detail(summary, REPLAY_FIELDS, get_output_format(ctx))
+    if forwarder.stats.failed:
+        raise typer.Exit(EXIT_ERROR)
+
+
+def _print_connected(stats: StreamStats, tag: str | None = None) -> None:
+    if stats.connects > 1:
+        where = f" to {tag}" if tag else ""
+        resumed = f", resuming after event {stats.last_event_id}" if stats.last_event_id else ""
+        console.print(f"[bold green]Reconnected{where}[/bold green][dim] (reconnect #{stats.reconnects}{resumed})[/dim]")
+
+
+def _print_reconnecting(info: Reconnecting, tag: str | None = None) -> None:
+    where = f" from {tag}" if tag else ""
+    note = "" if info.resuming else ", events sent meanwhile may be missed"
+    console.print(
+        f"[bold yellow]Disconnected{where}:[/bold yellow] {info.reason}. "
+        f"[dim]Reconnecting in {info.delay:.1f}s (attempt {info.attempt}{note})...[/dim]"
+    )
+
+
+def _print_stream_summary(stats: StreamStats, tag: str | None = None) -> None:
+    if stats.reconnects:
+        where = f"{tag}: " if tag else ""
+        console.print(
+            f"[dim]{where}Reconnected {stats.reconnects} time(s), {stats.gaps} possible gap(s), "
+            f"{stats.downtime:.0f}s disconnected.[/dim]"
+        )
+
+
+def _show_event(throttle: DisplayThrottle, event: dict[str, object], key: str) -> None:
+    decision = throttle.decide()
+    if decision.style is None:
+        return
+    _print_suppressed(decision.coalesced)
+    if decision.switched:
+        if throttle.compact:
+            console.print(f"[dim]{throttle.rate:.0f} events/s, switching to compact output[/dim]")
+        else:
+            console.print("[dim]Event rate back to normal, switching to full output[/dim]")
+    if decision.style == "compact":
+        console.out(_compact_line(event, key), highlight=False)
+    else:
+        _display_event(event, key)
+
+
+def _print_suppressed(count: int) -> None:
+    if count:
+        console.print(f"[dim]… {count} more event(s)[/dim]")
+
+
+def _compact_line(event: dict[str, object], key: str) -> str:
+    """``ts key type resource-id`` on one line, without highlighting."""
+    parts = [str(event.get("ts", "")), str(event.get("source", "")), key, webhook_type(event) or ""]
+    payload = event.get("payload")
+    webhook = payload.get("payload", payload) if isinstance(payload, dict) else None
+    data = webhook.get("data") if isinstance(webhook, dict) else None
+    if isinstance(data, dict) and data.get("id"):
+        parts.append(str(data["id"]))
+    return " ".join(part for part in parts if part)
 
 
 def _display_event(event: dict[str, object], key: str) -> None:
@@ -100,8 +428,10 @@ def _display_event(event: dict[str, object], key: str) -> None:
     event_headers = event.get("headers", {})
     ts = event.get("ts", "")
 
+    source = f" [cyan]{event['source']}[/cyan]" if event.get("source") else ""
+
     syntax = Syntax(json.dumps(payload, indent=2, default=str), "json", theme="monokai", line_numbers=False)
-    console.print(Panel(syntax, title=f"[bold]{key}[/bold] [dim]{ts}[/dim]", border_style="blue"))
+    console.print(Panel(syntax, title=f"[bold]{key}[/bold]{source} [dim]{ts}[/dim]", border_style="blue"))
 
     if isinstance(event_headers, dict) and event_headers:
         header_lines = "\n".join(f"  {k}: {v}" for k, v in event_headers.items())
@@ -109,23 +439,59 @@ def _display_event(event: dict[str, object], key: str) -> None:
     console.print()
 
 
-def _forward_event(http_client: httpx.Client, url: str, event: dict[str, object]) -> None:
-    payload = event.get("payload", {})
-    event_headers = event.get("headers", {})
-    if not isinstance(payload, dict) or not isinstance(event_headers, dict):
+def _print_forward_result(result: ForwardResult, target: str | None = None) -> None:
+    queued = f" [dim](queue {result.queue_depth})[/dim]" if result.queue_depth else ""
+    if result.attempt > 1:
+        queued += f" [dim](attempt {result.attempt})[/dim]"
+    arrow = f"→ {target}" if target else "→"
+    if result.error is not None:
+        console.print(f"  [bold red]Forward failed[/bold red] [dim]{arrow}[/dim]: {result.error}{queued}")
         return
+    style = "green" if result.ok else "red"
+    console.print(
+        f"  [dim]Forwarded {arrow}[/dim] [{style}]{result.status_code}[/{style}] "
+        f"[dim]{result.elapsed * 1000:.0f}ms[/dim]{queued}"
+    )
 
-    webhook_payload = payload.get("payload", payload)
-    body = json.dumps(webhook_payload, default=str)
-    forward_headers = dict(event_headers)
-    forward_headers["content-type"] = "application/json"
 
+def _close_router(router: ForwardRouter) -> None:
+    depth = sum(forwarder.depth for _, forwarder in router)
+    if depth:
+        console.print(f"[dim]Waiting for {depth} queued event(s) to be forwarded...[/dim]")
     try:
-        resp = http_client.post(url, content=body, headers=forward_headers, timeout=10)
-        style = "green" if resp.status_code < 400 else "red"
-        console.print(f"  [dim]Forwarded →[/dim] [{style}]{resp.status_code}[/{style}] {url}")
-    except httpx.RequestError as exc:
-        console.print(f"  [bold red]Forward failed:[/bold red] {exc}")
+        router.close(timeout=DRAIN_TIMEOUT)
+    except KeyboardInterrupt:
+        pass
+    for (route, forwarder), retries in zip(router, router.retry_queues):
+        stats = forwarder.stats
+        target = f" to {route.url}" if len(router.routes) > 1 else ""
+        console.print(
+            f"[dim]Forwarded {stats.forwarded}{target}, failed {stats.failed}, dropped {stats.dropped} "
+            f"(peak queue {stats.max_depth}).[/dim]"
+        )
+        if retries is None:
+            continue
+        if retries.stats.retried or len(retries):
+            console.print(
+                f"[dim]Retried {retries.stats.retried} (recovered {retries.stats.recovered}); "
+                f"{len(retries)} still queued for retry.[/dim]"
+            )
+        if retries.stats.dead_lettered:
+            console.print(
+                f"[yellow]{retries.stats.dead_lettered} event(s) gave up after {retries.max_attempts} attempt(s), "
+                f"saved to {retries.dead_letter}.[/yellow] [dim]Resend with --retry-failed.[/dim]"
+            )
+
+
+def _resume_retries(router: ForwardRouter, retry_failed: bool) -> None:
+    for route, retries in zip(router.routes, router.retry_queues):
+        if retries is None:
+            continue
+        if retry_failed:
+            count = retries.requeue_dead_letters()
+            console.print(f"[dim]Resending {count} dead-lettered event(s) to {route.url}.[/dim]")
+        if len(retries):
+            console.print(f"[dim]{len(retries)} event(s) queued for retry to {route.url}.[/dim]")
 
 
 # --- Endpoint CRUD ---
@@ -151,13 +517,12 @@ def list_endpoints(
 @handle_errors
 def get_endpoint(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Webhook endpoint ID.")],
+    ids: Annotated[list[str] | None, typer.Argument(help="Webhook endpoint ID(s).", show_default=False)] = None,
+    ids_from: Annotated[str | None, typer.Option("--ids-from", help="Read IDs from a file, one per line ('-' for stdin).")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Parallel requests when fetching several IDs.")] = DEFAULT_CONCURRENCY,
 ) -> None:
-    """Get details for a webhook endpoint."""
-    client = get_client(ctx)
-    with client:
-        endpoint = client.webhooks.get_webhook_endpoint(id=id)
-    render_detail(endpoint, ENDPOINT_DETAIL_FIELDS, get_output_format(ctx))
+    """Get details for one or more webhook endpoints."""
+    get_many(ctx, read_ids(ids, ids_from), lambda client, id: client.webhooks.get_webhook_endpoint(id=id), ENDPOINT_DETAIL_FIELDS, concurrency)
 
 
 @app.command("create-endpoint")
@@ -191,6 +556,7 @@ def update_endpoint(
     events: Annotated[list[str] | None, typer.Option("--event", help="Event types (repeat for multiple).")] = None,
 ) -> None:
     """Update a webhook endpoint."""
+    id = resolve_id(id)
     update: dict[str, object] = {}
     if url is not None:
         update["url"] = url
@@ -214,6 +580,7 @@ def delete_endpoint(
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation.")] = False,
 ) -> None:
     """Delete a webhook endpoint."""
+    id = resolve_id(id)
     if not yes:
         typer.confirm(f"Delete webhook endpoint {id}?", abort=True)
     client = get_client(ctx)
@@ -246,17 +613,198 @@ def list_deliveries(
     render_list(res.result.items, DELIVERY_COLUMNS, res.result.pagination, get_output_format(ctx))
 
 
+REDELIVER_SUMMARY_FIELDS = [
+    Column("Deliveries scanned", "scanned"),
+    Column("Events to redeliver", "events"),
+    Column("Already delivered", "already_delivered"),
+    Column("Redelivered", "redelivered"),
+    Column("Failed", "failed"),
+    Column("Elapsed (s)", "elapsed"),
+]
+
+DEFAULT_REDELIVER_RATE = 10.0
+
+
 @app.command("redeliver")
 @handle_errors
 def redeliver(
     ctx: typer.Context,
-    id: Annotated[str, typer.Argument(help="Webhook event ID to redeliver.")],
+    id: Annotated[str | None, typer.Argument(help="Webhook event ID to redeliver.", show_default=False)] = None,
+    failed: Annotated[bool, typer.Option("--failed", help="Redeliver every event with a failed delivery (see --since).")] = False,
+    since: Annotated[str | None, typer.Option("--since", help="With --failed: only deliveries after this time (ISO 8601, or relative like 90m, 6h, 2d).")] = None,
+    endpoint_id: Annotated[str | None, typer.Option("--endpoint-id", help="With --failed: only this endpoint's deliveries.")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Redeliveries in flight.")] = DEFAULT_CONCURRENCY,
+    rate: Annotated[float, typer.Option("--rate", help="Redeliveries per second at most (0 for no limit).")] = DEFAULT_REDELIVER_RATE,
+    dry_run: Annotated[bool, typer.Option("--dry-run", help="With --failed: list the events that would be redelivered.")] = False,
 ) -> None:
-    """Redeliver a webhook event."""
+    """Redeliver a webhook event, or all events with failed deliveries.
+
+    With --failed, failed deliveries are crawled (all pages), collapsed to one
+    redelivery per event, and events that were delivered on a later attempt
+    are skipped.
+    """
+    if failed == (id is not None):
+        raise CLIError("Pass an event ID or --failed (not both).")
     client = get_client(ctx)
+    if id is not None:
+        id = resolve_id(id)
+        with client:
+            client.webhooks.redeliver_webhook_event(id=id)
+        console.print(f"[bold green]Event redelivered:[/bold green] {id}")
+        return
+
+    filters: dict[str, object] = {"succeeded": False}
+    if since:
+        filters["start_timestamp"] = _parse_since(since)
+    if endpoint_id:
+        filters["endpoint_id"] = endpoint_id
+
+    started = time.monotonic()
     with client:
-        client.webhooks.redeliver_webhook_event(id=id)
-    console.print(f"[bold green]Event redelivered:[/bold green] {id}")
+        with console.status("Finding failed deliveries..."):
+            event_ids, scanned, already_delivered = _failed_event_ids(client, filters, concurrency)
+        if dry_run:
+            for event_id in event_ids:
+                typer.echo(event_id)
+            return
+        counts = _redeliver_all(client, event_ids, concurrency, rate)
+
+    summary = {
+        "scanned": scanned,
+        "events": len(event_ids),
+        "already_delivered": already_delivered,
+        "redelivered": counts["ok"],
+        "failed": counts["failed"],
+        "elapsed": round(time.monotonic() - started, 1),
+    }
+    render_detail(summary, REDELIVER_SUMMARY_FIELDS, get_output_format(ctx))
+    if counts["failed"]:
+        raise typer.Exit(EXIT_ERROR)
+
+
+def _failed_event_ids(client: "Polar", filters: dict[str, object], concurrency: int) -> tuple[list[str], int, int]:
+    """(event IDs to redeliver, deliveries scanned, events since delivered)."""
+    seen: set[str] = set()
+    event_ids: list[str] = []
+    scanned = already_delivered = 0
+    for delivery in iter_all(client.webhooks.list_webhook_deliveries, concurrency, **filters):
+        scanned += 1
+        event = delivery.webhook_event
+        if event.id in seen:
+            continue
+        seen.add(event.id)
+        if event.succeeded:
+            already_delivered += 1
+        else:
+            event_ids.append(event.id)
+    return event_ids, scanned, already_delivered
+
+
+def _redeliver_all(client: "Polar", event_ids: list[str], concurrency: int, rate: float) -> dict[str, int]:
+    limiter = RateLimiter(rate)
+
+    def send(event_id: str) -> None:
+        def call() -> None:
+            limiter.wait()
+            client.webhooks.redeliver_webhook_event(id=event_id)
+
+        call_with_retries(call)
+
+    counts = {"ok": 0, "failed": 0}
+    progress = Progress(
+        TextColumn("[bold]Redelivering[/bold]"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("[green]{task.fields[ok]} ok[/green] [red]{task.fields[failed]} failed[/red]"),
+        TimeRemainingColumn(),
+        console=console,
+        transient=True,
+    )
+    with progress:
+        task = progress.add_task("redeliver", total=len(event_ids), ok=0, failed=0)
+        for outcome in run_concurrently(send, event_ids, concurrency):
+            if outcome.ok:
+                counts["ok"] += 1
+            else:
+                counts["failed"] += 1
+                err = to_cli_error(outcome.error)
+                progress.console.print(f"[bold red]{outcome.item}:[/bold red] {err.title}: {err.message}")
+            progress.update(task, advance=1, ok=counts["ok"], failed=counts["failed"])
+    return counts
+
+
+def _parse_since(value: str) -> datetime:
+    """An ISO 8601 timestamp, or a duration back from now (``90m``, ``6h``, ``2d``)."""
+    units = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+    amount, unit = value[:-1], value[-1:].lower()
+    if unit in units and amount.isdigit():
+        return datetime.now(UTC) - timedelta(**{units[unit]: int(amount)})
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise CLIError(f"Invalid time '{value}'.", hint="Use ISO 8601 (2024-05-01T12:00) or a duration like 90m, 6h, 2d.") from None
+
+
+@app.command("stats")
+@handle_errors
+def delivery_stats(
+    ctx: typer.Context,
+    org: Annotated[str | None, typer.Option("--org", help="Organization ID.")] = None,
+    endpoint_id: Annotated[str | None, typer.Option("--endpoint-id", help="Only this endpoint.")] = None,
+    since: Annotated[str | None, typer.Option("--since", help="Start of the window (ISO 8601, or relative like 6h, 7d).")] = "7d",
+    until: Annotated[str | None, typer.Option("--until", help="End of the window (ISO 8601, or relative).")] = None,
+    interval: Annotated[str, typer.Option("--interval", help="Failure bucket size: hour, day, week, month, year.")] = "day",
+    concurrency: Annotated[int, typer.Option("--concurrency", help="Pages fetched in parallel.")] = DEFAULT_CONCURRENCY,
+) -> None:
+    """Delivery success rates per endpoint and event type, status codes, and failures over time."""
+    if interval not in INTERVALS:
+        raise CLIError(f"Unknown interval '{interval}'. Use one of: {', '.join(INTERVALS)}.")
+    filters: dict[str, object] = {}
+    if since:
+        filters["start_timestamp"] = _parse_since(since)
+    if until:
+        filters["end_timestamp"] = _parse_since(until)
+
+    stats = DeliveryStats(interval)
+    client = get_client(ctx)
+    with client, console.status("Reading deliveries...") as status:
+        if endpoint_id:
+            urls = {endpoint_id: None}
+        else:
+            org_id = resolve_org_id(ctx, org)
+            urls = {
+                endpoint.id: endpoint.url
+                for endpoint in iter_all(client.webhooks.list_webhook_endpoints, concurrency, organization_id=org_id)
+            }
+        # Deliveries don't name their endpoint, so crawl each endpoint in turn
+        for id in urls:
+            for delivery in iter_all(client.webhooks.list_webhook_deliveries, concurrency, endpoint_id=id, **filters):
+                stats.add(id, delivery)
+                if stats.total.deliveries % PAGE_LIMIT == 0:
+                    status.update(f"Reading deliveries... {stats.total.deliveries}")
+
+    report = stats.to_dict({id: url for id, url in urls.items() if url})
+    output_format = get_output_format(ctx)
+    if output_format != OutputFormat.TABLE:
+        render_detail(report, [], output_format)
+        return
+    total = report["total"]
+    rate = f"{total['success_rate']}%" if total["success_rate"] is not None else "-"
+    console.print(f"[bold]{total['deliveries']} deliveries[/bold], {total['failed']} failed, {rate} succeeded")
+    tally_columns = [
+        Column("Deliveries", "deliveries"),
+        Column("Failed", "failed"),
+        Column("Success %", "success_rate"),
+    ]
+    for title, rows, columns in (
+        ("By endpoint", report["endpoints"], [Column("Endpoint", "endpoint"), Column("URL", "url"), *tally_columns]),
+        ("By event type", report["event_types"], [Column("Event Type", "type"), *tally_columns]),
+        ("HTTP codes", report["http_codes"], [Column("Code", "code"), Column("Deliveries", "deliveries"), Column("Share %", "share")]),
+        (f"By {interval}", report["failures"], [Column(interval.capitalize(), "bucket"), *tally_columns]),
+    ):
+        if rows:
+            console.print(f"\n[bold]{title}[/bold]")
+            render_list(rows, columns, None, output_format)
 
 
 @app.command("reset-secret")
@@ -267,6 +815,7 @@ def reset_secret(
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation.")] = False,
 ) -> None:
     """Reset the signing secret for a webhook endpoint."""
+    id = resolve_id(id)
     if not yes:
         typer.confirm(f"Reset secret for endpoint {id}?", abort=True)
     client = get_client(ctx)
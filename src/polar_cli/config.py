@@ -7,12 +7,14 @@ import stat
 from enum import StrEnum
 from pathlib import Path
 
-from platformdirs import user_config_dir
+from platformdirs import user_cache_dir, user_config_dir, user_data_dir
 from pydantic import BaseModel, Field
 
 CONFIG_DIR = Path(user_config_dir("polar", ensure_exists=True))
 CONFIG_FILE = CONFIG_DIR / "config.json"
 CREDENTIALS_FILE = CONFIG_DIR / "credentials.json"
+CACHE_DIR = Path(user_cache_dir("polar"))
+DATA_DIR = Path(user_data_dir("polar"))
 
 
 class Environment(StrEnum):
@@ -0,0 +1,248 @@
+"""Client-side deduplication of ingested events.
+
+Each event gets a key: its ``external_id`` if set, otherwise a hash of its
+canonical JSON. Keys of acknowledged events are remembered in two places:
+
+- a Bloom filter in a fixed-size, memory-mapped file, sized for the expected
+  number of keys and false-positive rate, so tens of millions of keys fit in
+  a fixed memory budget;
+- an exact window of the most recent keys, which confirms the common case of
+  re-running a job that just ran.
+
+A key the filter has never seen is definitely new. A key the filter has seen
+is treated as a duplicate; if it isn't in the recent window the match is only
+probable (an old key, or a false positive at the configured rate) and is
+counted separately.
+
+The filter's header records the capacity it was sized for and how many keys
+it holds. Past its capacity the false-positive rate climbs and new events
+would be dropped as "probable" duplicates, so a full filter is refused when
+opened, and one that fills up mid-run stops vouching for duplicates (the
+recent window still applies).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from polar_cli.config import DATA_DIR, Environment
+from polar_cli.errors import CLIError
+
+DEDUP_DIR = DATA_DIR / "dedup"
+DEFAULT_CAPACITY = 20_000_000
+DEFAULT_FALSE_POSITIVE_RATE = 0.001
+DEFAULT_WINDOW = 100_000
+
+# Warn once the filter holds this share of its capacity
+WARN_FILL = 0.8
+
+_MAGIC = b"PBF2"
+_HEADER = struct.Struct("<4sQIQQ")  # magic, bits, hash count, capacity, keys inserted
+_DIGEST_SIZE = 16
+
+REBUILD_HINT = (
+    "Rebuild it larger with --dedup-rebuild --dedup-capacity N. The recent window is kept; "
+    "older events with an external_id are still deduplicated by the API."
+)
+
+
+def event_key(event: dict[str, Any]) -> bytes:
+    """Stable 16-byte key for an event."""
+    external_id = event.get("external_id")
+    raw = f"id:{external_id}" if external_id else "json:" + json.dumps(
+        event, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.blake2b(raw.encode(), digest_size=_DIGEST_SIZE).digest()
+
+
+def bloom_parameters(capacity: int, false_positive_rate: float) -> tuple[int, int]:
+    """Optimal (bits, hash count) for a Bloom filter."""
+    bits = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFilter:
+    """Bloom filter backed by a memory-mapped file.
+
+    ``capacity`` and ``false_positive_rate`` only size a new file; an
+    existing one keeps the capacity in its header.
+    """
+
+    def __init__(self, path: Path, capacity: int, false_positive_rate: float) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists() or path.stat().st_size < _HEADER.size:
+            bits, hashes = bloom_parameters(capacity, false_positive_rate)
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, bits, hashes, capacity, 0))
+                f.truncate(_HEADER.size + bits // 8)
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.bits, self.hashes, self.capacity, self.count = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC:
+            self.close()
+            raise CLIError(f"{path} is not a dedup filter (or was written by an older version).", hint=REBUILD_HINT)
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def _positions(self, key: bytes) -> Iterator[int]:
+        # Kirsch-Mitzenmacher double hashing over the two halves of the key
+        h1 = int.from_bytes(key[:8], "little")
+        h2 = int.from_bytes(key[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def __contains__(self, key: bytes) -> bool:
+        data, offset = self._map, _HEADER.size
+        return all(data[offset + (pos >> 3)] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def add(self, key: bytes) -> None:
+        data, offset = self._map, _HEADER.size
+        new = False
+        for pos in self._positions(key):
+            byte, bit = offset + (pos >> 3), 1 << (pos & 7)
+            if not data[byte] & bit:
+                data[byte] |= bit
+                new = True
+        # A key whose bits were all set already is a duplicate or a false positive: not counted
+        if new:
+            self.count += 1
+            _HEADER.pack_into(data, 0, _MAGIC, self.bits, self.hashes, self.capacity, self.count)
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.flush()
+            self._map.close()
+        self._file.close()
+
+
+class RecentWindow:
+    """Exact set of the last ``size`` keys, persisted as raw 16-byte records."""
+
+    def __init__(self, path: Path, size: int) -> None:
+        self.path = path
+        self._order: deque[bytes] = deque(maxlen=size)
+        if path.exists():
+            data = path.read_bytes()
+            usable = len(data) - len(data) % _DIGEST_SIZE
+            self._order.extend(data[i:i + _DIGEST_SIZE] for i in range(0, usable, _DIGEST_SIZE))
+        self._keys = set(self._order)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._keys
+
+    def add(self, key: bytes) -> None:
+        if key in self._keys:
+            return
+        if len(self._order) == self._order.maxlen:
+            self._keys.discard(self._order[0])
+        self._order.append(key)
+        self._keys.add(key)
+
+    def save(self) -> None:
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_bytes(b"".join(self._order))
+        os.replace(tmp, self.path)
+
+
+@dataclass(slots=True)
+class DedupStats:
+    exact: int = 0
+    probable: int = 0
+
+    @property
+    def skipped(self) -> int:
+        return self.exact + self.probable
+
+
+class EventDeduper:
+    """Filters out events already acknowledged in this or earlier runs."""
+
+    def __init__(
+        self,
+        directory: Path,
+        capacity: int | None = None,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+        window: int = DEFAULT_WINDOW,
+        rebuild: bool = False,
+    ) -> None:
+        bloom_path = directory / "bloom.bin"
+        if rebuild:
+            bloom_path.unlink(missing_ok=True)
+        self.bloom = BloomFilter(bloom_path, capacity or DEFAULT_CAPACITY, false_positive_rate)
+        if self.bloom.full:
+            self.bloom.close()
+            raise CLIError(
+                f"The dedup filter is full ({self.bloom.count:,} keys for a capacity of {self.bloom.capacity:,}); "
+                "it would drop new events as duplicates.",
+                hint=REBUILD_HINT,
+            )
+        if capacity and capacity > self.bloom.capacity:
+            self.bloom.close()
+            raise CLIError(
+                f"The dedup filter was created for {self.bloom.capacity:,} keys; --dedup-capacity only sizes a new one.",
+                hint=REBUILD_HINT,
+            )
+        self.recent = RecentWindow(directory / "recent.bin", window)
+        self.stats = DedupStats()
+        self._pending: set[bytes] = set()
+
+    def filter(self, events: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Yield only events not seen before (including earlier in this run)."""
+        for event in events:
+            key = event_key(event)
+            if key in self._pending or key in self.recent:
+                self.stats.exact += 1
+            elif not self.bloom.full and key in self.bloom:
+                self.stats.probable += 1
+            else:
+                self._pending.add(key)
+                yield event
+
+    def commit(self, events: Iterable[dict[str, Any]]) -> None:
+        """Remember events the API has acknowledged."""
+        for event in events:
+            key = event_key(event)
+            self.bloom.add(key)
+            self.recent.add(key)
+            self._pending.discard(key)
+
+    def fill_warning(self) -> str | None:
+        """A warning once the filter is nearly or completely full."""
+        if self.bloom.count < WARN_FILL * self.bloom.capacity:
+            return None
+        state = "is full and no longer skips" if self.bloom.full else "is nearly full; past that it stops skipping"
+        return (
+            f"The dedup filter holds {self.bloom.count:,} keys for a capacity of {self.bloom.capacity:,} and "
+            f"{state} events matched only by it. {REBUILD_HINT}"
+        )
+
+    def close(self) -> None:
+        self.recent.save()
+        self.bloom.close()
+
+    def __enter__(self) -> EventDeduper:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def event_deduper(
+    environment: Environment, org_id: str | None = None, capacity: int | None = None, rebuild: bool = False
+) -> EventDeduper:
+    """The dedup filter for an environment and organization, keyed like the event spool."""
+    directory = DEDUP_DIR / "events" / environment.value / (org_id or "default")
+    return EventDeduper(directory, capacity=capacity, rebuild=rebuild)
@@ -0,0 +1,94 @@
+"""Single-pass aggregation of webhook deliveries for ``webhooks stats``.
+
+Deliveries are folded into counters as they stream in, so memory grows with
+the number of endpoints, event types, status codes and time buckets, never
+with the number of deliveries.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from polar_cli.meter_eval import parse_timestamp, truncate
+
+NO_RESPONSE = "none"
+
+
+@dataclass(slots=True)
+class Tally:
+    deliveries: int = 0
+    succeeded: int = 0
+
+    @property
+    def failed(self) -> int:
+        return self.deliveries - self.succeeded
+
+    @property
+    def success_rate(self) -> float | None:
+        return round(100 * self.succeeded / self.deliveries, 2) if self.deliveries else None
+
+    def add(self, succeeded: bool) -> None:
+        self.deliveries += 1
+        self.succeeded += succeeded
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "deliveries": self.deliveries,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "success_rate": self.success_rate,
+        }
+
+
+class DeliveryStats:
+    """Success rates per endpoint and event type, status codes, and failures over time."""
+
+    def __init__(self, interval: str = "day") -> None:
+        self.interval = interval
+        self.total = Tally()
+        self.endpoints: dict[str, Tally] = defaultdict(Tally)
+        self.event_types: dict[str, Tally] = defaultdict(Tally)
+        self.http_codes: dict[str, int] = defaultdict(int)
+        self.buckets: dict[datetime, Tally] = defaultdict(Tally)
+
+    def add(self, endpoint: str, delivery: Any) -> None:
+        """Fold in one delivery (an SDK ``WebhookDelivery`` or anything shaped like it)."""
+        succeeded = bool(delivery.succeeded)
+        event = delivery.webhook_event
+        event_type = getattr(event, "type", None)
+        self.total.add(succeeded)
+        self.endpoints[endpoint].add(succeeded)
+        self.event_types[str(getattr(event_type, "value", event_type) or "unknown")].add(succeeded)
+        self.http_codes[str(delivery.http_code) if delivery.http_code is not None else NO_RESPONSE] += 1
+        created = parse_timestamp(delivery.created_at)
+        if created is not None:
+            self.buckets[truncate(created, self.interval)].add(succeeded)
+
+    def to_dict(self, endpoint_urls: dict[str, str] | None = None) -> dict[str, Any]:
+        urls = endpoint_urls or {}
+        return {
+            "total": self.total.to_dict(),
+            "endpoints": [
+                {"endpoint": id, "url": urls.get(id), **tally.to_dict()}
+                for id, tally in sorted(self.endpoints.items(), key=lambda kv: -kv[1].deliveries)
+            ],
+            "event_types": [
+                {"type": name, **tally.to_dict()}
+                for name, tally in sorted(self.event_types.items(), key=lambda kv: -kv[1].deliveries)
+            ],
+            "http_codes": [
+                {
+                    "code": code,
+                    "deliveries": count,
+                    "share": round(100 * count / self.total.deliveries, 2),
+                }
+                for code, count in sorted(self.http_codes.items())
+            ],
+            "failures": [
+                {"bucket": bucket.isoformat(), **tally.to_dict()}
+                for bucket, tally in sorted(self.buckets.items())
+            ],
+        }
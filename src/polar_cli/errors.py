@@ -222,6 +222,35 @@ def _get_hint_for_status(status_code: int | None) -> str | None:
     return hints.get(status_code) if status_code else None
 
 
+def to_cli_error(exc: Exception) -> CLIError:
+    """Translate an exception raised while running a command into a CLIError."""
+    if isinstance(exc, CLIError):
+        return exc
+    if isinstance(exc, ValidationError):
+        errors = _parse_pydantic_errors(exc)
+        return ValidationError_(errors, hint="Check the command options with --help")
+    if isinstance(exc, SDKError):
+        cli_error = _parse_api_error(exc.body, exc.status_code)
+        if not cli_error.hint:
+            cli_error.hint = _get_hint_for_status(exc.status_code)
+        return cli_error
+    if isinstance(exc, PolarError):
+        body = getattr(exc, "body", None)
+        status = getattr(exc, "status_code", None)
+        return _parse_api_error(body, status)
+    if isinstance(exc, httpx.ConnectError):
+        return ConnectionError_("Could not connect to API server")
+    if isinstance(exc, httpx.TimeoutException):
+        return TimeoutError_("Request timed out")
+    # Unexpected error - show with traceback hint for debugging
+    cli_error = CLIError(str(exc))
+    cli_error.hint = "Run with POLAR_DEBUG=1 for more details"
+    return cli_error
+
+
+_KNOWN_ERRORS = (CLIError, ValidationError, SDKError, PolarError, httpx.ConnectError, httpx.TimeoutException)
+
+
 def handle_errors(fn: Callable[..., Any]) -> Callable[..., Any]:
     """Decorator that catches exceptions and renders user-friendly errors."""
 
@@ -231,48 +260,18 @@ def handle_errors(fn: Callable[..., Any]) -> Callable[..., Any]:
             return fn(*args, **kwargs)
         except (typer.Exit, typer.Abort):
             raise
-        except CLIError as exc:
-            exc.render()
-            raise typer.Exit(exc.exit_code) from None
-        except ValidationError as exc:
-            errors = _parse_pydantic_errors(exc)
-            cli_error = ValidationError_(errors, hint="Check the command options with --help")
-            cli_error.render()
-            raise typer.Exit(cli_error.exit_code) from None
-        except SDKError as exc:
-            cli_error = _parse_api_error(exc.body, exc.status_code)
-            if not cli_error.hint:
-                cli_error.hint = _get_hint_for_status(exc.status_code)
-            cli_error.render()
-            raise typer.Exit(cli_error.exit_code) from None
-        except PolarError as exc:
-            body = getattr(exc, "body", None)
-            status = getattr(exc, "status_code", None)
-            cli_error = _parse_api_error(body, status)
-            cli_error.render()
-            raise typer.Exit(cli_error.exit_code) from None
-        except httpx.ConnectError:
-            cli_error = ConnectionError_("Could not connect to API server")
-            cli_error.render()
-            raise typer.Exit(cli_error.exit_code) from None
-        except httpx.TimeoutException:
-            cli_error = TimeoutError_("Request timed out")
-            cli_error.render()
-            raise typer.Exit(cli_error.exit_code) from None
         except KeyboardInterrupt:
             console.print("\n[dim]Cancelled[/dim]")
             raise typer.Exit(130) from None
         except Exception as exc:
-            # Unexpected error - show with traceback hint for debugging
-            cli_error = CLIError(str(exc))
-            cli_error.hint = "Run with POLAR_DEBUG=1 for more details"
+            cli_error = to_cli_error(exc)
             cli_error.render()
-            # In debug mode, re-raise to show traceback
-            if sys.stderr.isatty():
+            # In debug mode, re-raise unexpected errors to show the traceback
+            if not isinstance(exc, _KNOWN_ERRORS) and sys.stderr.isatty():
                 import os
                 if os.environ.get("POLAR_DEBUG"):
                     raise
-            raise typer.Exit(EXIT_ERROR) from None
+            raise typer.Exit(cli_error.exit_code) from None
 
     return wrapper
 
@@ -287,6 +286,7 @@ __all__ = [
     "ConnectionError_",
     "TimeoutError_",
     "handle_errors",
+    "to_cli_error",
     "EXIT_OK",
     "EXIT_ERROR",
     "EXIT_AUTH_ERROR",
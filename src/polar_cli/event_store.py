@@ -0,0 +1,408 @@
+"""Columnar on-disk store for exported events.
+
+A store is a directory of fixed-width column files, one value per event, in
+export order:
+
+- ``timestamp.i64`` — microseconds since the epoch (UTC)
+- ``name.u32`` / ``customer.u32`` — codes into ``names.json`` / ``customers.json``
+- ``meta/<key>.f64`` — numeric metadata values, NaN where absent
+- ``meta/<key>.u32`` — other metadata values as codes into ``meta/<key>.json``
+
+``store.json`` records the row count and which metadata columns exist; it is
+written last, so rows past that count (from an interrupted export) are
+truncated away on the next open. Column files are little-endian and are read
+back through ``mmap``, so a query only pages in the columns it touches.
+
+Stats use C-level kernels from the standard library rather than per-row
+Python: ``Counter`` over code columns, ``sum`` over float slices, and
+``bisect`` on the timestamp column, which stays sorted as long as events are
+appended in time order.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import mmap
+import os
+import sys
+from array import array
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterable
+
+from polar_cli.errors import CLIError
+from polar_cli.meter_eval import next_bucket, parse_timestamp, truncate
+
+STORE_VERSION = 1
+MISSING = 0xFFFFFFFF  # code for "no value" in u32 columns
+CHUNK_ROWS = 65_536
+
+_TYPECODES = {"i64": "q", "u32": "I", "f64": "d"}
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_micros(ts: datetime) -> int:
+    ts = ts if ts.tzinfo else ts.replace(tzinfo=UTC)
+    return (ts - _EPOCH) // _MICROSECOND
+
+
+def from_micros(value: int) -> datetime:
+    return _EPOCH + value * _MICROSECOND
+
+
+def _write_array(path: Path, values: array) -> None:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    with open(path, "ab") as f:
+        values.tofile(f)
+
+
+class _Dictionary:
+    """Interns strings to dense u32 codes."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.values: list[str] = json.loads(path.read_text()) if path.exists() else []
+        self._codes = {value: code for code, value in enumerate(self.values)}
+
+    def code(self, value: Any) -> int:
+        if value is None:
+            return MISSING
+        value = str(value)
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def save(self) -> None:
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.values))
+        os.replace(tmp, self.path)
+
+
+@dataclass(slots=True)
+class _Column:
+    path: Path
+    kind: str
+    buffer: array
+    dictionary: _Dictionary | None = None
+
+
+class EventStoreWriter:
+    """Appends events to a store, a chunk of rows at a time."""
+
+    def __init__(self, directory: Path, truncate_to: int | None = None) -> None:
+        self.directory = directory
+        (directory / "meta").mkdir(parents=True, exist_ok=True)
+        self._meta = _read_meta(directory)
+        if truncate_to is not None and truncate_to < self._meta["rows"]:
+            # Roll back rows appended after a known-good point (e.g. a resumed export)
+            self._meta["rows"] = truncate_to
+            self._meta["last_timestamp"] = _last_timestamp(directory, truncate_to)
+        self.rows = self._meta["rows"]
+        _truncate_columns(directory, self._meta)
+        self._names = _Dictionary(directory / "names.json")
+        self._customers = _Dictionary(directory / "customers.json")
+        self._timestamps = _Column(directory / "timestamp.i64", "i64", array("q"))
+        self._name_codes = _Column(directory / "name.u32", "u32", array("I"))
+        self._customer_codes = _Column(directory / "customer.u32", "u32", array("I"))
+        self._metadata: dict[tuple[str, str], _Column] = {}
+        self._pending = 0
+        self.skipped = 0
+        for key, kinds in self._meta["metadata"].items():
+            for kind in kinds:
+                self._metadata_column(key, kind)
+
+    def _metadata_column(self, key: str, kind: str) -> _Column:
+        column = self._metadata.get((key, kind))
+        if column is None:
+            path = self.directory / "meta" / f"{_safe(key)}.{kind}"
+            fill = math.nan if kind == "f64" else MISSING
+            column = _Column(path, kind, array(_TYPECODES[kind]))
+            if kind == "u32":
+                column.dictionary = _Dictionary(path.with_suffix(".json"))
+            kinds = self._meta["metadata"].setdefault(key, [])
+            if kind not in kinds:
+                # Backfill rows written before this key first appeared
+                kinds.append(kind)
+                path.unlink(missing_ok=True)
+                _write_array(path, array(_TYPECODES[kind], [fill] * self.rows))
+                column.buffer.extend([fill] * self._pending)
+            self._metadata[(key, kind)] = column
+        return column
+
+    def append(self, events: Iterable[dict[str, Any]]) -> int:
+        """Add events; returns how many were written (events without a timestamp are skipped)."""
+        written = 0
+        last = self._meta.get("last_timestamp")
+        for event in events:
+            ts = parse_timestamp(event.get("timestamp"))
+            if ts is None:
+                self.skipped += 1
+                continue
+            micros = to_micros(ts)
+            if last is not None and micros < last:
+                self._meta["sorted"] = False
+            last = micros
+            self._timestamps.buffer.append(micros)
+            self._name_codes.buffer.append(self._names.code(event.get("name")))
+            self._customer_codes.buffer.append(
+                self._customers.code(event.get("customer_id") or event.get("external_customer_id"))
+            )
+            metadata = event.get("metadata") or {}
+            for key, value in metadata.items():
+                kind = "f64" if isinstance(value, (int, float)) and not isinstance(value, bool) else "u32"
+                column = self._metadata_column(key, kind)
+                column.buffer.append(value if kind == "f64" else column.dictionary.code(value))
+            self._pending += 1
+            for column in self._metadata.values():
+                if len(column.buffer) < self._pending:
+                    column.buffer.append(math.nan if column.kind == "f64" else MISSING)
+            written += 1
+            if self._pending >= CHUNK_ROWS:
+                self._meta["last_timestamp"] = last
+                self.flush()
+        self._meta["last_timestamp"] = last
+        return written
+
+    def flush(self) -> None:
+        """Write buffered rows and then the metadata that makes them visible."""
+        columns = [self._timestamps, self._name_codes, self._customer_codes, *self._metadata.values()]
+        for column in columns:
+            _write_array(column.path, column.buffer)
+            del column.buffer[:]
+            if column.dictionary is not None:
+                column.dictionary.save()
+        self._names.save()
+        self._customers.save()
+        self.rows += self._pending
+        self._pending = 0
+        self._meta["rows"] = self.rows
+        _write_meta(self.directory, self._meta)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> EventStoreWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _safe(key: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else f"%{ord(c):02x}" for c in key)
+
+
+def _read_meta(directory: Path) -> dict[str, Any]:
+    path = directory / "store.json"
+    if not path.exists():
+        return {"version": STORE_VERSION, "rows": 0, "sorted": True, "last_timestamp": None, "metadata": {}}
+    meta = json.loads(path.read_text())
+    if meta.get("version") != STORE_VERSION:
+        raise CLIError(f"Unsupported event store version in {directory}.")
+    return meta
+
+
+def _write_meta(directory: Path, meta: dict[str, Any]) -> None:
+    tmp = directory / "store.json.tmp"
+    tmp.write_text(json.dumps(meta, indent=2))
+    os.replace(tmp, directory / "store.json")
+
+
+def _column_paths(directory: Path, meta: dict[str, Any]) -> list[tuple[Path, int]]:
+    paths = [(directory / "timestamp.i64", 8), (directory / "name.u32", 4), (directory / "customer.u32", 4)]
+    for key, kinds in meta["metadata"].items():
+        paths.extend((directory / "meta" / f"{_safe(key)}.{kind}", 8 if kind == "f64" else 4) for kind in kinds)
+    return paths
+
+
+def _last_timestamp(directory: Path, rows: int) -> int | None:
+    if rows == 0:
+        return None
+    with open(directory / "timestamp.i64", "rb") as f:
+        f.seek((rows - 1) * 8)
+        return int.from_bytes(f.read(8), "little", signed=True)
+
+
+def _truncate_columns(directory: Path, meta: dict[str, Any]) -> None:
+    for path, width in _column_paths(directory, meta):
+        if path.exists() and path.stat().st_size > meta["rows"] * width:
+            os.truncate(path, meta["rows"] * width)
+
+
+class EventStore:
+    """Read-only, memory-mapped view of a store."""
+
+    def __init__(self, directory: Path) -> None:
+        if not (directory / "store.json").exists():
+            raise CLIError(f"No event store at {directory}.", hint="Create one with 'polar events export --store DIR'")
+        self.directory = directory
+        self.meta = _read_meta(directory)
+        self.rows: int = self.meta["rows"]
+        self.names = _Dictionary(directory / "names.json").values
+        self.customers = _Dictionary(directory / "customers.json").values
+        self._stack = ExitStack()
+
+    def column(self, path: Path, kind: str) -> memoryview | array:
+        """Map a column file as a typed view of the committed rows."""
+        typecode = _TYPECODES[kind]
+        if self.rows == 0 or not path.exists():
+            return array(typecode)
+        if sys.byteorder != "little":
+            values = array(typecode, path.read_bytes()[: self.rows * array(typecode).itemsize])
+            values.byteswap()
+            return values
+        f = self._stack.enter_context(open(path, "rb"))
+        mapped = self._stack.enter_context(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        view = memoryview(mapped)
+        self._stack.callback(view.release)
+        typed = view.cast(typecode)[: self.rows]
+        self._stack.callback(typed.release)
+        return typed
+
+    @property
+    def timestamps(self) -> memoryview | array:
+        return self.column(self.directory / "timestamp.i64", "i64")
+
+    @property
+    def name_codes(self) -> memoryview | array:
+        return self.column(self.directory / "name.u32", "u32")
+
+    @property
+    def customer_codes(self) -> memoryview | array:
+        return self.column(self.directory / "customer.u32", "u32")
+
+    def metadata_values(self, key: str) -> memoryview | array:
+        key = key.removeprefix("metadata.")
+        if "f64" not in self.meta["metadata"].get(key, []):
+            raise CLIError(f"No numeric metadata column {key!r} in the store.")
+        return self.column(self.directory / "meta" / f"{_safe(key)}.f64", "f64")
+
+    def close(self) -> None:
+        self._stack.close()
+
+    def __enter__(self) -> EventStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+@dataclass(slots=True)
+class GroupStats:
+    group: str
+    events: int
+    sum: float | None = None
+
+
+def _row_range(store: EventStore, start: datetime | None, end: datetime | None) -> tuple[int, int]:
+    if start is None and end is None:
+        return 0, store.rows
+    if not store.meta["sorted"]:
+        raise CLIError("--start/--end need a store written in time order.", hint="Re-export into a fresh store")
+    timestamps = store.timestamps
+    lo = bisect.bisect_left(timestamps, to_micros(start)) if start else 0
+    hi = bisect.bisect_left(timestamps, to_micros(end)) if end else store.rows
+    return lo, hi
+
+
+def _nansum(values: Iterable[float]) -> float:
+    total = math.fsum(values)
+    if total != total:  # some values are NaN (absent); only then filter per row
+        total = math.fsum(v for v in values if v == v)
+    return total
+
+
+def _sum_by_code(codes: Iterable[int], values: Iterable[float]) -> dict[int, float]:
+    sums: defaultdict[int, float] = defaultdict(float)
+    for code, value in zip(codes, values):
+        if value == value:  # skip NaN
+            sums[code] += value
+    return sums
+
+
+def stats_by_code(
+    store: EventStore,
+    by: str,
+    sum_key: str | None = None,
+    name: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> list[GroupStats]:
+    """Event counts (and optional metadata sums) per event name or customer."""
+    lo, hi = _row_range(store, start, end)
+    codes = (store.name_codes if by == "name" else store.customer_codes)[lo:hi]
+    labels = store.names if by == "name" else store.customers
+    values = store.metadata_values(sum_key)[lo:hi] if sum_key else None
+
+    if name is not None:
+        if name not in store.names:
+            return []
+        wanted = store.names.index(name)
+        keep = [i for i, code in enumerate(store.name_codes[lo:hi]) if code == wanted]
+        codes = [codes[i] for i in keep]
+        values = [values[i] for i in keep] if values is not None else None
+
+    counts = Counter(codes)
+    sums = _sum_by_code(codes, values) if values is not None else {}
+    return [
+        GroupStats(
+            labels[code] if code != MISSING else "(none)",
+            count,
+            sums.get(code, 0.0) if values is not None else None,
+        )
+        for code, count in counts.most_common()
+    ]
+
+
+def stats_by_time(
+    store: EventStore,
+    interval: str,
+    sum_key: str | None = None,
+    name: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> list[GroupStats]:
+    """Event counts (and optional metadata sums) per time bucket.
+
+    On a time-ordered store each bucket is a contiguous row range found by
+    bisection, so counting is O(buckets · log rows) and sums run over slices.
+    """
+    if not store.meta["sorted"]:
+        raise CLIError("Time buckets need a store written in time order.", hint="Re-export into a fresh store")
+    lo, hi = _row_range(store, start, end)
+    if lo >= hi:
+        return []
+    timestamps = store.timestamps
+    values = store.metadata_values(sum_key) if sum_key else None
+    name_codes = store.name_codes if name is not None else None
+    wanted = store.names.index(name) if name in store.names else None
+    if name is not None and wanted is None:
+        return []
+
+    results = []
+    bucket = truncate(from_micros(timestamps[lo]), interval)
+    last = from_micros(timestamps[hi - 1])
+    row = lo
+    while bucket <= last:
+        upper = next_bucket(bucket, interval)
+        end_row = min(hi, bisect.bisect_left(timestamps, to_micros(upper), row, hi))
+        if name_codes is None:
+            count = end_row - row
+            total = _nansum(values[row:end_row]) if values is not None else None
+        else:
+            rows = [i for i in range(row, end_row) if name_codes[i] == wanted]
+            count = len(rows)
+            total = math.fsum(values[i] for i in rows if values[i] == values[i]) if values is not None else None
+        results.append(GroupStats(bucket.isoformat(), count, total))
+        bucket, row = upper, end_row
+    return results
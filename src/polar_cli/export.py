@@ -0,0 +1,206 @@
+"""Time-sharded parallel event export with per-shard checkpoints.
+
+The export range is split into equal time shards that are crawled
+concurrently, each one page at a time, into its own NDJSON part file under a
+checkpoint directory. After every page the shard's checkpoint records the
+page reached and the part file's size. A rerun with the same parameters
+truncates each part back to its last checkpoint and carries on from there.
+Shards cover disjoint, consecutive time ranges and each is fetched oldest
+first, so concatenating the parts in shard order gives the whole range in
+timestamp order.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from polar_cli.bulk import DEFAULT_CONCURRENCY, PAGE_LIMIT, call_with_retries, run_concurrently
+from polar_cli.config import DATA_DIR
+from polar_cli.meter_eval import parse_timestamp
+
+if TYPE_CHECKING:
+    from polar_sdk import Polar
+
+EXPORT_DIR = DATA_DIR / "exports"
+
+# Widen each request by this much and filter locally, so events sitting
+# exactly on a shard boundary land in one shard whatever the API's bounds
+BOUNDARY_SLACK = timedelta(seconds=1)
+
+
+@dataclass(frozen=True, slots=True)
+class Shard:
+    index: int
+    start: datetime
+    end: datetime
+
+
+def plan_shards(start: datetime, end: datetime, count: int) -> list[Shard]:
+    """Split ``[start, end)`` into ``count`` equal, consecutive shards."""
+    start, end = _utc(start), _utc(end)
+    count = max(1, count)
+    step = (end - start) / count
+    bounds = [start + step * i for i in range(count)] + [end]
+    return [Shard(i, bounds[i], bounds[i + 1]) for i in range(count)]
+
+
+def _utc(ts: datetime) -> datetime:
+    return ts.astimezone(UTC) if ts.tzinfo else ts.replace(tzinfo=UTC)
+
+
+def checkpoint_dir(filters: dict[str, Any], start: datetime, end: datetime | None, shards: int) -> Path:
+    """Checkpoint directory keyed by everything that determines an export's contents.
+
+    An open-ended export (no ``end``) is keyed without one; ``pinned_end``
+    records the end it resolved to, so a rerun resumes the same range.
+    """
+    key = json.dumps(
+        {
+            "filters": filters,
+            "start": _utc(start).isoformat(),
+            "end": _utc(end).isoformat() if end else None,
+            "shards": shards,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return EXPORT_DIR / hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def pinned_end(directory: Path, default: datetime) -> datetime:
+    """The end an earlier run of this open-ended export used, or ``default`` (now recorded)."""
+    path = directory / "range.json"
+    if path.exists():
+        return datetime.fromisoformat(json.loads(path.read_text())["end"])
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"end": _utc(default).isoformat()}))
+    os.replace(tmp, path)
+    return _utc(default)
+
+
+@dataclass(slots=True)
+class ShardState:
+    page: int = 0
+    bytes: int = 0
+    events: int = 0
+    done: bool = False
+
+
+class ShardCheckpoint:
+    """A shard's part file and its progress record."""
+
+    def __init__(self, directory: Path, shard: Shard) -> None:
+        self.part = directory / f"shard-{shard.index:05d}.ndjson"
+        self.path = directory / f"shard-{shard.index:05d}.json"
+        self.state = ShardState(**json.loads(self.path.read_text())) if self.path.exists() else ShardState()
+
+    def save(self) -> None:
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(self.state)))
+        os.replace(tmp, self.path)
+
+
+def _fetch_shard(
+    client: Polar,
+    shard: Shard,
+    directory: Path,
+    filters: dict[str, Any],
+    on_page: Callable[[int], None] | None,
+) -> ShardCheckpoint:
+    checkpoint = ShardCheckpoint(directory, shard)
+    state = checkpoint.state
+    if state.done:
+        return checkpoint
+
+    with open(checkpoint.part, "ab") as out:
+        # Drop anything written after the last checkpoint
+        out.truncate(state.bytes)
+        page = state.page
+        while True:
+            page += 1
+            res = call_with_retries(lambda: client.events.list(
+                **filters,
+                start_timestamp=shard.start - BOUNDARY_SLACK,
+                end_timestamp=shard.end + BOUNDARY_SLACK,
+                sorting=["timestamp"],
+                page=page,
+                limit=PAGE_LIMIT,
+            ))
+            written = 0
+            for event in res.items:
+                data = event.model_dump(mode="json")
+                ts = parse_timestamp(data.get("timestamp"))
+                if ts is not None and not shard.start <= _utc(ts) < shard.end:
+                    continue
+                out.write(json.dumps(data, separators=(",", ":")).encode() + b"\n")
+                written += 1
+            out.flush()
+            os.fsync(out.fileno())
+            state.page, state.bytes, state.events = page, out.tell(), state.events + written
+            state.done = page >= res.pagination.max_page or not res.items
+            checkpoint.save()
+            if on_page:
+                on_page(written)
+            if state.done:
+                return checkpoint
+
+
+def export_shards(
+    client: Polar,
+    shards: list[Shard],
+    directory: Path,
+    filters: dict[str, Any],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_page: Callable[[int], None] | None = None,
+) -> Iterator[tuple[Shard, ShardCheckpoint]]:
+    """Crawl shards concurrently, yielding each finished shard in shard order.
+
+    A shard that fails after retries raises once every earlier shard has been
+    yielded; its checkpoint (and those of shards still in flight) is kept so a
+    rerun resumes where they stopped.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    lock = threading.Lock()
+
+    def report(count: int) -> None:
+        if on_page:
+            with lock:
+                on_page(count)
+
+    def fetch(shard: Shard) -> ShardCheckpoint:
+        return _fetch_shard(client, shard, directory, filters, report)
+
+    for outcome in run_concurrently(fetch, shards, concurrency):
+        if outcome.error is not None:
+            raise outcome.error
+        yield outcome.item, outcome.value
+
+
+def load_merge_state(directory: Path, store: Path) -> tuple[int, int] | None:
+    """(shards merged, store rows after them) recorded by an earlier run into ``store``."""
+    path = directory / "merged.json"
+    if not path.exists():
+        return None
+    state = json.loads(path.read_text())
+    if state["store"] != str(store.resolve()):
+        return None
+    return state["shards"], state["store_rows"]
+
+
+def save_merge_state(directory: Path, store: Path, shards: int, store_rows: int) -> None:
+    tmp = directory / "merged.json.tmp"
+    tmp.write_text(json.dumps({"store": str(store.resolve()), "shards": shards, "store_rows": store_rows}))
+    os.replace(tmp, directory / "merged.json")
+
+
+def remove_checkpoints(directory: Path) -> None:
+    shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,557 @@
+"""Forwarding of webhook events to a local URL, off the SSE read loop.
+
+Events are put on a bounded queue and POSTed by a pool of worker threads, so
+a slow local handler never stalls the stream. ``submit`` doesn't block by
+default: if the queue is full the event is dropped and counted, which keeps
+the listener reading at full speed and makes the overload visible.
+
+With ``ordered=True`` each event is routed to a worker by a key (the
+resource ID in the payload), so events about the same object are delivered
+in the order they were received while unrelated ones still run in parallel.
+
+``ForwardRouter`` fans events out to several targets, each a ``Route`` with
+an optional list of webhook types (``fnmatch`` patterns). Every route gets
+its own ``Forwarder`` (queue, workers and connection pool), so a slow target
+fills only its own queue and never delays the others.
+
+With retries enabled, each route also gets a ``RetryQueue``: events that
+fail with a transport error, 408, 429 or 5xx (or overflow the live queue)
+are written to a spool directory and re-sent with exponential backoff by
+a separate thread and connection, so retries never hold up live events.
+Events that run out of attempts, or get a non-retryable 4xx, go to a
+dead-letter file. The spool survives restarts: the next listener
+forwarding to the same URL resumes it. While a listener is running it holds
+the target's spool exclusively, so a second one forwarding to the same URL
+with retries fails at startup instead of re-sending the same events.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import queue
+import random
+import threading
+import time
+import zlib
+from contextlib import ExitStack
+from dataclasses import dataclass, field, replace
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import httpx
+
+from polar_cli.errors import CLIError
+from polar_cli.spool import Spool, dead_letter_path, forward_spool
+
+DEFAULT_FORWARD_CONCURRENCY = 4
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_FORWARD_TIMEOUT = 10.0
+SOURCE_HEADER = "x-polar-cli-source"
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 300.0
+
+# Besides 5xx, statuses that mean "try again later"
+RETRYABLE_STATUS_CODES = {408, 425, 429}
+
+Event = dict[str, Any]
+
+_STOP = object()
+
+
+def build_forward_request(event: Event) -> tuple[str, dict[str, str]] | None:
+    """Body and headers to replay a ``webhook.created`` event locally."""
+    payload = event.get("payload", {})
+    event_headers = event.get("headers", {})
+    if not isinstance(payload, dict) or not isinstance(event_headers, dict):
+        return None
+
+    webhook_payload = payload.get("payload", payload)
+    body = json.dumps(webhook_payload, default=str)
+    forward_headers = {str(k): str(v) for k, v in event_headers.items()}
+    forward_headers["content-type"] = "application/json"
+    if event.get("source"):
+        # Which org the event came from when listening to several
+        forward_headers[SOURCE_HEADER] = str(event["source"])
+    return body, forward_headers
+
+
+def ordering_key(event: Event) -> str:
+    """The resource an event is about, falling back to its type."""
+    payload = event.get("payload")
+    webhook = payload.get("payload", payload) if isinstance(payload, dict) else None
+    if isinstance(webhook, dict):
+        data = webhook.get("data")
+        if isinstance(data, dict) and data.get("id"):
+            return str(data["id"])
+    return webhook_type(event) or str(event.get("key", ""))
+
+
+def webhook_type(event: Event) -> str | None:
+    """The webhook's event type (``order.created``, ...), if the payload has one."""
+    payload = event.get("payload")
+    webhook = payload.get("payload", payload) if isinstance(payload, dict) else None
+    if isinstance(webhook, dict) and webhook.get("type"):
+        return str(webhook["type"])
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    """A forwarding target and the webhook types it wants (all if empty)."""
+
+    url: str
+    event_types: tuple[str, ...] = ()
+
+    def matches(self, event: Event) -> bool:
+        if not self.event_types:
+            return True
+        kind = webhook_type(event)
+        return kind is not None and any(fnmatchcase(kind, pattern) for pattern in self.event_types)
+
+    def __str__(self) -> str:
+        return f"{self.url} ({', '.join(self.event_types)})" if self.event_types else self.url
+
+
+def parse_route(spec: str) -> Route:
+    """Parse ``URL`` or ``URL#type,type`` (types may use ``*`` wildcards)."""
+    url, _, types = spec.partition("#")
+    if not url.startswith(("http://", "https://")):
+        raise CLIError(f"Invalid forward target '{spec}': expected an http(s) URL, optionally followed by #type,type")
+    event_types = tuple(t.strip() for t in types.split(",") if t.strip())
+    return Route(url, event_types)
+
+
+@dataclass(frozen=True, slots=True)
+class ForwardResult:
+    event: Event
+    status_code: int | None
+    elapsed: float
+    error: Exception | None = None
+    queue_depth: int = 0
+    attempt: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status_code is not None and self.status_code < 400
+
+    @property
+    def retryable(self) -> bool:
+        if self.error is not None:
+            return isinstance(self.error, httpx.HTTPError)
+        code = self.status_code or 0
+        return code >= 500 or code in RETRYABLE_STATUS_CODES
+
+    def describe(self) -> str:
+        return str(self.error) if self.error is not None else f"HTTP {self.status_code}"
+
+
+def post_event(client: httpx.Client, url: str, event: Event, queue_depth: int = 0) -> ForwardResult:
+    """POST one event and describe the outcome; never raises for HTTP failures."""
+    started = time.monotonic()
+    request = build_forward_request(event)
+    if request is None:
+        return ForwardResult(event, None, 0.0, ValueError("Event has no forwardable payload"), queue_depth)
+    body, headers = request
+    try:
+        resp = client.post(url, content=body, headers=headers)
+    except httpx.HTTPError as exc:
+        return ForwardResult(event, None, time.monotonic() - started, exc, queue_depth)
+    return ForwardResult(event, resp.status_code, time.monotonic() - started, queue_depth=queue_depth)
+
+
+@dataclass(slots=True)
+class ForwardStats:
+    forwarded: int = 0
+    failed: int = 0
+    dropped: int = 0
+    max_depth: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, result: ForwardResult) -> None:
+        with self._lock:
+            if result.ok:
+                self.forwarded += 1
+            else:
+                self.failed += 1
+
+    def drop(self) -> None:
+        with self._lock:
+            self.dropped += 1
+
+
+class Forwarder:
+    """Bounded queue(s) of events drained by worker threads."""
+
+    def __init__(
+        self,
+        url: str,
+        concurrency: int = DEFAULT_FORWARD_CONCURRENCY,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        ordered: bool = False,
+        timeout: float = DEFAULT_FORWARD_TIMEOUT,
+        on_result: Callable[[ForwardResult], None] | None = None,
+        http_client: httpx.Client | None = None,
+    ) -> None:
+        self.url = url
+        self.ordered = ordered
+        self.on_result = on_result
+        self.stats = ForwardStats()
+        concurrency = max(1, concurrency)
+        self._client = http_client or httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+        self._owns_client = http_client is None
+        # Ordered mode needs one queue per worker so a key always lands on the same one
+        queue_count = concurrency if ordered else 1
+        per_queue = max(1, queue_size // queue_count)
+        self._queues: list[queue.Queue[Any]] = [queue.Queue(maxsize=per_queue) for _ in range(queue_count)]
+        self._workers = [
+            threading.Thread(
+                target=self._work,
+                args=(self._queues[i % queue_count],),
+                name=f"forwarder-{i}",
+                daemon=True,
+            )
+            for i in range(concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def depth(self) -> int:
+        """Events waiting to be forwarded."""
+        return sum(q.qsize() for q in self._queues)
+
+    def submit(self, event: Event, block: bool = False) -> bool:
+        """Queue an event; returns False if it was dropped.
+
+        By default this never blocks and drops the event when the queue is
+        full. With ``block`` it waits for room instead (backpressure), for
+        callers such as replay that can slow down.
+        """
+        index = zlib.crc32(ordering_key(event).encode()) % len(self._queues) if self.ordered else 0
+        try:
+            self._queues[index].put(event, block=block)
+        except queue.Full:
+            self.stats.drop()
+            return False
+        depth = self.depth
+        if depth > self.stats.max_depth:
+            self.stats.max_depth = depth
+        return True
+
+    def _work(self, q: queue.Queue[Any]) -> None:
+        while True:
+            event = q.get()
+            if event is _STOP:
+                return
+            result = self._send(event)
+            self.stats.record(result)
+            if self.on_result:
+                self.on_result(result)
+
+    def _send(self, event: Event) -> ForwardResult:
+        return post_event(self._client, self.url, event, self.depth)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Let the workers drain what is queued, then stop them."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> float | None:
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        workers_per_queue = len(self._workers) // len(self._queues)
+        try:
+            for q in self._queues:
+                for _ in range(workers_per_queue):
+                    q.put(_STOP, timeout=remaining())
+        except queue.Full:
+            pass  # out of time; workers are daemons and die with the process
+        for worker in self._workers:
+            worker.join(remaining())
+        if self._owns_client:
+            self._client.close()
+
+    def __enter__(self) -> Forwarder:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def retry_delay(attempts: int) -> float:
+    """Jittered exponential backoff after ``attempts`` failed sends."""
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** max(0, attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+@dataclass(order=True, slots=True)
+class _Pending:
+    due: float
+    segment: Path = field(compare=False)
+    record: dict[str, Any] = field(compare=False)
+
+
+@dataclass(slots=True)
+class RetryStats:
+    retried: int = 0
+    recovered: int = 0
+    dead_lettered: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, result: ForwardResult) -> None:
+        with self._lock:
+            self.retried += 1
+            if result.ok:
+                self.recovered += 1
+
+    def dead(self) -> None:
+        with self._lock:
+            self.dead_lettered += 1
+
+
+class RetryQueue:
+    """Durable, backed-off re-sending of failed events to one target.
+
+    Each pending event is a spool segment holding ``event``, ``attempts``
+    made so far, ``due`` (wall-clock time of the next attempt) and the last
+    ``error``. ``process_due`` sends whatever is due; ``start`` runs it on a
+    background thread whenever the earliest entry comes due.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        spool: Spool,
+        dead_letter: Path,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        timeout: float = DEFAULT_FORWARD_TIMEOUT,
+        on_result: Callable[[ForwardResult], None] | None = None,
+        http_client: httpx.Client | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.url = url
+        self.spool = spool
+        self.dead_letter = dead_letter
+        self.max_attempts = max_attempts
+        self.on_result = on_result
+        self.stats = RetryStats()
+        # Held until close: two listeners resending one spool would send each event twice
+        self._spool_lock = ExitStack()
+        self._spool_lock.enter_context(
+            spool.lock(
+                exclusive=True,
+                busy=f"Another listener is already forwarding to {url}.",
+                hint="Stop it first, or forward to a different URL.",
+            )
+        )
+        self._client = http_client or httpx.Client(timeout=timeout)
+        self._owns_client = http_client is None
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._dead_lock = threading.Lock()
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+        self._heap: list[_Pending] = []
+        # Resume what an earlier run left behind
+        for segment in spool.segments():
+            try:
+                [record] = Spool.read(segment)
+            except (OSError, ValueError):
+                continue
+            self._heap.append(_Pending(float(record.get("due", 0.0)), segment, record))
+        heapq.heapify(self._heap)
+
+    @classmethod
+    def for_target(cls, url: str, **options: Any) -> RetryQueue:
+        """The persistent retry queue for a forwarding URL."""
+        return cls(url, forward_spool(url), dead_letter_path(url), **options)
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def failed(self, result: ForwardResult) -> None:
+        """Schedule a retry for a failed send, or dead-letter it."""
+        if result.retryable:
+            self.add(result.event, result.attempt, result.describe())
+        else:
+            self._dead(result.event, result.attempt, result.describe())
+
+    def add(self, event: Event, attempts: int, error: str) -> None:
+        if attempts >= self.max_attempts:
+            self._dead(event, attempts, error)
+            return
+        record = {"event": event, "attempts": attempts, "due": self._clock() + retry_delay(attempts), "error": error}
+        segment = self.spool.write([record])
+        with self._cond:
+            heapq.heappush(self._heap, _Pending(record["due"], segment, record))
+            self._cond.notify()
+
+    def requeue_dead_letters(self) -> int:
+        """Move dead-lettered events back into the queue, due immediately."""
+        # Other listeners are kept out by the spool lock, this queue's own workers by _dead_lock
+        with self._dead_lock:
+            if not self.dead_letter.exists():
+                return 0
+            records = Spool.read(self.dead_letter)
+            for record in records:
+                record.update(attempts=0, due=0.0)
+                segment = self.spool.write([record])
+                with self._cond:
+                    heapq.heappush(self._heap, _Pending(0.0, segment, record))
+            self.dead_letter.unlink()
+        with self._cond:
+            self._cond.notify()
+        return len(records)
+
+    def process_due(self) -> int:
+        """Send every entry that is due; returns how many were attempted."""
+        attempted = 0
+        while True:
+            with self._cond:
+                if not self._heap or self._heap[0].due > self._clock() or self._stopped:
+                    return attempted
+                pending = heapq.heappop(self._heap)
+            self._attempt(pending)
+            attempted += 1
+
+    def _attempt(self, pending: _Pending) -> None:
+        record = pending.record
+        result = replace(post_event(self._client, self.url, record["event"]), attempt=record["attempts"] + 1)
+        self.stats.record(result)
+        if not result.ok:
+            # Write the rescheduled entry before dropping the old one
+            self.failed(result)
+        Spool.ack(pending.segment)
+        if self.on_result:
+            self.on_result(result)
+
+    def _dead(self, event: Event, attempts: int, error: str) -> None:
+        self.dead_letter.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({"event": event, "attempts": attempts, "error": error, "url": self.url}, default=str)
+        with self._dead_lock:
+            with open(self.dead_letter, "a") as f:
+                f.write(line + "\n")
+        self.stats.dead()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="forward-retry", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    wait = self._heap[0].due - self._clock() if self._heap else None
+                    if wait is not None and wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if self._stopped:
+                    return
+            self.process_due()
+
+    def close(self, timeout: float | None = None) -> None:
+        """Stop retrying; whatever is still pending stays in the spool."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+        if self._owns_client:
+            self._client.close()
+        self._spool_lock.close()
+
+
+class ForwardRouter:
+    """One ``Forwarder`` per route; each event is queued on every route that matches it.
+
+    With ``max_attempts`` above 1, each route also gets a ``RetryQueue``.
+    """
+
+    def __init__(
+        self,
+        routes: list[Route],
+        on_result: Callable[[Route, ForwardResult], None] | None = None,
+        max_attempts: int = 1,
+        **options: Any,
+    ) -> None:
+        self.routes = routes
+        self.retry_queues: list[RetryQueue | None] = []
+        try:
+            for route in routes:
+                self.retry_queues.append(
+                    RetryQueue.for_target(
+                        route.url,
+                        max_attempts=max_attempts,
+                        timeout=options.get("timeout", DEFAULT_FORWARD_TIMEOUT),
+                        on_result=(lambda result, route=route: on_result(route, result)) if on_result else None,
+                        http_client=options.get("http_client"),
+                    )
+                    if max_attempts > 1
+                    else None
+                )
+        except BaseException:
+            # Release the spools already taken; the listener is not starting
+            for retries in self.retry_queues:
+                if retries is not None:
+                    retries.close()
+            raise
+
+        def reporter(route: Route, retries: RetryQueue | None) -> Callable[[ForwardResult], None]:
+            def report(result: ForwardResult) -> None:
+                if on_result:
+                    on_result(route, result)
+                if retries is not None and not result.ok:
+                    retries.failed(result)
+
+            return report
+
+        self.forwarders = [
+            Forwarder(route.url, on_result=reporter(route, retries), **options)
+            for route, retries in zip(routes, self.retry_queues)
+        ]
+        for retries in self.retry_queues:
+            if retries is not None:
+                retries.start()
+
+    def submit(self, event: Event, block: bool = False) -> list[Route]:
+        """Queue an event on every matching route; returns the routes that lost it.
+
+        A route with a retry queue takes an overflowing event there instead.
+        """
+        lost = []
+        for route, forwarder, retries in zip(self.routes, self.forwarders, self.retry_queues):
+            if not route.matches(event) or forwarder.submit(event, block=block):
+                continue
+            if retries is not None:
+                retries.add(event, 0, "forward queue full")
+            else:
+                lost.append(route)
+        return lost
+
+    def close(self, timeout: float | None = None) -> None:
+        """Close every forwarder within one shared deadline (they drain in parallel)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> float | None:
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        for forwarder in self.forwarders:
+            forwarder.close(remaining())
+        for retries in self.retry_queues:
+            if retries is not None:
+                retries.close(remaining())
+
+    def __iter__(self) -> Iterator[tuple[Route, Forwarder]]:
+        return iter(zip(self.routes, self.forwarders))
+
+    def __enter__(self) -> ForwardRouter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,164 @@
+"""Local index of resource IDs seen in CLI output, for git-style short IDs.
+
+IDs are stored as raw 16-byte UUIDs. The bulk of the index lives in a sorted
+base file that is memory-mapped and binary-searched; newly seen IDs go to a
+small append-only journal that is merged into the base once it grows past
+``JOURNAL_LIMIT`` entries. A prefix lookup is two bisections over the base
+plus a scan of the journal, so it stays sub-millisecond with millions of IDs.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import mmap
+import os
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generator, Iterable
+
+from polar_cli.config import CACHE_DIR
+
+INDEX_DIR = CACHE_DIR / "ids"
+BASE_FILE = "ids.bin"
+JOURNAL_FILE = "journal.bin"
+
+RECORD_SIZE = 16
+JOURNAL_LIMIT = 4096
+MIN_PREFIX_LENGTH = 4
+
+
+class _Records:
+    """Sequence view over a buffer of fixed-size records (for bisect)."""
+
+    def __init__(self, buf: bytes | mmap.mmap) -> None:
+        self._buf = buf
+
+    def __len__(self) -> int:
+        return len(self._buf) // RECORD_SIZE
+
+    def __getitem__(self, i: int) -> bytes:
+        start = i * RECORD_SIZE
+        return self._buf[start:start + RECORD_SIZE]
+
+
+def _to_bytes(id: str) -> bytes | None:
+    try:
+        return uuid.UUID(id).bytes
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+def _prefix_bounds(prefix: str) -> tuple[bytes, bytes] | None:
+    """Return the (lowest, highest) 16-byte values sharing a hex prefix."""
+    digits = prefix.replace("-", "").lower()
+    if len(digits) < MIN_PREFIX_LENGTH or len(digits) > 32:
+        return None
+    try:
+        int(digits, 16)
+    except ValueError:
+        return None
+    return bytes.fromhex(digits.ljust(32, "0")), bytes.fromhex(digits.ljust(32, "f"))
+
+
+class IdIndex:
+    """On-disk set of UUIDs supporting unique-prefix lookup."""
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self.directory = directory or INDEX_DIR
+        self.base_path = self.directory / BASE_FILE
+        self.journal_path = self.directory / JOURNAL_FILE
+
+    def _read_journal(self) -> set[bytes]:
+        try:
+            data = self.journal_path.read_bytes()
+        except FileNotFoundError:
+            return set()
+        usable = len(data) - len(data) % RECORD_SIZE
+        return {data[i:i + RECORD_SIZE] for i in range(0, usable, RECORD_SIZE)}
+
+    @contextmanager
+    def _base(self) -> Generator[_Records, None, None]:
+        """Memory-map the sorted base file (empty if missing)."""
+        try:
+            f = open(self.base_path, "rb")
+        except FileNotFoundError:
+            yield _Records(b"")
+            return
+        with f:
+            if os.fstat(f.fileno()).st_size < RECORD_SIZE:
+                yield _Records(b"")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                yield _Records(buf)
+
+    @staticmethod
+    def _range(records: _Records, lo: bytes, hi: bytes, limit: int) -> list[bytes]:
+        start = bisect.bisect_left(records, lo)
+        end = min(bisect.bisect_right(records, hi, lo=start), start + limit)
+        return [records[i] for i in range(start, end)]
+
+    def lookup(self, prefix: str, limit: int = 10) -> list[str]:
+        """Return up to ``limit`` known IDs starting with ``prefix``."""
+        bounds = _prefix_bounds(prefix)
+        if bounds is None:
+            return []
+        lo, hi = bounds
+        with self._base() as records:
+            found = set(self._range(records, lo, hi, limit))
+        found.update(r for r in self._read_journal() if lo <= r <= hi)
+        return [str(uuid.UUID(bytes=r)) for r in sorted(found)[:limit]]
+
+    def add(self, ids: Iterable[str]) -> None:
+        """Record IDs, ignoring anything that isn't a UUID or is already known."""
+        journal = self._read_journal()
+        new = []
+        with self._base() as records:
+            for id in ids:
+                record = _to_bytes(id)
+                if record is None or record in journal or self._range(records, record, record, 1):
+                    continue
+                journal.add(record)
+                new.append(record)
+        if not new:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, "ab") as f:
+            f.write(b"".join(new))
+        if len(journal) >= JOURNAL_LIMIT:
+            self.compact()
+
+    def compact(self) -> None:
+        """Merge the journal into the sorted base file."""
+        journal = self._read_journal()
+        if not journal:
+            return
+        tmp = self.base_path.with_suffix(".tmp")
+        with self._base() as records, open(tmp, "wb") as out:
+            base = (records[i] for i in range(len(records)))
+            last = None
+            for record in heapq.merge(base, sorted(journal)):
+                if record != last:
+                    out.write(record)
+                    last = record
+        os.replace(tmp, self.base_path)
+        self.journal_path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        try:
+            base = self.base_path.stat().st_size // RECORD_SIZE
+        except FileNotFoundError:
+            base = 0
+        return base + len(self._read_journal())
+
+
+def record_ids(values: Iterable[object]) -> None:
+    """Remember IDs seen in command output. Never raises."""
+    ids = [value for value in values if isinstance(value, str)]
+    if not ids:
+        return
+    try:
+        IdIndex().add(ids)
+    except OSError:
+        pass
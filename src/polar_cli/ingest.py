@@ -0,0 +1,148 @@
+"""Streaming event ingestion: NDJSON input, size-aware batching, concurrent sends."""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+from polar_cli.bulk import DEFAULT_ATTEMPTS, call_with_retries, run_concurrently
+from polar_cli.dedup import EventDeduper
+from polar_cli.errors import CLIError
+from polar_cli.spool import Spool
+
+if TYPE_CHECKING:
+    from polar_sdk import Polar
+
+Event = dict[str, Any]
+
+# Batches are closed at whichever limit is hit first
+MAX_BATCH_EVENTS = 1000
+MAX_BATCH_BYTES = 1024 * 1024
+DEFAULT_INGEST_CONCURRENCY = 4
+
+
+def iter_ndjson(source: str) -> Iterator[Event]:
+    """Yield events from an NDJSON file (``-`` for stdin) without loading it whole."""
+    stream = nullcontext(sys.stdin) if source == "-" else open(source)
+    with stream as lines:
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise CLIError(f"Invalid JSON on line {line_no}: {exc}") from None
+            if not isinstance(event, dict):
+                raise CLIError(f"Line {line_no} is not a JSON object.")
+            yield event
+
+
+def batch_events(
+    events: Iterable[Event],
+    max_events: int = MAX_BATCH_EVENTS,
+    max_bytes: int = MAX_BATCH_BYTES,
+) -> Iterator[list[Event]]:
+    """Group events into batches bounded by count and serialized size."""
+    batch: list[Event] = []
+    size = 0
+    for event in events:
+        event_size = len(json.dumps(event, separators=(",", ":"), default=str)) + 1
+        if batch and (len(batch) >= max_events or size + event_size > max_bytes):
+            yield batch
+            batch, size = [], 0
+        batch.append(event)
+        size += event_size
+    if batch:
+        yield batch
+
+
+@dataclass(slots=True)
+class IngestStats:
+    events: int = 0
+    batches: int = 0
+    failed_events: int = 0
+    errors: list[Exception] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        elapsed = self.elapsed
+        return self.events / elapsed if elapsed > 0 else 0.0
+
+
+def send_batch(client: Polar, batch: list[Event], attempts: int = DEFAULT_ATTEMPTS) -> None:
+    call_with_retries(lambda: client.events.ingest(request={"events": batch}), attempts)
+
+
+def _ingest(
+    client: Polar,
+    items: Iterable[tuple[Path | None, list[Event]]],
+    concurrency: int,
+    attempts: int,
+    on_progress: Callable[[IngestStats], None] | None,
+    dedup: EventDeduper | None,
+) -> IngestStats:
+    stats = IngestStats()
+
+    def send(item: tuple[Path | None, list[Event]]) -> None:
+        segment, batch = item
+        send_batch(client, batch, attempts)
+        if segment is not None:
+            Spool.ack(segment)
+
+    for outcome in run_concurrently(send, items, concurrency):
+        batch = outcome.item[1]
+        stats.batches += 1
+        if outcome.ok:
+            stats.events += len(batch)
+            if dedup is not None:
+                dedup.commit(batch)
+        else:
+            stats.failed_events += len(batch)
+            stats.errors.append(outcome.error)
+        if on_progress:
+            on_progress(stats)
+    return stats
+
+
+def ingest_batches(
+    client: Polar,
+    batches: Iterable[list[Event]],
+    concurrency: int = DEFAULT_INGEST_CONCURRENCY,
+    attempts: int = DEFAULT_ATTEMPTS,
+    on_progress: Callable[[IngestStats], None] | None = None,
+    spool: Spool | None = None,
+    dedup: EventDeduper | None = None,
+) -> IngestStats:
+    """Send batches concurrently with retries.
+
+    ``run_concurrently`` keeps a bounded window of batches in flight, so input
+    is only read as fast as the API accepts it (backpressure). A batch that
+    still fails after retries is counted and the rest carry on. With a spool,
+    each batch is written to it before sending and dropped once acknowledged;
+    with a deduper, acknowledged events are remembered so reruns skip them.
+    """
+    items = ((spool.write(batch) if spool else None, batch) for batch in batches)
+    return _ingest(client, items, concurrency, attempts, on_progress, dedup)
+
+
+def flush_spool(
+    client: Polar,
+    spool: Spool,
+    concurrency: int = DEFAULT_INGEST_CONCURRENCY,
+    attempts: int = DEFAULT_ATTEMPTS,
+    on_progress: Callable[[IngestStats], None] | None = None,
+    dedup: EventDeduper | None = None,
+) -> IngestStats:
+    """Replay every unacknowledged spool segment, oldest first."""
+    items = ((segment, Spool.read(segment)) for segment in spool.segments())
+    return _ingest(client, items, concurrency, attempts, on_progress, dedup)
@@ -0,0 +1,176 @@
+"""Listener metrics in the Prometheus text format.
+
+``ListenerMetrics`` counts received events per type and source, forwards
+per target, type and outcome, dropped events per target, and keeps a
+forward latency histogram per target and type. ``serve_metrics`` exposes it
+at ``/metrics`` from a background HTTP server, and ``summary`` condenses it
+into one console line. Everything is stdlib; there is no client library.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+PREFIX = "polar_listen"
+# Seconds; a local handler is usually fast, so the low end is fine-grained
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a running sum."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the ``q`` quantile (the last bound if beyond it)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return LATENCY_BUCKETS[-1]
+
+
+class ListenerMetrics:
+    """Thread-safe counters and histograms for ``webhooks listen``."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._lock = threading.Lock()
+        self._clock = clock
+        self.started = clock()
+        self.received: dict[Labels, int] = defaultdict(int)
+        self.forwards: dict[Labels, int] = defaultdict(int)
+        self.dropped: dict[Labels, int] = defaultdict(int)
+        self.latency: dict[Labels, Histogram] = defaultdict(Histogram)
+        # Called at scrape time for live gauges: target -> queued events
+        self.queue_depths: Callable[[], dict[str, int]] | None = None
+        self._last_summary = (self.started, 0, 0)
+
+    def event_received(self, event_type: str, source: str = "") -> None:
+        with self._lock:
+            self.received[(("type", event_type), ("source", source))] += 1
+
+    def forward_finished(self, target: str, event_type: str, ok: bool, elapsed: float) -> None:
+        with self._lock:
+            self.forwards[(("target", target), ("type", event_type), ("outcome", "ok" if ok else "failed"))] += 1
+            if ok:
+                self.latency[(("target", target), ("type", event_type))].observe(elapsed)
+
+    def forward_dropped(self, target: str) -> None:
+        with self._lock:
+            self.dropped[(("target", target),)] += 1
+
+    def render(self) -> str:
+        """The Prometheus text exposition of every metric."""
+        lines: list[str] = []
+        with self._lock:
+            _counter(lines, "events_received_total", "Events received from the stream.", self.received)
+            _counter(lines, "forwards_total", "Forward attempts by outcome.", self.forwards)
+            _counter(lines, "forward_dropped_total", "Events dropped because a forward queue was full.", self.dropped)
+            name = f"{PREFIX}_forward_latency_seconds"
+            lines += [f"# HELP {name} Latency of successful forwards.", f"# TYPE {name} histogram"]
+            for labels, histogram in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip((*LATENCY_BUCKETS, float("inf")), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        if self.queue_depths:
+            depths = {(("target", target),): depth for target, depth in self.queue_depths().items()}
+            _gauge(lines, "forward_queue_depth", "Events waiting to be forwarded.", depths)
+        _gauge(lines, "uptime_seconds", "Seconds since the listener started.", {(): round(self._clock() - self.started, 3)})
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """One line: totals, rates since the previous summary, and latency."""
+        now = self._clock()
+        with self._lock:
+            received = sum(self.received.values())
+            ok = sum(v for k, v in self.forwards.items() if dict(k)["outcome"] == "ok")
+            failed = sum(v for k, v in self.forwards.items() if dict(k)["outcome"] == "failed")
+            dropped = sum(self.dropped.values())
+            merged = Histogram()
+            for histogram in self.latency.values():
+                merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+                merged.sum += histogram.sum
+                merged.count += histogram.count
+        since, last_received, last_ok = self._last_summary
+        self._last_summary = (now, received, ok)
+        elapsed = max(now - since, 1e-9)
+        line = f"received {received} ({(received - last_received) / elapsed:.1f}/s)"
+        if ok or failed or dropped:
+            line += f", forwarded {ok} ({(ok - last_ok) / elapsed:.1f}/s), failed {failed}, dropped {dropped}"
+        if merged.count:
+            line += (
+                f", latency avg {merged.sum / merged.count * 1000:.0f}ms"
+                f" p99 ≤{(merged.quantile(0.99) or 0) * 1000:.0f}ms"
+            )
+        return line
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _counter(lines: list[str], name: str, help: str, values: dict[Labels, int]) -> None:
+    name = f"{PREFIX}_{name}"
+    lines += [f"# HELP {name} {help}", f"# TYPE {name} counter"]
+    lines += [f"{name}{_labels(labels)} {value}" for labels, value in sorted(values.items())]
+
+
+def _gauge(lines: list[str], name: str, help: str, values: dict[Labels, float]) -> None:
+    name = f"{PREFIX}_{name}"
+    lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+    lines += [f"{name}{_labels(labels)} {value}" for labels, value in sorted(values.items())]
+
+
+def serve_metrics(metrics: ListenerMetrics, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve ``/metrics`` on a daemon thread; call ``shutdown()`` on the result to stop."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
@@ -12,6 +12,7 @@ from rich.console import Console
 from rich.table import Table
 
 from polar_cli.config import OutputFormat
+from polar_cli.id_index import record_ids
 
 console = Console()
 
@@ -76,6 +77,8 @@ def render_list(
     output_format: OutputFormat,
 ) -> None:
     """Render a list of items in the requested format."""
+    record_ids(_get_attr(item, "id") for item in items)
+
     if output_format == OutputFormat.JSON:
         data = [_to_dict(item) for item in items]
         console.print_json(json.dumps(data, indent=2, default=str))
@@ -107,6 +110,8 @@ def render_detail(
     output_format: OutputFormat,
 ) -> None:
     """Render a single object in the requested format."""
+    record_ids([_get_attr(obj, "id")])
+
     if output_format == OutputFormat.JSON:
         console.print_json(json.dumps(_to_dict(obj), indent=2, default=str))
         return
@@ -130,3 +135,21 @@ def render_detail(
         table.add_row(field.header, value)
 
     console.print(table)
+
+
+def render_stream_item(
+    obj: object,
+    fields: list[Column],
+    output_format: OutputFormat,
+) -> None:
+    """Render one object of a stream: a JSON line, a YAML document, or a detail table."""
+    if output_format == OutputFormat.TABLE:
+        render_detail(obj, fields, output_format)
+        console.print()
+        return
+
+    record_ids([_get_attr(obj, "id")])
+    if output_format == OutputFormat.JSON:
+        typer.echo(json.dumps(_to_dict(obj), default=str))
+    else:
+        typer.echo(yaml.dump(_to_dict(obj), default_flow_style=False, sort_keys=False, explicit_start=True), nl=False)
@@ -0,0 +1,111 @@
+"""Recording of webhook events to a log file, and paced replay from one.
+
+A recording is NDJSON, one event per line, exactly as received from the
+listener (``key``, ``ts``, ``headers``, ``payload``) plus ``recorded_at``, the
+local receive time in seconds. Files ending in ``.gz`` are gzip-compressed.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator
+
+Event = dict[str, Any]
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode, encoding="utf-8", buffering=1 if mode == "a" else -1)
+
+
+class EventRecorder:
+    """Appends events to a recording, one line each."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = _open(path, "a")
+        self.count = 0
+
+    def write(self, event: Event) -> None:
+        record = {**event, "recorded_at": round(time.time(), 6)}
+        self._file.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> EventRecorder:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def read_recording(path: Path, keys: Iterable[str] | None = None) -> Iterator[Event]:
+    """Events from a recording, optionally only those with the given keys."""
+    wanted = set(keys) if keys is not None else None
+    with nullcontext(sys.stdin) if str(path) == "-" else _open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if wanted is None or event.get("key") in wanted:
+                yield event
+
+
+@dataclass(frozen=True, slots=True)
+class Pacing:
+    """How fast to replay: original timing (times ``speed``), a fixed rate, or unthrottled."""
+
+    rate: float | None = None
+    speed: float = 1.0
+    unthrottled: bool = False
+
+
+def paced(
+    events: Iterable[Event],
+    pacing: Pacing,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[Event]:
+    """Yield events on schedule.
+
+    Each event's due time is computed from the start of the replay rather
+    than from the previous event, so sleep overshoot doesn't accumulate.
+    """
+    started = clock()
+    first_recorded: float | None = None
+    for i, event in enumerate(events):
+        if pacing.unthrottled:
+            due = 0.0
+        elif pacing.rate:
+            due = i / pacing.rate
+        else:
+            recorded = float(event.get("recorded_at", 0.0))
+            if first_recorded is None:
+                first_recorded = recorded
+            due = max(0.0, recorded - first_recorded) / pacing.speed
+        wait = started + due - clock()
+        if wait > 0:
+            sleep(wait)
+        yield event
+
+
+def percentiles(samples: list[float], points: Iterable[int] = (50, 90, 99)) -> dict[str, float]:
+    """Nearest-rank percentiles plus the maximum."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {f"p{p}": ordered[min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))] for p in points}
+    result["max"] = ordered[-1]
+    return result
@@ -0,0 +1,132 @@
+"""Write-ahead spool for event ingestion.
+
+Every batch is written to its own segment file (and fsynced) before it is
+sent; the segment is deleted once the API acknowledges the batch. Segments
+left behind by a failed or interrupted run are replayed by
+``polar events flush``, giving at-least-once delivery without re-sending the
+whole input.
+
+Segment names sort in write order: ``<ns-timestamp>-<pid>-<seq>.ndjson``.
+A segment is written under a ``.tmp`` name and renamed into place, so a
+crash mid-write never leaves a half-written segment to replay.
+
+The event spool is per environment and organization. Ingests hold a shared
+lock on it and a flush an exclusive one, so a flush never replays segments
+an ingest still has in flight, and two flushes never send the same segment.
+A forwarding target's retry spool is held exclusively by the one listener
+resending it, which also guards the target's dead-letter file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from itertools import count
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from polar_cli.config import DATA_DIR, Environment
+from polar_cli.errors import CLIError
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, spool access is unguarded
+    fcntl = None  # type: ignore[assignment]
+
+SPOOL_DIR = DATA_DIR / "spool"
+SEGMENT_SUFFIX = ".ndjson"
+LOCK_NAME = ".lock"
+
+
+class Spool:
+    """Directory of unacknowledged event batches."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._seq = count()
+
+    def write(self, events: Iterable[dict[str, Any]]) -> Path:
+        """Durably store a batch and return its segment path."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"{time.time_ns():020d}-{os.getpid()}-{next(self._seq):06d}"
+        segment = self.directory / f"{name}{SEGMENT_SUFFIX}"
+        tmp = segment.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            for event in events:
+                f.write(json.dumps(event, separators=(",", ":"), default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, segment)
+        self._sync_directory()
+        return segment
+
+    def _sync_directory(self) -> None:
+        # Make the rename itself durable; not supported on every platform.
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def read(segment: Path) -> list[dict[str, Any]]:
+        with open(segment) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    @staticmethod
+    def ack(segment: Path) -> None:
+        """Drop a segment whose batch the API accepted."""
+        segment.unlink(missing_ok=True)
+
+    def segments(self) -> list[Path]:
+        """Unacknowledged segments, oldest first."""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    @contextmanager
+    def lock(
+        self, exclusive: bool, busy: str | None = None, hint: str = "Wait for it to finish and try again."
+    ) -> Iterator[None]:
+        """Hold the spool shared (writers) or exclusively (a flush); fails fast if taken.
+
+        ``busy`` and ``hint`` make up the error raised when the lock is taken.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / LOCK_NAME, "a") as f:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(f, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    if busy is None:
+                        holder = "an ingest or another flush" if exclusive else "a flush"
+                        busy = f"The event spool is in use by {holder}."
+                    raise CLIError(busy, hint=hint) from None
+            yield
+
+
+def event_spool(environment: Environment, org_id: str | None = None) -> Spool:
+    """The spool for an environment and organization; replays must go where the events were headed."""
+    return Spool(SPOOL_DIR / "events" / environment.value / (org_id or "default"))
+
+
+def forward_spool(url: str) -> Spool:
+    """Events waiting to be re-sent to a forwarding target, one per segment."""
+    return Spool(SPOOL_DIR / "forward" / _target_key(url))
+
+
+def dead_letter_path(url: str) -> Path:
+    """NDJSON file of events a forwarding target never accepted."""
+    return SPOOL_DIR / "forward" / f"{_target_key(url)}.dead{SEGMENT_SUFFIX}"
+
+
+def _target_key(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()[:16]
@@ -0,0 +1,214 @@
+"""Server-sent event stream that reconnects on its own.
+
+``ReconnectingStream`` wraps ``httpx_sse.connect_sse`` in a loop: when the
+connection drops, goes quiet for longer than the idle timeout, or the server
+answers with a transient error, it waits a jittered exponential backoff and
+connects again, sending ``Last-Event-ID`` so a server that supports it can
+replay what was missed. Authentication and not-found errors stop the loop.
+
+Reconnects without an event ID to resume from are counted as gaps: anything
+sent while disconnected is lost.
+
+``MultiStream`` reads several such streams at once, each on its own thread,
+and merges their events into one iterator tagged with the stream they came
+from.
+"""
+
+from __future__ import annotations
+
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+import httpx
+from httpx_sse import ServerSentEvent, SSEError, connect_sse
+
+from polar_cli.errors import CLIError
+
+DEFAULT_IDLE_TIMEOUT = 120.0
+CONNECT_TIMEOUT = 15.0
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+MULTIPLEX_BUFFER = 1000
+
+# Statuses that won't fix themselves by retrying
+FATAL_STATUS_CODES = {400, 401, 403, 404}
+
+
+class StreamDisconnected(Exception):
+    """The stream ended or failed in a way that is worth reconnecting after."""
+
+
+@dataclass(slots=True)
+class StreamStats:
+    connects: int = 0
+    reconnects: int = 0
+    gaps: int = 0
+    events: int = 0
+    downtime: float = 0.0
+    last_event_id: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Reconnecting:
+    """Passed to ``on_disconnect`` before each backoff sleep."""
+
+    reason: str
+    attempt: int
+    delay: float
+    resuming: bool
+
+
+class ReconnectingStream:
+    """Iterate over server-sent events, reconnecting until the caller stops."""
+
+    def __init__(
+        self,
+        url: str,
+        headers: dict[str, str],
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        reconnect: bool = True,
+        max_delay: float = MAX_DELAY,
+        on_connect: Callable[[StreamStats], None] | None = None,
+        on_disconnect: Callable[[Reconnecting], None] | None = None,
+        http_client: httpx.Client | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.url = url
+        self.headers = headers
+        self.reconnect = reconnect
+        self.max_delay = max_delay
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self.stats = StreamStats()
+        # No overall timeout, but a read timeout: silence longer than this means a dead connection
+        self._timeout = httpx.Timeout(CONNECT_TIMEOUT, read=idle_timeout)
+        self._client = http_client
+        self._sleep = sleep
+        self._retry_hint: float | None = None
+
+    def __iter__(self) -> Iterator[ServerSentEvent]:
+        client = self._client or httpx.Client(timeout=self._timeout)
+        try:
+            yield from self._run(client)
+        finally:
+            if self._client is None:
+                client.close()
+
+    def _run(self, client: httpx.Client) -> Iterator[ServerSentEvent]:
+        attempt = 0
+        while True:
+            try:
+                for sse in self._connect(client):
+                    attempt = 0
+                    yield sse
+                if not self.reconnect:
+                    return
+                reason = "stream closed by server"
+            except StreamDisconnected as exc:
+                if not self.reconnect:
+                    raise CLIError(f"Failed to connect: {exc}") from None
+                reason = str(exc)
+            except (httpx.TransportError, SSEError) as exc:
+                if not self.reconnect:
+                    raise
+                reason = _describe(exc)
+
+            disconnected_at = time.monotonic()
+            attempt += 1
+            # A server-sent ``retry:`` sets the floor for the backoff
+            delay = min(self.max_delay, max(self._retry_hint or 0.0, BASE_DELAY * 2 ** (attempt - 1)))
+            delay *= random.uniform(0.5, 1.0)
+            resuming = self.stats.last_event_id is not None
+            if not resuming and self.stats.events:
+                self.stats.gaps += 1
+            if self.on_disconnect:
+                self.on_disconnect(Reconnecting(reason, attempt, delay, resuming))
+            self._sleep(delay)
+            self.stats.reconnects += 1
+            self.stats.downtime += time.monotonic() - disconnected_at
+
+    def _connect(self, client: httpx.Client) -> Iterator[ServerSentEvent]:
+        headers = dict(self.headers)
+        if self.stats.last_event_id:
+            headers["Last-Event-ID"] = self.stats.last_event_id
+        with connect_sse(client, "GET", self.url, headers=headers, timeout=self._timeout) as source:
+            status = source.response.status_code
+            if status in FATAL_STATUS_CODES:
+                raise CLIError(f"Failed to connect: HTTP {status}")
+            if status != 200:
+                raise StreamDisconnected(f"HTTP {status}")
+            self.stats.connects += 1
+            if self.on_connect:
+                self.on_connect(self.stats)
+            for sse in source.iter_sse():
+                if sse.id:
+                    self.stats.last_event_id = sse.id
+                if sse.retry:
+                    self._retry_hint = sse.retry / 1000
+                self.stats.events += 1
+                yield sse
+
+
+_DONE = object()
+
+
+class MultiStream:
+    """Iterate over several streams at once as ``(tag, event)`` pairs.
+
+    Each stream is read on a daemon thread into a shared bounded queue, so a
+    quiet or reconnecting stream never holds up the others. An error that
+    ends one stream (e.g. a fatal status) is raised from the iterator.
+    Iteration finishes once every stream has ended.
+    """
+
+    def __init__(self, streams: dict[str, ReconnectingStream], buffer: int = MULTIPLEX_BUFFER) -> None:
+        self.streams = streams
+        self._queue: queue.Queue[tuple[str, Any]] = queue.Queue(maxsize=buffer)
+        self._stop = threading.Event()
+
+    def __iter__(self) -> Iterator[tuple[str, ServerSentEvent]]:
+        if len(self.streams) == 1:
+            [(tag, stream)] = self.streams.items()
+            for sse in stream:
+                yield tag, sse
+            return
+
+        readers = [
+            threading.Thread(target=self._read, args=(tag, stream), name=f"sse-{tag}", daemon=True)
+            for tag, stream in self.streams.items()
+        ]
+        for reader in readers:
+            reader.start()
+        running = len(readers)
+        try:
+            while running:
+                tag, item = self._queue.get()
+                if item is _DONE:
+                    running -= 1
+                elif isinstance(item, BaseException):
+                    raise item
+                else:
+                    yield tag, item
+        finally:
+            self._stop.set()
+
+    def _read(self, tag: str, stream: ReconnectingStream) -> None:
+        try:
+            for sse in stream:
+                if self._stop.is_set():
+                    return
+                self._queue.put((tag, sse))
+        except Exception as exc:
+            self._queue.put((tag, exc))
+            return
+        self._queue.put((tag, _DONE))
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, httpx.ReadTimeout):
+        return "no data before the idle timeout"
+    return f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
@@ -0,0 +1,102 @@
+"""Incremental polling for ``events tail --follow``.
+
+Each poll asks for the newest events since a high-water mark (the latest
+timestamp seen, minus a small overlap for events that arrive slightly out of
+order). IDs already printed are remembered in a bounded LRU, so the overlap
+never produces duplicates. When a page comes back entirely new the poller
+keeps paging back until it reaches known events, so bursts aren't truncated.
+
+The interval adapts: it drops to the minimum as soon as events arrive and
+grows geometrically while the stream is idle, so a quiet org costs a request
+every ``max_interval`` seconds rather than every second.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator
+
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_MAX_INTERVAL = 30.0
+BACKOFF_FACTOR = 1.5
+OVERLAP = timedelta(seconds=30)
+SEEN_CAPACITY = 10_000
+MAX_CATCH_UP_PAGES = 10
+
+# (since, page) -> events on that page, newest first
+FetchPage = Callable[[datetime | None, int], list[Any]]
+
+
+class SeenIds:
+    """Least-recently-used set of event IDs with a fixed capacity."""
+
+    def __init__(self, capacity: int = SEEN_CAPACITY) -> None:
+        self.capacity = capacity
+        self._ids: OrderedDict[str, None] = OrderedDict()
+
+    def __contains__(self, id: str) -> bool:
+        if id in self._ids:
+            self._ids.move_to_end(id)
+            return True
+        return False
+
+    def add(self, id: str) -> None:
+        self._ids[id] = None
+        self._ids.move_to_end(id)
+        if len(self._ids) > self.capacity:
+            self._ids.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class EventPoller:
+    """Yields events not seen before, oldest first, one poll at a time."""
+
+    def __init__(
+        self,
+        fetch_page: FetchPage,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._fetch_page = fetch_page
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self._sleep = sleep
+        self.seen = SeenIds(SEEN_CAPACITY)
+        self.high_water: datetime | None = None
+        self.polls = 0
+
+    def poll(self) -> list[Any]:
+        """Fetch events newer than the high-water mark that haven't been returned yet."""
+        since = self.high_water - OVERLAP if self.high_water else None
+        fresh: list[Any] = []
+        for page in range(1, MAX_CATCH_UP_PAGES + 1):
+            self.polls += 1
+            items = self._fetch_page(since, page)
+            new = [item for item in items if item.id not in self.seen]
+            fresh.extend(new)
+            # Stop once we reach events we've already seen, or run out
+            if len(new) < len(items) or not items or since is None:
+                break
+        fresh.reverse()
+        for item in fresh:
+            self.seen.add(item.id)
+            if self.high_water is None or item.timestamp > self.high_water:
+                self.high_water = item.timestamp
+        return fresh
+
+    def follow(self) -> Iterator[Any]:
+        """Poll forever, sleeping the adaptive interval between polls."""
+        while True:
+            events = self.poll()
+            yield from events
+            if events:
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.max_interval, self.interval * BACKOFF_FACTOR)
+            self._sleep(self.interval)
@@ -0,0 +1,99 @@
+"""Output throttling for ``webhooks listen`` under event bursts.
+
+``DisplayThrottle`` decides, per event, how (or whether) to print it. A
+token bucket caps printed lines per second; events over the cap are counted
+and summarized as "N more events" before the next line that gets printed.
+In auto mode the display switches to one compact line per event when the
+arrival rate (over a one-second sliding window) exceeds a threshold, and
+back to full panels once it falls below half of that, so a burst costs a
+short line per event at most rather than a highlighted JSON panel.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Callable
+
+DEFAULT_MAX_LINES = 50.0
+DEFAULT_COMPACT_ABOVE = 10.0
+WINDOW = 1.0
+
+
+class DisplayMode(StrEnum):
+    FULL = "full"
+    COMPACT = "compact"
+    AUTO = "auto"
+
+
+@dataclass(frozen=True, slots=True)
+class Decision:
+    # "full" or "compact", or None if the event is suppressed
+    style: str | None
+    # Events suppressed since the last printed one, to summarize first
+    coalesced: int = 0
+    # Auto mode changed style since the last printed event
+    switched: bool = False
+
+
+class DisplayThrottle:
+    """Rate-limits and picks the display style for a stream of events."""
+
+    def __init__(
+        self,
+        mode: DisplayMode = DisplayMode.AUTO,
+        max_lines: float = DEFAULT_MAX_LINES,
+        compact_above: float = DEFAULT_COMPACT_ABOVE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.mode = mode
+        self.max_lines = max_lines
+        self.compact_above = compact_above
+        self.compact = mode == DisplayMode.COMPACT
+        self.suppressed = 0
+        self._clock = clock
+        self._arrivals: deque[float] = deque()
+        self._tokens = max(1.0, max_lines)
+        self._refilled = clock()
+        self._switched = False
+
+    @property
+    def rate(self) -> float:
+        """Events per second over the last window."""
+        return len(self._arrivals) / WINDOW
+
+    def decide(self) -> Decision:
+        now = self._clock()
+        self._arrivals.append(now)
+        while self._arrivals[0] <= now - WINDOW:
+            self._arrivals.popleft()
+
+        if self.mode == DisplayMode.AUTO:
+            if not self.compact and self.rate > self.compact_above:
+                self.compact, self._switched = True, True
+            elif self.compact and self.rate <= self.compact_above / 2:
+                self.compact, self._switched = False, True
+
+        if not self._take(now):
+            self.suppressed += 1
+            return Decision(None)
+        coalesced = self.drain()
+        switched, self._switched = self._switched, False
+        return Decision("compact" if self.compact else "full", coalesced, switched)
+
+    def drain(self) -> int:
+        """Take the count of suppressed events not yet summarized."""
+        count, self.suppressed = self.suppressed, 0
+        return count
+
+    def _take(self, now: float) -> bool:
+        if self.max_lines <= 0:
+            return True
+        self._tokens = min(max(1.0, self.max_lines), self._tokens + (now - self._refilled) * self.max_lines)
+        self._refilled = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
@@ -0,0 +1,387 @@
+"""Parallel multipart upload of a local file to Polar's S3 storage.
+
+The file is memory-mapped, so parts are slices of the mapping rather than
+reads into memory: checksums are computed over ``memoryview`` slices (on a
+thread pool; hashlib releases the GIL for large buffers) and part bodies are
+streamed to the presigned URLs in ``STREAM_CHUNK`` pieces of the same
+mapping. At most ``concurrency`` parts are in flight at any time.
+
+The flow mirrors the web uploader: ``files.create`` with the planned parts
+and their SHA-256 checksums returns a presigned URL per part; each part is
+PUT to its URL; ``files.uploaded`` completes the upload with the ETags.
+
+Parts are sized by ``choose_part_size``: large enough that per-request
+overhead stays small next to transfer time at the throughput measured on
+earlier uploads, small enough that every connection still gets several
+parts, and always within S3's limits.
+
+An ``UploadCheckpoint`` records the created upload, its presigned parts and
+every ETag as soon as the part lands, so an interrupted upload can be
+resumed by sending only the parts without one. The file is identified by
+its size and a sampled hash, which is cheap even for multi-GB files.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import mmap
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import httpx
+
+from polar_cli.bulk import DEFAULT_CONCURRENCY, call_with_retries, run_concurrently
+from polar_cli.config import DATA_DIR
+from polar_cli.errors import CLIError
+
+UPLOAD_DIR = DATA_DIR / "uploads"
+
+MiB = 1024 * 1024
+# S3 multipart limits: every part but the last is at least 5 MiB, at most 5 GiB, and at most 10,000 parts
+MIN_PART_SIZE = 5 * MiB
+MAX_PART_SIZE = 5 * 1024 * MiB
+MAX_PARTS = 10_000
+CHUNK_SIZE = MIN_PART_SIZE
+# Aim for parts that take about this long on one connection
+TARGET_PART_SECONDS = 8.0
+# Per-connection throughput assumed until an upload has been measured (bytes/s)
+DEFAULT_THROUGHPUT = 4 * MiB
+# Keep at least this many parts per connection, so a slow part or a retry costs little
+PARTS_PER_CONNECTION = 2
+# Uploads smaller than this are dominated by latency and say little about throughput
+MIN_MEASURED_BYTES = 32 * MiB
+STREAM_CHUNK = MiB
+PART_TIMEOUT = httpx.Timeout(30.0, write=120.0)
+# Fingerprint: this many evenly spaced windows (including both ends) of this size
+FINGERPRINT_SAMPLES = 32
+FINGERPRINT_WINDOW = 64 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class Part:
+    number: int
+    start: int
+    end: int
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+def plan_parts(size: int, part_size: int = CHUNK_SIZE) -> list[Part]:
+    """Split ``size`` bytes into consecutive parts of ``part_size`` (the last may be shorter)."""
+    return [
+        Part(number, start, min(start + part_size, size))
+        for number, start in enumerate(range(0, size, part_size), start=1)
+    ]
+
+
+def min_part_size(size: int) -> int:
+    """The smallest part size S3 accepts for ``size`` bytes."""
+    return max(MIN_PART_SIZE, _round_up(-(-size // MAX_PARTS), MiB))
+
+
+def choose_part_size(
+    size: int,
+    throughput: float | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> int:
+    """Part size for ``size`` bytes given per-connection ``throughput`` in bytes/s.
+
+    The target is what one connection moves in ``TARGET_PART_SECONDS``,
+    capped so each of ``concurrency`` connections still gets
+    ``PARTS_PER_CONNECTION`` parts, then clamped to S3's limits. Sizes are
+    whole MiB.
+    """
+    target = (throughput or DEFAULT_THROUGHPUT) * TARGET_PART_SECONDS
+    spread = size / (max(1, concurrency) * PARTS_PER_CONNECTION)
+    part_size = _round_up(int(min(target, spread)), MiB)
+    return min(MAX_PART_SIZE, max(min_part_size(size), part_size))
+
+
+def _round_up(value: int, multiple: int) -> int:
+    return -(-value // multiple) * multiple
+
+
+class ThroughputEstimate:
+    """Per-connection upload throughput, smoothed across uploads and kept on disk."""
+
+    SMOOTHING = 0.5
+
+    def __init__(self) -> None:
+        self.path = UPLOAD_DIR / "throughput.json"
+        try:
+            self.value: float | None = float(json.loads(self.path.read_text())["bytes_per_second"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self.value = None
+
+    def observe(self, sent: int, elapsed: float, connections: int) -> None:
+        """Fold in an upload of ``sent`` bytes over ``connections`` parallel connections."""
+        if sent < MIN_MEASURED_BYTES or elapsed <= 0:
+            return
+        measured = sent / elapsed / max(1, connections)
+        self.value = measured if self.value is None else self.SMOOTHING * measured + (1 - self.SMOOTHING) * self.value
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"bytes_per_second": round(self.value)}))
+        os.replace(tmp, self.path)
+
+
+class MappedFile:
+    """A read-only memory map of a file, sliced into zero-copy part views."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.size = path.stat().st_size
+        if self.size == 0:
+            raise CLIError(f"{path} is empty.")
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(self._map, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+
+    def view(self, part: Part) -> memoryview:
+        return memoryview(self._map)[part.start:part.end]
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> MappedFile:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def sample_fingerprint(mapped: MappedFile) -> str:
+    """Hash of the size and evenly spaced windows of the file (the whole file when small)."""
+    digest = hashlib.sha256(str(mapped.size).encode())
+    last = max(0, mapped.size - FINGERPRINT_WINDOW)
+    offsets = sorted({last * i // (FINGERPRINT_SAMPLES - 1) for i in range(FINGERPRINT_SAMPLES)})
+    with mapped.view(Part(0, 0, mapped.size)) as view:
+        for offset in offsets:
+            with view[offset:offset + FINGERPRINT_WINDOW] as window:
+                digest.update(window)
+    return digest.hexdigest()
+
+
+def sha256_base64(data: memoryview | bytes) -> str:
+    return base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+
+def part_checksums(mapped: MappedFile, parts: list[Part], concurrency: int | None = None) -> dict[int, str]:
+    """SHA-256 (base64) of each part, computed in parallel (one thread per CPU by default)."""
+
+    def checksum(part: Part) -> str:
+        with mapped.view(part) as view:
+            return sha256_base64(view)
+
+    checksums = {}
+    for outcome in run_concurrently(checksum, parts, concurrency or os.cpu_count() or 1):
+        if outcome.error is not None:
+            raise outcome.error
+        checksums[outcome.item.number] = outcome.value
+    return checksums
+
+
+class PartUploadError(Exception):
+    """A part PUT answered with an error status; ``status_code`` drives retries."""
+
+    def __init__(self, number: int, status_code: int, body: str) -> None:
+        super().__init__(f"Part {number} upload failed: HTTP {status_code} {body[:200]}".rstrip())
+        self.status_code = status_code
+
+
+@dataclass(frozen=True, slots=True)
+class PresignedPart:
+    """A part and where to PUT it; shaped like the SDK's upload part."""
+
+    number: int
+    chunk_start: int
+    chunk_end: int
+    url: str
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_sdk(cls, part: Any) -> PresignedPart:
+        return cls(part.number, part.chunk_start, part.chunk_end, part.url, dict(part.headers or {}))
+
+
+def put_part(
+    http: httpx.Client,
+    mapped: MappedFile,
+    part: Part,
+    url: str,
+    headers: dict[str, str] | None = None,
+    on_bytes: Callable[[int], None] | None = None,
+) -> str:
+    """Stream one part to its presigned URL and return the ETag."""
+    sent = 0
+
+    def body() -> Iterator[memoryview]:
+        nonlocal sent
+        with mapped.view(part) as view:
+            for offset in range(0, len(view), STREAM_CHUNK):
+                # Not released here: the transport may still hold the chunk after the yield
+                chunk = view[offset:offset + STREAM_CHUNK]
+                yield chunk
+                sent += len(chunk)
+                if on_bytes:
+                    on_bytes(len(chunk))
+
+    request_headers = {**(headers or {}), "Content-Length": str(part.size)}
+    stream = body()
+    try:
+        resp = http.put(url, content=stream, headers=request_headers)
+    except BaseException:
+        if on_bytes and sent:
+            on_bytes(-sent)
+        raise
+    finally:
+        # Release the slices now, so the mapping can be closed even after a failure
+        stream.close()
+    if resp.status_code >= 400:
+        if on_bytes and sent:
+            on_bytes(-sent)
+        raise PartUploadError(part.number, resp.status_code, resp.text)
+    etag = resp.headers.get("ETag")
+    if not etag:
+        raise PartUploadError(part.number, resp.status_code, "response has no ETag")
+    return etag
+
+
+def upload_parts(
+    http: httpx.Client,
+    mapped: MappedFile,
+    presigned: list[Any],
+    checksums: dict[int, str] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_bytes: Callable[[int], None] | None = None,
+    on_part: Callable[[int, str], None] | None = None,
+) -> list[dict[str, Any]]:
+    """PUT every presigned part concurrently; returns the completed parts for ``files.uploaded``.
+
+    ``on_part(number, etag)`` is called from the worker thread as soon as a
+    part lands, whatever order the parts finish in. ``checksums`` fills in
+    each completed part's ``checksum_sha256_base64``.
+    """
+    checksums = checksums or {}
+
+    def send(upload_part: Any) -> str:
+        part = Part(upload_part.number, upload_part.chunk_start, upload_part.chunk_end)
+        etag = call_with_retries(
+            lambda: put_part(http, mapped, part, upload_part.url, upload_part.headers, on_bytes)
+        )
+        if on_part:
+            on_part(part.number, etag)
+        return etag
+
+    completed = []
+    for outcome in run_concurrently(send, presigned, concurrency):
+        if outcome.error is not None:
+            raise outcome.error
+        number = outcome.item.number
+        completed.append({
+            "number": number,
+            "checksum_etag": outcome.value,
+            "checksum_sha256_base64": checksums.get(number),
+        })
+    return completed
+
+
+def upload_http_client(concurrency: int = DEFAULT_CONCURRENCY) -> httpx.Client:
+    """Client for the presigned part URLs (no Polar auth; one connection per part in flight)."""
+    return httpx.Client(
+        timeout=PART_TIMEOUT,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+    )
+
+
+@dataclass(slots=True)
+class UploadState:
+    fingerprint: str
+    size: int
+    file_id: str
+    upload_id: str
+    upload_path: str
+    parts: list[dict[str, Any]]
+    checksums: dict[str, str]
+    etags: dict[str, str] = field(default_factory=dict)
+
+    def presigned(self) -> list[PresignedPart]:
+        return [PresignedPart(**part) for part in self.parts]
+
+    def pending(self) -> list[PresignedPart]:
+        return [part for part in self.presigned() if str(part.number) not in self.etags]
+
+    def bytes_done(self) -> int:
+        return sum(p["chunk_end"] - p["chunk_start"] for p in self.parts if str(p["number"]) in self.etags)
+
+    def completed_parts(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "number": p["number"],
+                "checksum_etag": self.etags[str(p["number"])],
+                "checksum_sha256_base64": self.checksums.get(str(p["number"])),
+            }
+            for p in self.parts
+        ]
+
+
+class UploadCheckpoint:
+    """The persisted state of one local file's upload, keyed by its absolute path.
+
+    The state (with every presigned part) is written once when the upload is
+    created; finished parts are appended to a small ETag journal alongside
+    it and folded back in on load, so recording a part costs one short write
+    however many parts there are.
+    """
+
+    def __init__(self, path: Path) -> None:
+        key = hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:16]
+        self.path = UPLOAD_DIR / f"{key}.json"
+        self.journal = UPLOAD_DIR / f"{key}.etags"
+        self.state = UploadState(**json.loads(self.path.read_text())) if self.path.exists() else None
+        if self.state is not None:
+            self.state.etags.update(self._read_journal())
+        self._lock = threading.Lock()
+
+    def _read_journal(self) -> dict[str, str]:
+        etags = {}
+        if self.journal.exists():
+            for line in self.journal.read_text().splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by a crash; that part is simply sent again
+                    continue
+                etags[str(entry["number"])] = entry["etag"]
+        return etags
+
+    def record(self, number: int, etag: str) -> None:
+        """Store a finished part's ETag (thread-safe)."""
+        assert self.state is not None
+        line = json.dumps({"number": number, "etag": etag}) + "\n"
+        with self._lock:
+            self.state.etags[str(number)] = etag
+            with open(self.journal, "a") as f:
+                f.write(line)
+
+    def save(self) -> None:
+        """Write the whole state, which supersedes the journal."""
+        assert self.state is not None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(self.state)))
+        os.replace(tmp, self.path)
+        self.journal.unlink(missing_ok=True)
+
+    def delete(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.journal.unlink(missing_ok=True)
@@ -1,4 +1,4 @@
-"""Shared helpers — org resolution, spinners."""
+"""Shared helpers — org and ID resolution, spinners."""
 
 from __future__ import annotations
 
@@ -12,6 +12,8 @@ from rich.status import Status
 
 from polar_cli.config import OutputFormat, get_default_org_id
 from polar_cli.context import get_cli_context
+from polar_cli.errors import CLIError
+from polar_cli.id_index import IdIndex
 
 if TYPE_CHECKING:
     from polar_sdk import Polar
@@ -22,11 +24,36 @@ console = Console(stderr=True)
 UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I)
 
 
+ID_PREFIX_RE = re.compile(r"^[0-9a-f][0-9a-f-]{3,35}$", re.I)
+
+
 def is_uuid(value: str) -> bool:
     """Check if a string looks like a UUID."""
     return bool(UUID_RE.match(value))
 
 
+def resolve_id(value: str) -> str:
+    """Expand a short ID prefix (git-style) to a full UUID.
+
+    Prefixes are matched against the local index of IDs seen in previous
+    command output. Anything that is already a full UUID, doesn't look like a
+    prefix, or isn't in the index is passed through unchanged so the API can
+    resolve it. Raises CLIError if the prefix matches more than one known ID.
+    """
+    if is_uuid(value) or not ID_PREFIX_RE.match(value):
+        return value
+    matches = IdIndex().lookup(value, limit=5)
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        candidates = "\n".join(f"  {m}" for m in matches)
+        raise CLIError(
+            f"ID prefix '{value}' is ambiguous. Candidates:\n{candidates}",
+            hint="Type more characters of the ID",
+        )
+    return value
+
+
 def get_org_by_id_or_slug(client: "Polar", id_or_slug: str) -> "Organization":
     """Resolve an organization by ID (UUID) or slug.
 
@@ -0,0 +1,102 @@
+"""Tests for the batch command."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import MagicMock
+
+import httpx
+
+
+def _write_ops(path, *ops):
+    path.write_text("".join(json.dumps(op) + "\n" for op in ops))
+
+
+def _read_results(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestBatch:
+    def test_runs_operations_and_writes_results(self, runner, cli_app, mock_polar, tmp_path):
+        mock_polar.customers.create.return_value = MagicMock(id="cust-new")
+        mock_polar.customers.update.return_value = MagicMock(id="cust-1")
+        ops = tmp_path / "ops.ndjson"
+        _write_ops(
+            ops,
+            {"op": "customers.create", "args": {"email": "a@example.com"}},
+            {"op": "customers update", "args": {"id": "cust-1", "name": "Bob"}, "key": "k-2"},
+        )
+
+        result = runner.invoke(cli_app, ["batch", str(ops)])
+        assert result.exit_code == 0
+        records = _read_results(tmp_path / "ops.ndjson.results.ndjson")
+        assert [r["status"] for r in records] == ["ok", "ok"]
+        assert records[0]["id"] == "cust-new"
+        mock_polar.customers.update.assert_called_once_with(
+            id="cust-1", customer_update={"name": "Bob"}, http_headers={"Idempotency-Key": "k-2"},
+        )
+
+    def test_bad_lines_fail_without_aborting(self, runner, cli_app, mock_polar, tmp_path):
+        ops = tmp_path / "ops.ndjson"
+        ops.write_text('not json\n{"op": "customers.explode"}\n{"op": "customers.delete", "args": {"id": "c"}}\n')
+
+        result = runner.invoke(cli_app, ["batch", str(ops), "--results", str(tmp_path / "out.ndjson")])
+        assert result.exit_code == 1
+        records = _read_results(tmp_path / "out.ndjson")
+        assert [r["status"] for r in records] == ["error", "error", "ok"]
+        assert "Unknown operation" in records[1]["error"]
+
+    def test_resume_skips_succeeded_keys(self, runner, cli_app, mock_polar, tmp_path):
+        ops = tmp_path / "ops.ndjson"
+        _write_ops(
+            ops,
+            {"op": "customers.delete", "args": {"id": "c-1"}, "key": "done"},
+            {"op": "customers.delete", "args": {"id": "c-2"}, "key": "todo"},
+        )
+        results = tmp_path / "ops.ndjson.results.ndjson"
+        results.write_text(json.dumps({"line": 1, "key": "done", "status": "ok"}) + "\n")
+
+        result = runner.invoke(cli_app, ["batch", str(ops), "--resume"])
+        assert result.exit_code == 0
+        mock_polar.customers.delete.assert_called_once_with(id="c-2", http_headers={"Idempotency-Key": "todo"})
+        assert [r["status"] for r in _read_results(results)][-2:] == ["skipped", "ok"]
+
+    def test_attempts_must_be_positive(self, runner, cli_app, mock_polar, tmp_path):
+        ops = tmp_path / "ops.ndjson"
+        _write_ops(ops, {"op": "customers.delete", "args": {"id": "c-1"}})
+        result = runner.invoke(cli_app, ["batch", str(ops), "--attempts", "0"])
+        assert result.exit_code == 2
+        mock_polar.customers.delete.assert_not_called()
+
+    def test_creates_only_retry_when_not_applied(self, runner, cli_app, mock_polar, tmp_path, mocker):
+        mocker.patch("polar_cli.bulk.time.sleep")
+        mock_polar.customers.create.side_effect = [HTTPStatusError(500), HTTPStatusError(503), MagicMock(id="c")]
+        mock_polar.customers.delete.side_effect = [HTTPStatusError(500), None]
+        ops = tmp_path / "ops.ndjson"
+        _write_ops(
+            ops,
+            {"op": "customers.create", "args": {"email": "a@example.com"}},
+            {"op": "customers.create", "args": {"email": "b@example.com"}},
+            {"op": "customers.delete", "args": {"id": "c-1"}},
+        )
+        runner.invoke(cli_app, ["batch", str(ops), "--concurrency", "1"])
+        records = _read_results(tmp_path / "ops.ndjson.results.ndjson")
+        # A 500 may have created the customer, so the first create is not repeated
+        assert [r["status"] for r in records] == ["error", "ok", "ok"]
+        assert mock_polar.customers.create.call_count == 3
+        assert mock_polar.customers.delete.call_count == 2
+
+    def test_ingest_is_not_retried_after_a_timeout(self, runner, cli_app, mock_polar, tmp_path, mocker):
+        mocker.patch("polar_cli.bulk.time.sleep")
+        mock_polar.events.ingest.side_effect = [httpx.ReadTimeout("timed out"), MagicMock()]
+        ops = tmp_path / "ops.ndjson"
+        _write_ops(ops, {"op": "events.ingest", "args": {"events": [{"name": "api_call"}]}})
+        runner.invoke(cli_app, ["batch", str(ops)])
+        assert [r["status"] for r in _read_results(tmp_path / "ops.ndjson.results.ndjson")] == ["error"]
+        assert mock_polar.events.ingest.call_count == 1
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
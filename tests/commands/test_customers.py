@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import json
 from unittest.mock import MagicMock
 
+import httpx
+import pytest
+
 from tests.conftest import make_list_result
 
 
+def _status_error(status_code: int) -> Exception:
+    error = Exception(f"HTTP {status_code}")
+    error.status_code = status_code
+    return error
+
+
 class TestCustomersList:
     def test_list(self, runner, cli_app, mock_polar, mocker):
         customer = MagicMock()
@@ -54,3 +64,110 @@ class TestCustomersCreate:
         result = runner.invoke(cli_app, ["customers", "create", "--email", "bob@example.com"])
         assert result.exit_code == 0
         assert "Customer created" in result.output
+
+
+class TestCustomersShortId:
+    def test_get_by_prefix_of_listed_id(self, runner, cli_app, mock_polar, mocker):
+        full_id = "9f3b2a10-5d6e-4c7b-8a9d-0e1f2a3b4c5d"
+        listed = MagicMock(id=full_id, email="alice@example.com", created_at="2024-01-01")
+        listed.name = "Alice"
+        mock_polar.customers.list.return_value = make_list_result([listed])
+        mock_polar.customers.get.return_value = listed
+        mocker.patch("polar_cli.commands.customers.resolve_org_id", return_value="org-1")
+
+        runner.invoke(cli_app, ["customers", "list"])
+        result = runner.invoke(cli_app, ["customers", "get", "9f3b2a"])
+        assert result.exit_code == 0
+        mock_polar.customers.get.assert_called_once_with(id=full_id)
+
+
+class TestCustomersGetMany:
+    def test_get_many_json_in_input_order(self, runner, cli_app, mock_polar):
+        mock_polar.customers.get.side_effect = lambda id: {"id": id, "email": f"{id}@example.com"}
+
+        result = runner.invoke(cli_app, ["-o", "json", "customers", "get", "c-1", "c-2", "c-3"])
+        assert result.exit_code == 0
+        lines = [line for line in result.output.splitlines() if line.startswith("{")]
+        assert [json.loads(line)["id"] for line in lines] == ["c-1", "c-2", "c-3"]
+
+    def test_get_many_reports_failures_without_aborting(self, runner, cli_app, mock_polar, tmp_path):
+        def get(id):
+            if id == "c-2":
+                raise RuntimeError("gone")
+            return {"id": id}
+
+        mock_polar.customers.get.side_effect = get
+        ids_file = tmp_path / "ids.txt"
+        ids_file.write_text("c-1\nc-2\nc-3\n")
+
+        result = runner.invoke(cli_app, ["-o", "json", "customers", "get", "--ids-from", str(ids_file)])
+        assert result.exit_code == 1
+        assert '"c-3"' in result.output
+        assert "1 of 3 lookups failed" in result.output
+
+
+class TestCustomersImport:
+    def _existing(self, mock_polar):
+        alice = MagicMock(id="cust-1", email="alice@example.com", external_id=None, metadata={"plan": "pro"})
+        alice.name = "Alice"
+        bob = MagicMock(id="cust-2", email="bob@example.com", external_id="crm-2", metadata={})
+        bob.name = "Bob"
+        res = make_list_result([alice, bob])
+        res.result.pagination.max_page = 1
+        mock_polar.customers.list.return_value = res
+
+    def _csv(self, tmp_path):
+        path = tmp_path / "customers.csv"
+        path.write_text(
+            "email,name,metadata.plan\n"
+            "Alice@example.com,Alice,pro\n"
+            "bob@example.com,Robert,\n"
+            "carol@example.com,Carol,free\n"
+        )
+        return path
+
+    def test_dry_run_plans_only_differences(self, runner, cli_app, mock_polar, mocker, tmp_path):
+        self._existing(mock_polar)
+        mocker.patch("polar_cli.commands.customers.resolve_org_id", return_value="org-1")
+
+        result = runner.invoke(cli_app, ["customers", "import", str(self._csv(tmp_path)), "--dry-run"])
+        assert result.exit_code == 0
+        assert "1 to create" in result.output
+        assert "1 to update" in result.output
+        assert "1 unchanged" in result.output
+        mock_polar.customers.create.assert_not_called()
+        mock_polar.customers.update.assert_not_called()
+
+    def test_applies_creates_and_updates(self, runner, cli_app, mock_polar, mocker, tmp_path):
+        self._existing(mock_polar)
+        mocker.patch("polar_cli.commands.customers.resolve_org_id", return_value="org-1")
+
+        result = runner.invoke(cli_app, ["customers", "import", str(self._csv(tmp_path))])
+        assert result.exit_code == 0
+        assert "Imported 2 customer(s)" in result.output
+        mock_polar.customers.update.assert_called_once_with(id="cust-2", customer_update={"name": "Robert"})
+        mock_polar.customers.create.assert_called_once_with(request={
+            "email": "carol@example.com", "name": "Carol", "metadata": {"plan": "free"}, "organization_id": "org-1",
+        })
+
+    @pytest.mark.parametrize("error", [_status_error(500), httpx.ReadTimeout("timed out")])
+    def test_create_is_not_retried_when_it_may_have_applied(self, runner, cli_app, mock_polar, mocker, tmp_path, error):
+        self._existing(mock_polar)
+        mocker.patch("polar_cli.commands.customers.resolve_org_id", return_value="org-1")
+        mocker.patch("polar_cli.bulk.time.sleep")
+        mock_polar.customers.create.side_effect = [error, MagicMock(id="cust-3")]
+        mock_polar.customers.update.side_effect = [error, MagicMock(id="cust-2")]
+
+        result = runner.invoke(cli_app, ["customers", "import", str(self._csv(tmp_path))])
+        assert result.exit_code == 1
+        # The create may have gone through; the update is safe to repeat
+        assert mock_polar.customers.create.call_count == 1
+        assert mock_polar.customers.update.call_count == 2
+
+    def test_requires_match_column(self, runner, cli_app, mock_polar, mocker, tmp_path):
+        mocker.patch("polar_cli.commands.customers.resolve_org_id", return_value="org-1")
+        path = tmp_path / "customers.csv"
+        path.write_text("name\nAlice\n")
+        result = runner.invoke(cli_app, ["customers", "import", str(path), "--match", "external_id"])
+        assert result.exit_code == 1
+        assert "external_id" in result.output
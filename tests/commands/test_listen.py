@@ -0,0 +1,241 @@
+"""Tests for 'webhooks listen'."""
+
+import json
+import socket
+
+import httpx
+
+from polar_cli.forwarding import Forwarder, ForwardResult
+from polar_cli.spool import dead_letter_path, forward_spool
+from polar_cli.sse import ReconnectingStream
+
+
+def _sse_body(*events: dict) -> bytes:
+    return "".join(f"id: {i}\ndata: {json.dumps(e)}\n\n" for i, e in enumerate(events, start=1)).encode()
+
+
+WEBHOOK = {
+    "key": "webhook.created",
+    "ts": "2024-01-01T00:00:00Z",
+    "headers": {"webhook-id": "msg-1"},
+    "payload": {"payload": {"type": "order.created", "data": {"id": "ord-1"}}},
+}
+
+
+def _serve(mocker, *responses) -> list[httpx.Request]:
+    """Route the listener's SSE connections to scripted responses."""
+    requests: list[httpx.Request] = []
+    queue = list(responses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        response = queue.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    mocker.patch(
+        "polar_cli.commands.webhooks.ReconnectingStream",
+        side_effect=lambda *a, **kw: ReconnectingStream(*a, http_client=client, sleep=lambda s: None, **kw),
+    )
+    mocker.patch("polar_cli.commands.webhooks.resolve_org_id", return_value="org-1")
+    return requests
+
+
+def _stream(*events: dict) -> httpx.Response:
+    return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=_sse_body(*events))
+
+
+class TestListen:
+    def test_reconnects_and_resumes(self, runner, cli_app, mock_polar, mocker):
+        requests = _serve(
+            mocker,
+            _stream({"key": "connected", "secret": "s"}, WEBHOOK),
+            httpx.ConnectError("reset"),
+            _stream({"key": "connected", "secret": "s"}),
+            httpx.Response(401),
+        )
+        result = runner.invoke(cli_app, ["webhooks", "listen"])
+        # The final 401 is fatal and ends the run
+        assert result.exit_code == 1
+        assert "webhook.created" in result.output
+        assert "Disconnected:" in result.output
+        assert "Reconnected" in result.output
+        assert requests[2].headers["last-event-id"] == "2"
+        assert "Reconnected 3 time(s)" in result.output
+
+    def test_no_reconnect_exits_on_bad_status(self, runner, cli_app, mock_polar, mocker):
+        _serve(mocker, httpx.Response(503))
+        result = runner.invoke(cli_app, ["webhooks", "listen", "--no-reconnect"])
+        assert result.exit_code == 1
+        assert "HTTP 503" in result.output
+
+    def test_record(self, runner, cli_app, mock_polar, mocker, tmp_path):
+        _serve(mocker, _stream({"key": "connected", "secret": "s"}, WEBHOOK), httpx.Response(401))
+        path = tmp_path / "rec.ndjson"
+        result = runner.invoke(cli_app, ["webhooks", "listen", "--record", str(path)])
+        assert "Recorded 1 event(s)" in result.output
+        [line] = path.read_text().splitlines()
+        assert json.loads(line)["headers"] == {"webhook-id": "msg-1"}
+
+    def test_forwards_to_matching_targets(self, runner, cli_app, mock_polar, mocker):
+        _serve(mocker, _stream({"key": "connected", "secret": "s"}, WEBHOOK), httpx.Response(401))
+        hosts: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append(request.url.host)
+            return httpx.Response(200)
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        mocker.patch(
+            "polar_cli.forwarding.Forwarder",
+            side_effect=lambda *a, **kw: Forwarder(*a, http_client=client, **kw),
+        )
+        result = runner.invoke(
+            cli_app,
+            ["webhooks", "listen", "-f", "http://orders#order.*", "-f", "http://refunds#refund.*", "-f", "http://all"],
+        )
+        assert sorted(hosts) == ["all", "orders"]
+        assert "Forwarded 1 to http://orders" in result.output
+        assert "Forwarded 0 to http://refunds" in result.output
+
+    def test_rejects_bad_target(self, runner, cli_app, mock_polar, mocker):
+        _serve(mocker)
+        result = runner.invoke(cli_app, ["webhooks", "listen", "-f", "localhost:3000"])
+        assert result.exit_code == 1
+        assert "Invalid forward target" in result.output
+
+    def test_compact_display(self, runner, cli_app, mock_polar, mocker):
+        _serve(mocker, _stream({"key": "connected", "secret": "s"}, WEBHOOK), httpx.Response(401))
+        result = runner.invoke(cli_app, ["webhooks", "listen", "--display", "compact"])
+        assert "2024-01-01T00:00:00Z webhook.created order.created ord-1" in result.output
+        assert "Headers:" not in result.output
+
+    def test_summarizes_events_over_the_line_limit(self, runner, cli_app, mock_polar, mocker):
+        _serve(mocker, _stream({"key": "connected", "secret": "s"}, *[WEBHOOK] * 5), httpx.Response(401))
+        result = runner.invoke(cli_app, ["webhooks", "listen", "--display", "compact", "--max-lines", "2"])
+        assert result.output.count("order.created ord-1") == 2
+        assert "3 more event(s)" in result.output
+
+    def test_listens_to_several_orgs(self, runner, cli_app, mock_polar, mocker):
+        def handler(request: httpx.Request) -> httpx.Response:
+            org = request.url.path.rsplit("/", 1)[-1]
+            event = {**WEBHOOK, "payload": {"payload": {"type": "order.created", "data": {"id": f"ord-{org}"}}}}
+            return _stream({"key": "connected", "secret": org}, event)
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        mocker.patch(
+            "polar_cli.commands.webhooks.ReconnectingStream",
+            side_effect=lambda *a, **kw: ReconnectingStream(
+                *a, http_client=client, sleep=lambda s: None, **{**kw, "reconnect": False}
+            ),
+        )
+        result = runner.invoke(
+            cli_app, ["webhooks", "listen", "--display", "compact", "--org", "org-a", "--org", "sandbox:org-b"]
+        )
+        assert result.exit_code == 0, result.output
+        assert "https://sandbox-api.polar.sh/v1/cli/listen/org-b" in result.output
+        assert "Connected to org-a!" in result.output
+        assert "org-a webhook.created order.created ord-org-a" in result.output
+        assert "sandbox:org-b webhook.created order.created ord-org-b" in result.output
+
+    def test_rejects_unknown_environment(self, runner, cli_app, mock_polar, mocker):
+        _serve(mocker)
+        result = runner.invoke(cli_app, ["webhooks", "listen", "--org", "staging:org-1"])
+        assert result.exit_code == 1
+        assert "Unknown environment 'staging'" in result.output
+
+    def test_retry_failed_requeues_dead_letters(self, runner, cli_app, mock_polar, mocker):
+        _serve(mocker, _stream({"key": "connected", "secret": "s"}), httpx.Response(401))
+        mocker.patch(
+            "polar_cli.forwarding.post_event",
+            side_effect=lambda client, url, event, depth=0: ForwardResult(event, 200, 0.001),
+        )
+        dead_letter = dead_letter_path("http://local")
+        dead_letter.parent.mkdir(parents=True)
+        dead_letter.write_text(json.dumps({"event": WEBHOOK, "attempts": 5, "error": "HTTP 500"}) + "\n")
+        result = runner.invoke(cli_app, ["webhooks", "listen", "-f", "http://local", "--retry-failed"])
+        assert "Resending 1 dead-lettered event(s) to http://local" in result.output
+        assert not dead_letter.exists()
+
+    def test_target_in_use_by_another_listener_fails_fast(self, runner, cli_app, mock_polar, mocker):
+        requests = _serve(mocker)
+        with forward_spool("http://local").lock(exclusive=True):
+            result = runner.invoke(cli_app, ["webhooks", "listen", "-f", "http://local"])
+        assert result.exit_code == 1
+        assert "Another listener is already forwarding to http://local" in result.output
+        assert requests == []
+
+    def test_retry_failed_needs_target(self, runner, cli_app, mock_polar, mocker):
+        _serve(mocker)
+        result = runner.invoke(cli_app, ["webhooks", "listen", "--retry-failed"])
+        assert result.exit_code == 1
+        assert "--forward-to" in result.output
+
+    def test_metrics_and_summary(self, runner, cli_app, mock_polar, mocker):
+        _serve(mocker, _stream({"key": "connected", "secret": "s"}, WEBHOOK), httpx.Response(401))
+        result = runner.invoke(cli_app, ["webhooks", "listen", "--metrics-port", "0", "--summary-every", "60"])
+        assert "Metrics: http://127.0.0.1:" in result.output
+        assert "received 1" in result.output
+
+    def test_busy_metrics_port_fails_before_forwarding_starts(self, runner, cli_app, mock_polar, mocker, tmp_path):
+        _serve(mocker)
+        router = mocker.patch("polar_cli.commands.webhooks.ForwardRouter")
+        recording = tmp_path / "rec.ndjson"
+        with socket.socket() as busy:
+            busy.bind(("127.0.0.1", 0))
+            busy.listen()
+            port = busy.getsockname()[1]
+            result = runner.invoke(
+                cli_app,
+                ["webhooks", "listen", "-f", "http://local", "--metrics-port", str(port), "--record", str(recording)],
+            )
+        assert result.exit_code == 1
+        assert f"Cannot serve metrics on port {port}" in result.output
+        router.assert_not_called()
+        assert not recording.exists()
+
+
+class TestReplay:
+    def test_replays_webhooks(self, runner, cli_app, tmp_path, mocker):
+        path = tmp_path / "rec.ndjson"
+        path.write_text(
+            "\n".join(json.dumps({**WEBHOOK, "recorded_at": 1.0 + i}) for i in range(3))
+            + "\n" + json.dumps({"key": "connected"}) + "\n"
+        )
+        received: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            received.append(request)
+            return httpx.Response(204)
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        mocker.patch(
+            "polar_cli.commands.webhooks.Forwarder",
+            side_effect=lambda *a, **kw: Forwarder(*a, http_client=client, **kw),
+        )
+        result = runner.invoke(
+            cli_app, ["-o", "json", "webhooks", "replay", str(path), "--forward-to", "http://local", "--max"]
+        )
+        assert result.exit_code == 0, result.output
+        summary = json.loads(result.output)
+        assert summary["events"] == 3
+        assert summary["succeeded"] == 3
+        assert set(summary["latency_ms"]) == {"p50", "p90", "p99", "max"}
+        assert received[0].headers["webhook-id"] == "msg-1"
+
+    def test_rate_and_max_conflict(self, runner, cli_app, tmp_path):
+        path = tmp_path / "rec.ndjson"
+        path.write_text("")
+        result = runner.invoke(
+            cli_app, ["webhooks", "replay", str(path), "--forward-to", "http://x", "--rate", "5", "--max"]
+        )
+        assert result.exit_code == 1
+        assert "not both" in result.output
+
+    def test_speed_must_be_positive(self, runner, cli_app, tmp_path):
+        path = tmp_path / "rec.ndjson"
+        path.write_text("")
+        result = runner.invoke(cli_app, ["webhooks", "replay", str(path), "--forward-to", "http://x", "--speed", "0"])
+        assert result.exit_code == 2
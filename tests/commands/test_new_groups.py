@@ -1,10 +1,13 @@
 """Tests for the 4 entirely new command groups: event-types, files, members, meters (full CRUD).
 
-Also covers: meters get/create/update/quantities (only list was tested before).
+Also covers: meters get/create/update/quantities/preview (only list was tested before).
 """
 
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
+import httpx
+
 from tests.conftest import make_list_result
 
 
@@ -35,7 +38,7 @@ class TestEventTypesUpdate:
         assert "Nothing to update" in result.output
 
 
-# --- files: list, create, update, delete ---
+# --- files: list, create, upload, update, delete ---
 
 
 class TestFilesList:
@@ -62,6 +65,92 @@ class TestFilesCreate:
         assert "File entry created" in result.output
 
 
+def _mock_parts_client(mocker, received, fail=()):
+    def handler(request):
+        received.append(request.url.path)
+        request.read()
+        if request.url.path in fail:
+            return httpx.Response(403, text="denied")
+        return httpx.Response(200, headers={"ETag": f'"e{request.url.path}"'})
+
+    mocker.patch(
+        "polar_cli.commands.files.upload_http_client",
+        side_effect=lambda *a: httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+
+def _mock_created(mock_polar, ranges):
+    parts = [
+        SimpleNamespace(number=n, chunk_start=s, chunk_end=e, url=f"https://s3.test/part{n}", headers={})
+        for n, (s, e) in enumerate(ranges, start=1)
+    ]
+    mock_polar.files.create.return_value = SimpleNamespace(
+        id="f-new", upload=SimpleNamespace(id="up-1", path="org/f-new", parts=parts)
+    )
+    mock_polar.files.uploaded.return_value = MagicMock(id="f-new")
+
+
+class TestFilesUpload:
+    def test_upload(self, runner, cli_app, mock_polar, mocker, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_bytes(b"x" * 1000)
+        received = []
+        _mock_parts_client(mocker, received)
+        _mock_created(mock_polar, [(0, 1000)])
+        result = runner.invoke(cli_app, ["files", "upload", str(path)])
+        assert result.exit_code == 0, result.output
+        assert "File uploaded" in result.output
+        request = mock_polar.files.create.call_args.kwargs["request"]
+        assert request["name"] == "notes.txt"
+        assert request["mime_type"] == "text/plain"
+        assert request["upload"]["parts"][0]["checksum_sha256_base64"]
+        assert received == ["/part1"]
+        completed = mock_polar.files.uploaded.call_args.kwargs["file_upload_completed"]
+        assert completed["id"] == "up-1"
+        assert completed["parts"][0]["checksum_etag"] == '"e/part1"'
+
+    def test_resume_sends_only_missing_parts(self, runner, cli_app, mock_polar, mocker, tmp_path):
+        path = tmp_path / "installer.bin"
+        path.write_bytes(b"y" * 1000)
+        _mock_created(mock_polar, [(0, 500), (500, 1000)])
+        received = []
+        _mock_parts_client(mocker, received, fail={"/part2"})
+        result = runner.invoke(cli_app, ["files", "upload", str(path)])
+        assert result.exit_code != 0
+        assert "--resume" in result.output
+        mock_polar.files.uploaded.assert_not_called()
+
+        received.clear()
+        _mock_parts_client(mocker, received)
+        result = runner.invoke(cli_app, ["files", "upload", str(path), "--resume"])
+        assert result.exit_code == 0, result.output
+        assert "1/2 part(s) already sent" in result.output
+        assert received == ["/part2"]
+        assert mock_polar.files.create.call_count == 1
+        completed = mock_polar.files.uploaded.call_args.kwargs["file_upload_completed"]
+        assert [p["checksum_etag"] for p in completed["parts"]] == ['"e/part1"', '"e/part2"']
+
+    def test_resume_rejects_changed_file(self, runner, cli_app, mock_polar, mocker, tmp_path):
+        path = tmp_path / "installer.bin"
+        path.write_bytes(b"y" * 1000)
+        _mock_created(mock_polar, [(0, 500), (500, 1000)])
+        _mock_parts_client(mocker, [], fail={"/part2"})
+        runner.invoke(cli_app, ["files", "upload", str(path)])
+
+        path.write_bytes(b"z" * 1000)
+        result = runner.invoke(cli_app, ["files", "upload", str(path), "--resume"])
+        assert result.exit_code != 0
+        assert "has changed" in result.output
+
+    def test_part_size_below_minimum(self, runner, cli_app, mock_polar, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_bytes(b"x" * 1000)
+        result = runner.invoke(cli_app, ["files", "upload", str(path), "--part-size", "2"])
+        assert result.exit_code != 0
+        assert "--part-size" in result.output
+        mock_polar.files.create.assert_not_called()
+
+
 class TestFilesUpdate:
     def test_update(self, runner, cli_app, mock_polar):
         f = MagicMock(id="f-1")
@@ -185,3 +274,37 @@ class TestMetersQuantities:
             "--start", "2024-01-01T00:00:00", "--end", "2024-02-01T00:00:00",
         ])
         assert result.exit_code == 0
+
+
+class TestMetersPreview:
+    def test_preview_from_flags(self, runner, cli_app, tmp_path):
+        path = tmp_path / "events.ndjson"
+        path.write_text(
+            '{"name": "api_call", "timestamp": "2024-01-01T10:00:00Z", "metadata": {"tokens": 3}}\n'
+            '{"name": "api_call", "timestamp": "2024-01-01T11:00:00Z", "metadata": {"tokens": 4}}\n'
+            '{"name": "other", "timestamp": "2024-01-01T12:00:00Z"}\n'
+        )
+        result = runner.invoke(cli_app, [
+            "-o", "json", "meters", "preview", "--events", str(path),
+            "--filter", '{"conjunction": "and", "clauses": [{"property": "name", "operator": "eq", "value": "api_call"}]}',
+            "--aggregation", '{"func": "sum", "property": "tokens"}',
+        ])
+        assert result.exit_code == 0
+        assert '"total": 7.0' in result.output
+        assert "Scanned 3 event(s), 2 matched" in result.output
+
+    def test_preview_uses_meter_definition(self, runner, cli_app, mock_polar, tmp_path):
+        path = tmp_path / "events.ndjson"
+        path.write_text('{"name": "api_call", "timestamp": "2024-01-01T10:00:00Z"}\n')
+        meter = MagicMock()
+        meter.filter.model_dump.return_value = {"conjunction": "and", "clauses": []}
+        meter.aggregation.model_dump.return_value = {"func": "count"}
+        mock_polar.meters.get.return_value = meter
+        result = runner.invoke(cli_app, ["-o", "json", "meters", "preview", "meter-1", "--events", str(path)])
+        assert result.exit_code == 0
+        assert '"total": 1.0' in result.output
+
+    def test_preview_requires_definition(self, runner, cli_app, tmp_path):
+        result = runner.invoke(cli_app, ["meters", "preview", "--events", str(tmp_path / "x.ndjson")])
+        assert result.exit_code != 0
+        assert "Nothing to preview" in result.output
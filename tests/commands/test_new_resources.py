@@ -6,6 +6,8 @@ any non-standard operations (create, delete, revoke, invoice, validate, etc.).
 
 from __future__ import annotations
 
+import json
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 from tests.conftest import make_direct_list_result, make_list_result
@@ -105,6 +107,89 @@ class TestWebhookRedeliver:
         assert result.exit_code == 0
         assert "Event redelivered" in result.output
 
+    @staticmethod
+    def _deliveries(*events):
+        items = [SimpleNamespace(webhook_event=SimpleNamespace(id=id, succeeded=ok)) for id, ok in events]
+        return SimpleNamespace(result=SimpleNamespace(items=items, pagination=SimpleNamespace(max_page=1)))
+
+    def test_redeliver_failed_dedupes(self, runner, cli_app, mock_polar):
+        mock_polar.webhooks.list_webhook_deliveries.return_value = self._deliveries(
+            ("evt-1", False), ("evt-1", False), ("evt-2", True), ("evt-3", False)
+        )
+        result = runner.invoke(
+            cli_app, ["-o", "json", "webhooks", "redeliver", "--failed", "--since", "2h", "--endpoint-id", "ep-1", "--rate", "0"]
+        )
+        assert result.exit_code == 0, result.output
+        kwargs = mock_polar.webhooks.list_webhook_deliveries.call_args.kwargs
+        assert kwargs["succeeded"] is False
+        assert kwargs["endpoint_id"] == "ep-1"
+        assert "start_timestamp" in kwargs
+        redelivered = sorted(c.kwargs["id"] for c in mock_polar.webhooks.redeliver_webhook_event.call_args_list)
+        assert redelivered == ["evt-1", "evt-3"]
+        summary = json.loads(result.output[result.output.index("{"):])
+        assert summary["scanned"] == 4
+        assert summary["already_delivered"] == 1
+        assert summary["redelivered"] == 2
+
+    def test_redeliver_failed_reports_errors(self, runner, cli_app, mock_polar):
+        mock_polar.webhooks.list_webhook_deliveries.return_value = self._deliveries(("evt-1", False))
+        mock_polar.webhooks.redeliver_webhook_event.side_effect = ValueError("boom")
+        result = runner.invoke(cli_app, ["webhooks", "redeliver", "--failed", "--rate", "0"])
+        assert result.exit_code == 1
+        assert "evt-1" in result.output
+
+    def test_redeliver_dry_run(self, runner, cli_app, mock_polar):
+        mock_polar.webhooks.list_webhook_deliveries.return_value = self._deliveries(("evt-1", False))
+        result = runner.invoke(cli_app, ["webhooks", "redeliver", "--failed", "--dry-run"])
+        assert result.exit_code == 0
+        assert "evt-1" in result.output
+        mock_polar.webhooks.redeliver_webhook_event.assert_not_called()
+
+    def test_redeliver_needs_id_or_failed(self, runner, cli_app, mock_polar):
+        result = runner.invoke(cli_app, ["webhooks", "redeliver"])
+        assert result.exit_code == 1
+
+    def test_redeliver_rejects_bad_since(self, runner, cli_app, mock_polar):
+        result = runner.invoke(cli_app, ["webhooks", "redeliver", "--failed", "--since", "yesterday"])
+        assert result.exit_code == 1
+        assert "Invalid time" in result.output
+
+
+class TestWebhookStats:
+    def test_stats_per_endpoint(self, runner, cli_app, mock_polar, mocker):
+        mocker.patch("polar_cli.commands.webhooks.resolve_org_id", return_value="org-1")
+        endpoints = [SimpleNamespace(id="ep-1", url="https://a"), SimpleNamespace(id="ep-2", url="https://b")]
+        mock_polar.webhooks.list_webhook_endpoints.return_value = SimpleNamespace(
+            result=SimpleNamespace(items=endpoints, pagination=SimpleNamespace(max_page=1))
+        )
+
+        def deliveries(endpoint_id, **kwargs):
+            ok = endpoint_id == "ep-1"
+            items = [
+                SimpleNamespace(
+                    succeeded=ok,
+                    http_code=200 if ok else 503,
+                    created_at="2024-05-01T10:00:00+00:00",
+                    webhook_event=SimpleNamespace(type="order.created"),
+                )
+            ]
+            return SimpleNamespace(result=SimpleNamespace(items=items, pagination=SimpleNamespace(max_page=1)))
+
+        mock_polar.webhooks.list_webhook_deliveries.side_effect = deliveries
+        result = runner.invoke(cli_app, ["-o", "json", "webhooks", "stats", "--since", "2024-05-01"])
+        assert result.exit_code == 0, result.output
+        report = json.loads(result.output)
+        assert [(row["endpoint"], row["success_rate"]) for row in report["endpoints"]] == [("ep-1", 100.0), ("ep-2", 0.0)]
+        assert report["failures"][0]["failed"] == 1
+
+        table = runner.invoke(cli_app, ["webhooks", "stats", "--endpoint-id", "ep-2", "--interval", "hour"])
+        assert table.exit_code == 0, table.output
+        assert "By endpoint" in table.output and "503" in table.output
+
+    def test_stats_rejects_bad_interval(self, runner, cli_app, mock_polar):
+        result = runner.invoke(cli_app, ["webhooks", "stats", "--interval", "minute"])
+        assert result.exit_code == 1
+
 
 # --- Checkout links ---
 
@@ -1,11 +1,16 @@
 """Tests for special operations: export, state, ingest, names, metrics, etc.
 
-Covers: customers export/state, events ingest/names, metrics get/limits,
+Covers: customers export/state, events ingest/names/tail/export/stats, metrics get/limits,
 orders export/generate-invoice/update, subscriptions create/export.
 """
 
+import json
+from datetime import UTC, datetime
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
+from polar_cli.config import Environment
+from polar_cli.spool import event_spool
 from tests.conftest import make_direct_list_result, make_list_result
 
 
@@ -50,6 +55,94 @@ class TestEventsIngest:
         assert result.exit_code == 0
         assert "Ingested 3 event(s)" in result.output
 
+    def test_ingest_from_file_in_batches(self, runner, cli_app, mock_polar, tmp_path):
+        path = tmp_path / "events.ndjson"
+        path.write_text("".join(f'{{"name": "e{i}"}}\n' for i in range(5)))
+        result = runner.invoke(cli_app, ["events", "ingest", "--file", str(path), "--batch-size", "2"])
+        assert result.exit_code == 0
+        assert "Ingested 5 event(s)" in result.output
+        assert mock_polar.events.ingest.call_count == 3
+
+    def test_ingest_from_stdin(self, runner, cli_app, mock_polar):
+        result = runner.invoke(cli_app, ["events", "ingest", "-f", "-"], input='{"name": "a"}\n{"name": "b"}\n')
+        assert result.exit_code == 0
+        assert "Ingested 2 event(s)" in result.output
+
+    def test_ingest_failure_leaves_spool_for_flush(self, runner, cli_app, mock_polar, tmp_path, tmp_spool):
+        path = tmp_path / "events.ndjson"
+        path.write_text('{"name": "a"}\n')
+        mock_polar.events.ingest.side_effect = ValueError("rejected")
+        result = runner.invoke(cli_app, ["events", "ingest", "--file", str(path)])
+        assert result.exit_code == 1
+        assert "polar events flush" in result.output
+
+        mock_polar.events.ingest.side_effect = None
+        result = runner.invoke(cli_app, ["events", "flush"])
+        assert result.exit_code == 0
+        assert "Flushed 1 event(s)" in result.output
+        assert not list(tmp_spool.rglob("*.ndjson"))
+
+    def test_flush_refuses_while_spool_is_in_use(self, runner, cli_app, mock_polar, tmp_path):
+        path = tmp_path / "events.ndjson"
+        path.write_text('{"name": "a"}\n')
+        mock_polar.events.ingest.side_effect = ValueError("rejected")
+        result = runner.invoke(cli_app, ["events", "ingest", "--file", str(path), "--org", "org-1"])
+        assert "polar events flush --org org-1" in result.output
+
+        mock_polar.events.ingest.side_effect = None
+        assert "Spool is empty" in runner.invoke(cli_app, ["events", "flush", "--org", "org-2"]).output
+        spool = event_spool(Environment.PRODUCTION, "org-1")
+        with spool.lock(exclusive=False):
+            result = runner.invoke(cli_app, ["events", "flush", "--org", "org-1"])
+        assert result.exit_code == 1
+        assert "in use" in result.output
+        assert mock_polar.events.ingest.call_count == 1
+
+    def test_ingest_dedup_skips_rerun(self, runner, cli_app, mock_polar, tmp_path):
+        path = tmp_path / "events.ndjson"
+        path.write_text('{"name": "a", "external_id": "1"}\n{"name": "b", "external_id": "2"}\n')
+        args = ["events", "ingest", "--file", str(path), "--dedup", "--dedup-capacity", "1000"]
+        assert runner.invoke(cli_app, args).exit_code == 0
+        result = runner.invoke(cli_app, args)
+        assert result.exit_code == 0
+        assert "Skipped 2 duplicate event(s)" in result.output
+        assert mock_polar.events.ingest.call_count == 1
+
+    def test_ingest_dedup_is_per_organization(self, runner, cli_app, mock_polar, tmp_path):
+        path = tmp_path / "events.ndjson"
+        path.write_text('{"name": "a", "external_id": "1"}\n')
+        args = ["events", "ingest", "--file", str(path), "--dedup", "--dedup-capacity", "1000"]
+        assert runner.invoke(cli_app, args + ["--org", "org-1"]).exit_code == 0
+        result = runner.invoke(cli_app, args + ["--org", "org-2"])
+        assert result.exit_code == 0
+        assert "Skipped" not in result.output
+        assert mock_polar.events.ingest.call_count == 2
+
+        result = runner.invoke(cli_app, ["events", "ingest", "--file", str(path), "--dedup", "--org", "org-1"])
+        assert "Skipped 1 duplicate event(s)" in result.output
+        assert mock_polar.events.ingest.call_count == 2
+
+    def test_ingest_dedup_refuses_full_filter(self, runner, cli_app, mock_polar, tmp_path):
+        path = tmp_path / "events.ndjson"
+        path.write_text('{"name": "a", "external_id": "1"}\n{"name": "b", "external_id": "2"}\n')
+        args = ["events", "ingest", "--file", str(path), "--dedup", "--dedup-capacity", "2"]
+        result = runner.invoke(cli_app, args)
+        assert result.exit_code == 0
+        assert "dedup filter holds 2 keys" in result.output
+
+        result = runner.invoke(cli_app, ["events", "ingest", "--file", str(path), "--dedup"])
+        assert result.exit_code != 0
+        assert "dedup filter is full" in result.output
+        assert mock_polar.events.ingest.call_count == 1
+
+        result = runner.invoke(cli_app, args[:-1] + ["10", "--dedup-rebuild"])
+        assert result.exit_code == 0
+        assert "Skipped 2 duplicate event(s)" in result.output
+
+    def test_ingest_requires_input(self, runner, cli_app, mock_polar):
+        result = runner.invoke(cli_app, ["events", "ingest"])
+        assert result.exit_code == 1
+
 
 class TestEventsNames:
     def test_names(self, runner, cli_app, mock_polar, mocker):
@@ -62,6 +155,117 @@ class TestEventsNames:
         assert result.exit_code == 0
 
 
+class TestEventsTail:
+    def test_tail_prints_ndjson_oldest_first(self, runner, cli_app, mock_polar, mocker):
+        events = []
+        for i in range(2):
+            event = MagicMock(id=f"evt-{i}", timestamp=datetime(2024, 1, 1, 0, 0, i))
+            event.model_dump.return_value = {"id": f"evt-{i}"}
+            events.append(event)
+        mock_polar.events.list.return_value = SimpleNamespace(items=list(reversed(events)))
+        mocker.patch("polar_cli.commands.events.resolve_org_id", return_value="org-1")
+        result = runner.invoke(cli_app, ["-o", "json", "events", "tail", "-n", "2"])
+        assert result.exit_code == 0
+        assert [json.loads(line)["id"] for line in result.output.splitlines()] == ["evt-0", "evt-1"]
+        assert mock_polar.events.list.call_args.kwargs["sorting"] == ["-timestamp"]
+
+    def test_follow_counts_printed_events_past_the_seen_cap(self, runner, cli_app, mock_polar, mocker):
+        events = []
+        for i in range(3):
+            event = MagicMock(id=f"evt-{i}", timestamp=datetime(2024, 1, 1, 0, 0, i))
+            event.model_dump.return_value = {"id": f"evt-{i}"}
+            events.append(event)
+        mock_polar.events.list.side_effect = [SimpleNamespace(items=list(reversed(events))), KeyboardInterrupt]
+        mocker.patch("polar_cli.tail.SEEN_CAPACITY", 1)
+        mocker.patch("polar_cli.commands.events.resolve_org_id", return_value="org-1")
+        result = runner.invoke(cli_app, ["-o", "json", "events", "tail", "-F", "--min-interval", "0"])
+        assert result.exit_code == 0
+        assert "Stopped after 3 event(s)" in result.output
+
+
+class TestEventsExport:
+    def _events(self, mock_polar, mocker):
+        events = []
+        for i, day in enumerate(["01", "01", "02"]):
+            event = MagicMock()
+            event.model_dump.return_value = {
+                "id": f"evt-{i}", "name": "api_call", "customer_id": "c1",
+                "timestamp": f"2024-01-{day}T00:00:00Z", "metadata": {"tokens": i + 1},
+            }
+            events.append(event)
+        mock_polar.events.list.return_value = SimpleNamespace(items=events, pagination=SimpleNamespace(max_page=1))
+        mocker.patch("polar_cli.commands.events.resolve_org_id", return_value="org-1")
+
+    def test_export_ndjson(self, runner, cli_app, mock_polar, mocker, tmp_path):
+        self._events(mock_polar, mocker)
+        out = tmp_path / "events.ndjson"
+        result = runner.invoke(cli_app, ["events", "export", "--file", str(out)])
+        assert result.exit_code == 0
+        assert [json.loads(line)["id"] for line in out.read_text().splitlines()] == ["evt-0", "evt-1", "evt-2"]
+        assert mock_polar.events.list.call_args.kwargs["sorting"] == ["timestamp"]
+
+    def test_export_store_then_stats(self, runner, cli_app, mock_polar, mocker, tmp_path):
+        self._events(mock_polar, mocker)
+        store = tmp_path / "store"
+        assert runner.invoke(cli_app, ["events", "export", "--store", str(store)]).exit_code == 0
+        result = runner.invoke(cli_app, ["-o", "json", "events", "stats", "--store", str(store), "--by", "day", "--sum", "tokens"])
+        assert result.exit_code == 0
+        rows = json.loads(result.output)
+        assert [(r["events"], r["sum"]) for r in rows] == [(2, 3.0), (1, 3.0)]
+
+    def test_sharded_export_to_store(self, runner, cli_app, mock_polar, mocker, tmp_path):
+        self._events(mock_polar, mocker)
+        events = mock_polar.events.list.return_value.items
+
+        def list_events(start_timestamp, end_timestamp, **kwargs):
+            items = [
+                e for e in events
+                if start_timestamp <= datetime.fromisoformat(e.model_dump()["timestamp"]) <= end_timestamp
+            ]
+            return SimpleNamespace(items=items, pagination=SimpleNamespace(max_page=1))
+
+        mock_polar.events.list.side_effect = list_events
+        store = tmp_path / "store"
+        result = runner.invoke(cli_app, [
+            "events", "export", "--store", str(store), "--shards", "3",
+            "--start", "2024-01-01T00:00:00Z", "--end", "2024-01-03T00:00:00Z",
+        ])
+        assert result.exit_code == 0
+        assert "Exported 3 event(s)" in result.output
+        assert json.loads((store / "store.json").read_text())["rows"] == 3
+        assert not list((tmp_path / "exports").iterdir())
+
+    def test_open_ended_sharded_export_resumes(self, runner, cli_app, mock_polar, mocker, tmp_path):
+        mocker.patch("polar_cli.bulk.time.sleep")
+        self._events(mock_polar, mocker)
+        events = mock_polar.events.list.return_value.items
+        calls = []
+        fail_once = {"last shard": True}
+
+        def list_events(start_timestamp, end_timestamp, **kwargs):
+            calls.append(start_timestamp)
+            if start_timestamp > datetime(2025, 6, 1, tzinfo=UTC) and fail_once.pop("last shard", False):
+                raise ValueError("boom")
+            items = [
+                e for e in events
+                if start_timestamp <= datetime.fromisoformat(e.model_dump()["timestamp"]) <= end_timestamp
+            ]
+            return SimpleNamespace(items=items, pagination=SimpleNamespace(max_page=1))
+
+        mock_polar.events.list.side_effect = list_events
+        store = tmp_path / "store"
+        args = ["events", "export", "--store", str(store), "--shards", "3", "--start", "2024-01-01T00:00:00Z"]
+        assert runner.invoke(cli_app, args).exit_code != 0
+        assert len(list((tmp_path / "exports").iterdir())) == 1
+
+        calls.clear()
+        result = runner.invoke(cli_app, args)
+        assert result.exit_code == 0, result.output
+        # Only the failed shard is fetched again
+        assert len(calls) == 1
+        assert json.loads((store / "store.json").read_text())["rows"] == 3
+        assert not list((tmp_path / "exports").iterdir())
+
 # --- metrics: get, limits ---
 
 
@@ -12,6 +12,23 @@ from polar_cli.config import OutputFormat
 from polar_cli.context import CliContext, Environment
 
 
+@pytest.fixture(autouse=True)
+def tmp_id_index(tmp_path, monkeypatch):
+    """Keep the local ID index out of the user's cache directory."""
+    monkeypatch.setattr("polar_cli.id_index.INDEX_DIR", tmp_path / "ids")
+    return tmp_path / "ids"
+
+
+@pytest.fixture(autouse=True)
+def tmp_spool(tmp_path, monkeypatch):
+    """Keep the ingestion spool, dedup state, export and upload checkpoints out of the user's data directory."""
+    monkeypatch.setattr("polar_cli.spool.SPOOL_DIR", tmp_path / "spool")
+    monkeypatch.setattr("polar_cli.dedup.DEDUP_DIR", tmp_path / "dedup")
+    monkeypatch.setattr("polar_cli.export.EXPORT_DIR", tmp_path / "exports")
+    monkeypatch.setattr("polar_cli.upload.UPLOAD_DIR", tmp_path / "uploads")
+    return tmp_path / "spool"
+
+
 @pytest.fixture
 def runner():
     return CliRunner()
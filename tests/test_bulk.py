@@ -0,0 +1,63 @@
+"""Tests for bulk helpers."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from polar_cli.bulk import RateLimiter, read_ids, run_concurrently
+from polar_cli.errors import CLIError
+
+
+class TestRunConcurrently:
+    def test_preserves_input_order(self):
+        def slow_for_small(n: int) -> int:
+            time.sleep(0.01 * (5 - n))
+            return n * 10
+
+        outcomes = list(run_concurrently(slow_for_small, range(5), concurrency=5))
+        assert [o.value for o in outcomes] == [0, 10, 20, 30, 40]
+
+    def test_captures_errors_per_item(self):
+        def fail_on_two(n: int) -> int:
+            if n == 2:
+                raise ValueError("boom")
+            return n
+
+        outcomes = list(run_concurrently(fail_on_two, [1, 2, 3], concurrency=2))
+        assert [o.ok for o in outcomes] == [True, False, True]
+        assert str(outcomes[1].error) == "boom"
+
+
+class TestReadIds:
+    def test_args_and_file(self, tmp_path):
+        ids_file = tmp_path / "ids.txt"
+        ids_file.write_text("b\n\n# comment\nc\n")
+        assert read_ids(["a"], str(ids_file)) == ["a", "b", "c"]
+
+    def test_nothing_given(self):
+        with pytest.raises(CLIError):
+            read_ids(None, None)
+
+
+class TestRateLimiter:
+    def test_spaces_calls(self):
+        now = [0.0]
+        sleeps: list[float] = []
+
+        def sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+
+        limiter = RateLimiter(4, clock=lambda: now[0], sleep=sleep)
+        for _ in range(3):
+            limiter.wait()
+        assert sleeps == [0.25, 0.5]
+        now[0] = 10.0
+        limiter.wait()
+        assert len(sleeps) == 2
+
+    def test_zero_rate_is_unlimited(self):
+        limiter = RateLimiter(0, sleep=lambda s: pytest.fail("slept"))
+        limiter.wait()
+        limiter.wait()
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import gzip
 from unittest.mock import MagicMock
 
+import httpx
 import pytest
 import typer
 
-from polar_cli.client import SERVER_URLS, get_base_url, get_client, require_token
+from polar_cli.client import SERVER_URLS, GzipRequestTransport, get_base_url, get_client, require_token
 from polar_cli.config import Environment, OutputFormat
 from polar_cli.context import CliContext
 
@@ -59,6 +61,46 @@ class TestGetClient:
         with pytest.raises(typer.Exit):
             get_client(ctx)
 
+    def test_compress_uses_gzip_transport(self, mocker):
+        mocker.patch("polar_cli.client.get_token", return_value="tok")
+        mock_polar = mocker.patch("polar_cli.client.Polar")
+
+        get_client(_make_ctx(), compress=True)
+        client = mock_polar.call_args.kwargs["client"]
+        assert isinstance(client._transport, GzipRequestTransport)
+        assert client.headers["Accept-Encoding"] == "gzip, deflate"
+
+
+class TestGzipRequestTransport:
+    def _send(self, body: bytes, **headers: str) -> httpx.Request:
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200)
+
+        transport = GzipRequestTransport(httpx.MockTransport(handler), min_bytes=1024)
+        with httpx.Client(transport=transport) as client:
+            client.post("https://api.polar.sh/v1/events/ingest", content=body, headers=headers)
+        return seen[0]
+
+    def test_compresses_large_bodies(self):
+        body = b'{"name": "api_call"},' * 1000
+        request = self._send(body)
+        assert request.headers["Content-Encoding"] == "gzip"
+        assert int(request.headers["Content-Length"]) == len(request.content) < len(body)
+        assert gzip.decompress(request.content) == body
+
+    def test_leaves_small_bodies(self):
+        request = self._send(b'{"name": "api_call"}')
+        assert "Content-Encoding" not in request.headers
+        assert request.content == b'{"name": "api_call"}'
+
+    def test_leaves_already_encoded_bodies(self):
+        body = gzip.compress(b"x" * 4096)
+        request = self._send(body, **{"Content-Encoding": "gzip"})
+        assert request.content == body
+
 
 class TestGetBaseUrl:
     def test_production(self):
@@ -73,6 +115,10 @@ class TestGetBaseUrl:
         ctx = _make_ctx(base_url="https://custom.polar.sh/")
         assert get_base_url(ctx) == "https://custom.polar.sh"
 
+    def test_other_environment_ignores_custom_base_url(self):
+        ctx = _make_ctx(Environment.PRODUCTION, base_url="https://custom.polar.sh")
+        assert get_base_url(ctx, Environment.SANDBOX) == "https://sandbox-api.polar.sh"
+
 
 class TestRequireToken:
     def test_returns_token(self, mocker):
@@ -80,6 +126,11 @@ class TestRequireToken:
         ctx = _make_ctx()
         assert require_token(ctx) == "my-token"
 
+    def test_other_environment(self, mocker):
+        get_token = mocker.patch("polar_cli.client.get_token", return_value="sandbox-token")
+        assert require_token(_make_ctx(), Environment.SANDBOX) == "sandbox-token"
+        get_token.assert_called_once_with(Environment.SANDBOX)
+
     def test_exits_when_no_token(self, mocker):
         mocker.patch("polar_cli.client.get_token", return_value=None)
         ctx = _make_ctx()
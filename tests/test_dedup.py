@@ -0,0 +1,98 @@
+"""Tests for event deduplication."""
+
+from __future__ import annotations
+
+import pytest
+
+from polar_cli.dedup import BloomFilter, EventDeduper, bloom_parameters, event_key
+from polar_cli.errors import CLIError
+
+
+class TestEventKey:
+    def test_external_id_wins(self):
+        assert event_key({"external_id": "e-1", "name": "a"}) == event_key({"external_id": "e-1", "name": "b"})
+
+    def test_content_hash_ignores_key_order(self):
+        assert event_key({"name": "a", "n": 1}) == event_key({"n": 1, "name": "a"})
+        assert event_key({"name": "a"}) != event_key({"name": "b"})
+
+
+class TestBloomFilter:
+    def test_parameters(self):
+        bits, hashes = bloom_parameters(1_000_000, 0.01)
+        assert 9_500_000 < bits < 9_700_000
+        assert hashes == 7
+
+    def test_persists_across_instances(self, tmp_path):
+        bloom = BloomFilter(tmp_path / "bloom.bin", 1000, 0.01)
+        bloom.add(event_key({"name": "a"}))
+        bloom.close()
+        bloom = BloomFilter(tmp_path / "bloom.bin", 1000, 0.01)
+        assert event_key({"name": "a"}) in bloom
+        assert event_key({"name": "b"}) not in bloom
+        bloom.close()
+
+    def test_counts_distinct_inserts_in_header(self, tmp_path):
+        bloom = BloomFilter(tmp_path / "bloom.bin", 1000, 0.01)
+        bloom.add(event_key({"name": "a"}))
+        bloom.add(event_key({"name": "a"}))
+        bloom.add(event_key({"name": "b"}))
+        bloom.close()
+        bloom = BloomFilter(tmp_path / "bloom.bin", 50, 0.01)
+        assert (bloom.count, bloom.capacity) == (2, 1000)
+        bloom.close()
+
+    def test_false_positive_rate_is_bounded(self, tmp_path):
+        bloom = BloomFilter(tmp_path / "bloom.bin", 5000, 0.01)
+        for i in range(5000):
+            bloom.add(event_key({"n": i}))
+        false_positives = sum(event_key({"m": i}) in bloom for i in range(5000))
+        bloom.close()
+        assert false_positives < 150
+
+
+class TestEventDeduper:
+    def test_rerun_skips_acknowledged_events(self, tmp_path):
+        events = [{"name": "a"}, {"name": "b"}, {"name": "a"}]
+        with EventDeduper(tmp_path, capacity=1000) as dedup:
+            fresh = list(dedup.filter(events))
+            assert fresh == [{"name": "a"}, {"name": "b"}]
+            dedup.commit(fresh[:1])
+
+        with EventDeduper(tmp_path, capacity=1000) as dedup:
+            assert list(dedup.filter(events)) == [{"name": "b"}]
+            assert dedup.stats.exact == 2
+
+    def test_window_overflow_falls_back_to_filter(self, tmp_path):
+        with EventDeduper(tmp_path, capacity=1000, window=1) as dedup:
+            dedup.commit([{"name": "a"}, {"name": "b"}])
+        with EventDeduper(tmp_path, capacity=1000, window=1) as dedup:
+            assert list(dedup.filter([{"name": "a"}, {"name": "b"}])) == []
+            assert dedup.stats.probable == 1
+            assert dedup.stats.exact == 1
+
+    def test_refuses_a_full_filter_until_rebuilt(self, tmp_path):
+        with EventDeduper(tmp_path, capacity=2) as dedup:
+            dedup.commit([{"name": "a"}, {"name": "b"}])
+        with pytest.raises(CLIError) as exc:
+            EventDeduper(tmp_path)
+        assert "--dedup-rebuild" in exc.value.hint
+        with EventDeduper(tmp_path, capacity=100, rebuild=True) as dedup:
+            assert dedup.bloom.capacity == 100
+            # The recent window survives the rebuild
+            assert list(dedup.filter([{"name": "a"}, {"name": "c"}])) == [{"name": "c"}]
+
+    def test_larger_capacity_requires_rebuild(self, tmp_path):
+        EventDeduper(tmp_path, capacity=10).close()
+        with pytest.raises(CLIError):
+            EventDeduper(tmp_path, capacity=1000)
+
+    def test_filter_filling_mid_run_stops_probable_skips(self, tmp_path):
+        with EventDeduper(tmp_path, capacity=2, window=1) as dedup:
+            dedup.commit([{"name": "a"}])
+        with EventDeduper(tmp_path, window=1) as dedup:
+            dedup.commit([{"name": "b"}])
+            assert dedup.bloom.full
+            assert "is full" in dedup.fill_warning()
+            # "a" is only in the filter, which no longer vouches for duplicates
+            assert list(dedup.filter([{"name": "a"}, {"name": "b"}])) == [{"name": "a"}]
@@ -0,0 +1,42 @@
+"""Tests for webhook delivery aggregation."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from polar_cli.delivery_stats import DeliveryStats
+
+
+def _delivery(succeeded: bool, code: int | None, event_type: str, created: str):
+    return SimpleNamespace(
+        succeeded=succeeded,
+        http_code=code,
+        created_at=datetime.fromisoformat(created).replace(tzinfo=UTC),
+        webhook_event=SimpleNamespace(type=event_type),
+    )
+
+
+def test_aggregates_in_one_pass():
+    stats = DeliveryStats("day")
+    stats.add("ep-1", _delivery(True, 200, "order.created", "2024-05-01T10:00"))
+    stats.add("ep-1", _delivery(False, 500, "order.created", "2024-05-01T11:00"))
+    stats.add("ep-2", _delivery(False, None, "refund.created", "2024-05-02T09:00"))
+    stats.add("ep-2", _delivery(True, 200, "order.created", "2024-05-02T09:30"))
+    report = stats.to_dict({"ep-1": "https://a"})
+
+    assert report["total"] == {"deliveries": 4, "succeeded": 2, "failed": 2, "success_rate": 50.0}
+    [ep1, ep2] = report["endpoints"]
+    assert ep1["url"] == "https://a" and ep1["failed"] == 1
+    assert ep2["url"] is None
+    assert report["event_types"][0] == {
+        "type": "order.created", "deliveries": 3, "succeeded": 2, "failed": 1, "success_rate": 66.67,
+    }
+    assert {row["code"]: row["deliveries"] for row in report["http_codes"]} == {"200": 2, "500": 1, "none": 1}
+    assert [(row["bucket"][:10], row["failed"]) for row in report["failures"]] == [
+        ("2024-05-01", 1), ("2024-05-02", 1),
+    ]
+
+
+def test_empty():
+    report = DeliveryStats().to_dict()
+    assert report["total"]["success_rate"] is None
+    assert report["http_codes"] == []
@@ -0,0 +1,98 @@
+"""Tests for the columnar event store."""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime
+
+import pytest
+
+from polar_cli.errors import CLIError
+from polar_cli.event_store import EventStore, EventStoreWriter, stats_by_code, stats_by_time
+
+EVENTS = [
+    {"name": "api_call", "timestamp": "2024-01-01T10:00:00Z", "customer_id": "c1", "metadata": {"tokens": 10}},
+    {"name": "api_call", "timestamp": "2024-01-01T11:00:00Z", "customer_id": "c2", "metadata": {"tokens": 5, "model": "small"}},
+    {"name": "signup", "timestamp": "2024-01-02T09:00:00Z", "external_customer_id": "ext-3"},
+    {"name": "api_call", "timestamp": "2024-01-03T00:00:00Z", "customer_id": "c1", "metadata": {"tokens": 7}},
+]
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    with EventStoreWriter(tmp_path / "store") as writer:
+        writer.append(EVENTS[:2])
+        writer.flush()
+        writer.append(EVENTS[2:])
+    return tmp_path / "store"
+
+
+class TestEventStore:
+    def test_columns_round_trip(self, store_dir):
+        with EventStore(store_dir) as store:
+            assert store.rows == 4
+            assert [store.names[c] for c in store.name_codes] == ["api_call", "api_call", "signup", "api_call"]
+            assert [store.customers[c] for c in store.customer_codes] == ["c1", "c2", "ext-3", "c1"]
+            tokens = list(store.metadata_values("tokens"))
+            assert tokens[:2] == [10.0, 5.0] and math.isnan(tokens[2]) and tokens[3] == 7.0
+
+    def test_new_metadata_key_is_backfilled(self, store_dir):
+        with EventStoreWriter(store_dir) as writer:
+            writer.append([{"name": "x", "timestamp": "2024-01-04T00:00:00Z", "metadata": {"cost": 1.5}}])
+        with EventStore(store_dir) as store:
+            cost = list(store.metadata_values("metadata.cost"))
+            assert len(cost) == 5 and cost[-1] == 1.5 and all(math.isnan(v) for v in cost[:-1])
+
+    def test_uncommitted_rows_are_truncated(self, store_dir):
+        with open(store_dir / "timestamp.i64", "ab") as f:
+            f.write(b"\0" * 8)
+        with EventStoreWriter(store_dir) as writer:
+            writer.append([{"name": "x", "timestamp": "2024-01-04T00:00:00Z"}])
+        with EventStore(store_dir) as store:
+            assert store.rows == 5
+            assert len(store.timestamps) == 5
+
+    def test_truncate_to_rolls_back_rows(self, store_dir):
+        with EventStoreWriter(store_dir, truncate_to=2) as writer:
+            writer.append([{"name": "x", "timestamp": "2024-01-01T12:00:00Z"}])
+        with EventStore(store_dir) as store:
+            assert store.rows == 3
+            assert store.meta["sorted"]
+            assert [store.names[c] for c in store.name_codes] == ["api_call", "api_call", "x"]
+
+    def test_missing_store(self, tmp_path):
+        with pytest.raises(CLIError, match="No event store"):
+            EventStore(tmp_path)
+
+
+class TestStats:
+    def test_by_name_with_sum(self, store_dir):
+        with EventStore(store_dir) as store:
+            rows = stats_by_code(store, "name", sum_key="tokens")
+        assert [(r.group, r.events, r.sum) for r in rows] == [("api_call", 3, 22.0), ("signup", 1, 0.0)]
+
+    def test_by_customer_filtered_by_name(self, store_dir):
+        with EventStore(store_dir) as store:
+            rows = stats_by_code(store, "customer", name="api_call")
+        assert [(r.group, r.events) for r in rows] == [("c1", 2), ("c2", 1)]
+
+    def test_by_day(self, store_dir):
+        with EventStore(store_dir) as store:
+            rows = stats_by_time(store, "day", sum_key="tokens")
+        assert [(r.group[:10], r.events, r.sum) for r in rows] == [
+            ("2024-01-01", 2, 15.0), ("2024-01-02", 1, 0.0), ("2024-01-03", 1, 7.0),
+        ]
+
+    def test_time_range(self, store_dir):
+        with EventStore(store_dir) as store:
+            rows = stats_by_time(
+                store, "day", name="api_call",
+                start=datetime.fromisoformat("2024-01-01T11:00:00Z"), end=datetime.fromisoformat("2024-01-03T00:00:00Z"),
+            )
+        assert [(r.group[:10], r.events) for r in rows] == [("2024-01-01", 1), ("2024-01-02", 0)]
+
+    def test_out_of_order_store_rejects_time_buckets(self, tmp_path):
+        with EventStoreWriter(tmp_path) as writer:
+            writer.append(list(reversed(EVENTS)))
+        with EventStore(tmp_path) as store, pytest.raises(CLIError, match="time order"):
+            stats_by_time(store, "day")
@@ -0,0 +1,84 @@
+"""Tests for sharded event export."""
+
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from polar_cli.export import checkpoint_dir, export_shards, plan_shards
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _event(i: int) -> MagicMock:
+    event = MagicMock()
+    event.model_dump.return_value = {"id": f"evt-{i}", "timestamp": (START + timedelta(hours=i)).isoformat()}
+    return event
+
+
+class FakeEvents:
+    """In-memory events.list honoring time bounds, sorting and pagination."""
+
+    def __init__(self, count: int, fail_pages: set[tuple[datetime, int]] | None = None) -> None:
+        self.events = [_event(i) for i in range(count)]
+        self.fail_pages = fail_pages or set()
+        self.calls = 0
+
+    def list(self, *, start_timestamp, end_timestamp, page, limit, sorting, **filters):
+        self.calls += 1
+        if (start_timestamp, page) in self.fail_pages:
+            self.fail_pages.discard((start_timestamp, page))
+            raise ValueError("boom")
+        matching = [
+            e for e in self.events
+            if start_timestamp <= datetime.fromisoformat(e.model_dump()["timestamp"]) <= end_timestamp
+        ]
+        items = matching[(page - 1) * limit: page * limit]
+        return SimpleNamespace(items=items, pagination=SimpleNamespace(max_page=max(1, -(-len(matching) // limit))))
+
+
+def _ids(parts) -> list[str]:
+    return [json.loads(line)["id"] for _, checkpoint in parts for line in checkpoint.part.read_text().splitlines()]
+
+
+class TestPlanShards:
+    def test_equal_consecutive_ranges(self):
+        shards = plan_shards(START, START + timedelta(days=4), 4)
+        assert [s.start.day for s in shards] == [1, 2, 3, 4]
+        assert all(a.end == b.start for a, b in zip(shards, shards[1:]))
+        assert shards[-1].end == START + timedelta(days=4)
+
+
+class TestExportShards:
+    def test_merges_in_timestamp_order_without_boundary_duplicates(self, tmp_path, mocker):
+        mocker.patch("polar_cli.export.PAGE_LIMIT", 5)
+        client = SimpleNamespace(events=FakeEvents(48))
+        shards = plan_shards(START, START + timedelta(hours=48), 4)
+        ids = _ids(export_shards(client, shards, tmp_path, {}, concurrency=4))
+        assert ids == [f"evt-{i}" for i in range(48)]
+
+    def test_resumes_from_checkpoint(self, tmp_path, mocker):
+        mocker.patch("polar_cli.export.PAGE_LIMIT", 5)
+        shards = plan_shards(START, START + timedelta(hours=48), 2)
+        failing = shards[1].start - timedelta(seconds=1)
+        events = FakeEvents(48, fail_pages={(failing, 2)})
+        client = SimpleNamespace(events=events)
+
+        with pytest.raises(ValueError):
+            list(export_shards(client, shards, tmp_path, {}, concurrency=2))
+        calls_before = events.calls
+        ids = _ids(export_shards(client, shards, tmp_path, {}, concurrency=2))
+        assert ids == [f"evt-{i}" for i in range(48)]
+        # Shard 0 was complete and shard 1 restarts at its second page
+        assert events.calls - calls_before == 4
+
+
+class TestCheckpointDir:
+    def test_depends_on_parameters(self):
+        end = START + timedelta(days=1)
+        assert checkpoint_dir({"organization_id": "o"}, START, end, 4) == checkpoint_dir({"organization_id": "o"}, START, end, 4)
+        assert checkpoint_dir({"organization_id": "o"}, START, end, 4) != checkpoint_dir({"organization_id": "o"}, START, end, 8)
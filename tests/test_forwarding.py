@@ -0,0 +1,258 @@
+"""Tests for queued webhook forwarding."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from polar_cli.errors import CLIError
+from polar_cli.forwarding import (
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    Forwarder,
+    ForwardResult,
+    ForwardRouter,
+    RetryQueue,
+    Route,
+    build_forward_request,
+    ordering_key,
+    parse_route,
+)
+from polar_cli.spool import Spool
+
+
+def _event(resource: str, seq: int) -> dict[str, object]:
+    return {
+        "key": "webhook.created",
+        "headers": {"webhook-id": f"msg-{seq}"},
+        "payload": {"payload": {"type": "order.updated", "data": {"id": resource, "seq": seq}}},
+    }
+
+
+def _client(handler) -> httpx.Client:
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+class TestBuildForwardRequest:
+    def test_unwraps_payload_and_keeps_headers(self):
+        body, headers = build_forward_request(_event("ord-1", 1))
+        assert json.loads(body)["data"]["id"] == "ord-1"
+        assert headers["webhook-id"] == "msg-1"
+        assert headers["content-type"] == "application/json"
+
+    def test_ordering_key_is_resource_id(self):
+        assert ordering_key(_event("ord-1", 1)) == "ord-1"
+
+
+class TestForwarder:
+    def test_forwards_all_events(self):
+        received: list[int] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            received.append(json.loads(request.content)["data"]["seq"])
+            return httpx.Response(200)
+
+        with Forwarder("http://localhost/hook", concurrency=3, http_client=_client(handler)) as forwarder:
+            for seq in range(20):
+                assert forwarder.submit(_event(f"r{seq}", seq))
+        assert sorted(received) == list(range(20))
+        assert forwarder.stats.forwarded == 20
+
+    def test_ordered_keeps_per_resource_order(self):
+        received: dict[str, list[int]] = {}
+        lock = threading.Lock()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            data = json.loads(request.content)["data"]
+            time.sleep(0.001 * (data["seq"] % 3))
+            with lock:
+                received.setdefault(data["id"], []).append(data["seq"])
+            return httpx.Response(200)
+
+        with Forwarder("http://localhost/hook", concurrency=4, ordered=True, http_client=_client(handler)) as forwarder:
+            for seq in range(40):
+                forwarder.submit(_event(f"r{seq % 5}", seq))
+        for seqs in received.values():
+            assert seqs == sorted(seqs)
+
+    def test_submit_never_blocks_on_slow_handler(self):
+        release = threading.Event()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            release.wait(5)
+            return httpx.Response(200)
+
+        forwarder = Forwarder("http://localhost/hook", concurrency=1, queue_size=2, http_client=_client(handler))
+        started = time.monotonic()
+        accepted = [forwarder.submit(_event("r", seq)) for seq in range(10)]
+        assert time.monotonic() - started < 1
+        assert accepted.count(False) >= 7
+        assert forwarder.stats.dropped == accepted.count(False)
+        release.set()
+        forwarder.close()
+        assert forwarder.stats.forwarded == accepted.count(True)
+
+    def test_failures_are_reported(self):
+        results = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused")
+
+        with Forwarder("http://localhost/hook", http_client=_client(handler), on_result=results.append) as forwarder:
+            forwarder.submit(_event("r", 1))
+        assert forwarder.stats.failed == 1
+        assert isinstance(results[0].error, httpx.ConnectError)
+
+
+class TestRouting:
+    def test_parse_route(self):
+        assert parse_route("http://a/hook") == Route("http://a/hook")
+        assert parse_route("http://a/hook#order.*, refund.created").event_types == ("order.*", "refund.created")
+
+    def test_parse_route_rejects_non_url(self):
+        with pytest.raises(CLIError):
+            parse_route("localhost:3000")
+
+    def test_route_matches_wildcards(self):
+        route = Route("http://a", ("order.*",))
+        assert route.matches(_event("ord-1", 1))
+        assert not Route("http://a", ("refund.created",)).matches(_event("ord-1", 1))
+        assert Route("http://a").matches({"key": "webhook.created"})
+
+    def test_fans_out_to_matching_routes(self):
+        received: dict[str, list[int]] = {}
+        lock = threading.Lock()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            with lock:
+                received.setdefault(request.url.host, []).append(json.loads(request.content)["data"]["seq"])
+            return httpx.Response(200)
+
+        routes = [Route("http://all"), Route("http://orders", ("order.*",)), Route("http://refunds", ("refund.*",))]
+        with ForwardRouter(routes, http_client=_client(handler)) as router:
+            for seq in range(5):
+                assert router.submit(_event(f"r{seq}", seq)) == []
+        assert sorted(received["all"]) == list(range(5))
+        assert sorted(received["orders"]) == list(range(5))
+        assert "refunds" not in received
+
+    def test_slow_target_does_not_block_others(self):
+        release = threading.Event()
+        fast: list[int] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "slow":
+                release.wait(5)
+            else:
+                fast.append(1)
+            return httpx.Response(200)
+
+        routes = [Route("http://slow"), Route("http://fast")]
+        router = ForwardRouter(routes, concurrency=1, queue_size=2, http_client=_client(handler))
+        dropped = []
+        for seq in range(6):
+            dropped.append(router.submit(_event(f"r{seq}", seq)))
+            deadline = time.monotonic() + 2
+            while len(fast) <= seq and time.monotonic() < deadline:
+                time.sleep(0.005)
+        release.set()
+        router.close()
+        assert len(fast) == 6
+        # Only the slow target overflowed
+        assert {route.url for routes_dropped in dropped for route in routes_dropped} == {"http://slow"}
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _retry_queue(tmp_path, handler, clock, **kwargs) -> RetryQueue:
+    return RetryQueue(
+        "http://local/hook",
+        Spool(tmp_path / "retry"),
+        tmp_path / "dead.ndjson",
+        http_client=_client(handler),
+        clock=clock,
+        **kwargs,
+    )
+
+
+class TestRetryQueue:
+    def test_retries_after_backoff_and_recovers(self, tmp_path):
+        clock = Clock()
+        responses = [httpx.Response(200)]
+        retries = _retry_queue(tmp_path, lambda request: responses.pop(0), clock)
+        retries.failed(ForwardResult(_event("r1", 1), 503, 0.01))
+        assert len(retries) == 1
+        assert retries.process_due() == 0  # not due yet
+        clock.now += RETRY_BASE_DELAY
+        assert retries.process_due() == 1
+        assert retries.stats.recovered == 1
+        assert retries.spool.segments() == []
+
+    def test_gives_up_into_dead_letter_and_requeues(self, tmp_path):
+        clock = Clock()
+        retries = _retry_queue(tmp_path, lambda request: httpx.Response(502), clock, max_attempts=3)
+        retries.failed(ForwardResult(_event("r1", 1), None, 0.0, httpx.ConnectError("refused")))
+        for _ in range(3):
+            clock.now += RETRY_MAX_DELAY
+            retries.process_due()
+        assert retries.stats.retried == 2
+        assert retries.stats.dead_lettered == 1
+        [dead] = Spool.read(retries.dead_letter)
+        assert dead["attempts"] == 3
+        assert dead["error"] == "HTTP 502"
+        assert retries.requeue_dead_letters() == 1
+        assert not retries.dead_letter.exists()
+        assert len(retries) == 1
+
+    def test_client_errors_are_not_retried(self, tmp_path):
+        retries = _retry_queue(tmp_path, lambda request: httpx.Response(200), Clock())
+        retries.failed(ForwardResult(_event("r1", 1), 400, 0.01))
+        assert len(retries) == 0
+        assert retries.stats.dead_lettered == 1
+
+    def test_resumes_from_spool(self, tmp_path):
+        clock = Clock()
+        received: list[httpx.Request] = []
+        retries = _retry_queue(tmp_path, received.append, clock)
+        retries.failed(ForwardResult(_event("r1", 1), 500, 0.01))
+        retries.close()
+
+        resumed = _retry_queue(tmp_path, lambda request: received.append(request) or httpx.Response(200), clock)
+        assert len(resumed) == 1
+        clock.now += RETRY_MAX_DELAY
+        resumed.process_due()
+        assert received[0].headers["webhook-id"] == "msg-1"
+
+    def test_one_queue_per_target_at_a_time(self, tmp_path):
+        retries = _retry_queue(tmp_path, lambda request: httpx.Response(200), Clock())
+        with pytest.raises(CLIError, match="already forwarding to http://local/hook"):
+            _retry_queue(tmp_path, lambda request: httpx.Response(200), Clock())
+        retries.close()
+        _retry_queue(tmp_path, lambda request: httpx.Response(200), Clock()).close()
+
+    def test_router_sends_overflow_to_retry_queue(self, tmp_path):
+        release = threading.Event()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            release.wait(5)
+            return httpx.Response(200)
+
+        router = ForwardRouter(
+            [Route("http://slow")], max_attempts=3, concurrency=1, queue_size=1, http_client=_client(handler)
+        )
+        lost = [router.submit(_event(f"r{seq}", seq)) for seq in range(5)]
+        [retries] = router.retry_queues
+        assert lost == [[]] * 5
+        assert len(retries) >= 3
+        release.set()
+        router.close()
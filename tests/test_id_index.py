@@ -0,0 +1,58 @@
+"""Tests for the local ID index."""
+
+from __future__ import annotations
+
+import uuid
+
+from polar_cli import id_index
+from polar_cli.id_index import IdIndex, record_ids
+
+A = "0a1b2c3d-0000-4000-8000-000000000001"
+B = "0a1b2c3d-0000-4000-8000-000000000002"
+C = "ffee0000-0000-4000-8000-000000000003"
+
+
+class TestIdIndex:
+    def test_lookup_unique_prefix(self, tmp_path):
+        index = IdIndex(tmp_path)
+        index.add([A, C])
+        assert index.lookup("ffee") == [C]
+
+    def test_lookup_ambiguous_prefix(self, tmp_path):
+        index = IdIndex(tmp_path)
+        index.add([A, B, C])
+        assert index.lookup("0a1b2c3d") == [A, B]
+        assert index.lookup("0a1b2c3d-0000-4000-8000-000000000002") == [B]
+
+    def test_prefix_too_short_or_not_hex(self, tmp_path):
+        index = IdIndex(tmp_path)
+        index.add([C])
+        assert index.lookup("ffe") == []
+        assert index.lookup("ffzz") == []
+
+    def test_ignores_non_uuids_and_duplicates(self, tmp_path):
+        index = IdIndex(tmp_path)
+        index.add([A, A, "cust-1"])
+        index.add([A])
+        assert len(index) == 1
+
+    def test_compaction_keeps_ids_sorted(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(id_index, "JOURNAL_LIMIT", 8)
+        ids = [str(uuid.uuid4()) for _ in range(50)]
+        index = IdIndex(tmp_path)
+        for i in range(0, 50, 5):
+            index.add(ids[i:i + 5])
+        index.compact()
+        assert not index.journal_path.exists()
+        assert len(index) == 50
+        data = index.base_path.read_bytes()
+        records = [data[i:i + 16] for i in range(0, len(data), 16)]
+        assert records == sorted(records)
+        for id in ids:
+            assert index.lookup(id[:13]) == [id]
+
+
+class TestRecordIds:
+    def test_records_into_default_index(self, tmp_id_index):
+        record_ids([A, None, 42])
+        assert IdIndex(tmp_id_index).lookup("0a1b") == [A]
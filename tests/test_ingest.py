@@ -0,0 +1,49 @@
+"""Tests for streaming event ingestion."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from polar_cli.errors import CLIError
+from polar_cli.ingest import batch_events, ingest_batches, iter_ndjson
+
+
+class TestIterNdjson:
+    def test_skips_blank_lines(self, tmp_path):
+        path = tmp_path / "events.ndjson"
+        path.write_text('{"name": "a"}\n\n{"name": "b"}\n')
+        assert [e["name"] for e in iter_ndjson(str(path))] == ["a", "b"]
+
+    def test_reports_bad_line(self, tmp_path):
+        path = tmp_path / "events.ndjson"
+        path.write_text('{"name": "a"}\nnope\n')
+        with pytest.raises(CLIError, match="line 2"):
+            list(iter_ndjson(str(path)))
+
+
+class TestBatchEvents:
+    def test_limits_by_count(self):
+        batches = list(batch_events(({"n": i} for i in range(5)), max_events=2))
+        assert [len(b) for b in batches] == [2, 2, 1]
+
+    def test_limits_by_size(self):
+        events = [{"name": "x" * 40} for _ in range(4)]
+        batches = list(batch_events(events, max_events=100, max_bytes=120))
+        assert [len(b) for b in batches] == [2, 2]
+
+
+class TestIngestBatches:
+    def test_counts_sent_and_failed(self):
+        client = MagicMock()
+
+        def ingest(request):
+            if request["events"][0]["name"] == "bad":
+                raise ValueError("rejected")
+
+        client.events.ingest.side_effect = ingest
+        stats = ingest_batches(client, [[{"name": "a"}, {"name": "b"}], [{"name": "bad"}]], concurrency=2)
+        assert stats.events == 2
+        assert stats.failed_events == 1
+        assert stats.batches == 2
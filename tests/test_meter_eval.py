@@ -0,0 +1,83 @@
+"""Tests for local meter evaluation."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from polar_cli.errors import CLIError
+from polar_cli.meter_eval import compile_filter, evaluate, next_bucket, truncate
+
+EVENTS = [
+    {"name": "api_call", "timestamp": "2024-01-01T10:15:00Z", "metadata": {"tokens": 10, "model": "gpt-large"}},
+    {"name": "api_call", "timestamp": "2024-01-01T23:59:59Z", "metadata": {"tokens": "5", "model": "gpt-small"}},
+    {"name": "api_call", "timestamp": "2024-01-03T00:00:00+00:00", "metadata": {"tokens": 7, "model": "gpt-large"}},
+    {"name": "signup", "timestamp": "2024-01-02T08:00:00Z", "metadata": {}},
+]
+API_CALLS = {"conjunction": "and", "clauses": [{"property": "name", "operator": "eq", "value": "api_call"}]}
+
+
+class TestCompileFilter:
+    def test_metadata_comparison_coerces_numbers(self):
+        matches = compile_filter({"clauses": [{"property": "tokens", "operator": "gte", "value": 7}]})
+        assert [matches(e) for e in EVENTS] == [True, False, True, False]
+
+    def test_like_and_nested_or(self):
+        matches = compile_filter({
+            "conjunction": "or",
+            "clauses": [
+                {"property": "name", "operator": "eq", "value": "signup"},
+                {"conjunction": "and", "clauses": [{"property": "metadata.model", "operator": "like", "value": "small"}]},
+            ],
+        })
+        assert [matches(e) for e in EVENTS] == [False, True, False, True]
+
+    def test_missing_property_never_matches(self):
+        matches = compile_filter({"clauses": [{"property": "model", "operator": "ne", "value": "x"}]})
+        assert not matches(EVENTS[3])
+
+    def test_unknown_operator(self):
+        with pytest.raises(CLIError, match="Unknown filter operator"):
+            compile_filter({"clauses": [{"property": "name", "operator": "in", "value": "x"}]})
+
+
+class TestBuckets:
+    def test_week_starts_monday(self):
+        assert truncate(datetime.fromisoformat("2024-01-03T12:00:00Z"), "week").isoformat() == "2024-01-01T00:00:00+00:00"
+
+    def test_month_rolls_over_year(self):
+        december = truncate(datetime.fromisoformat("2024-12-15T00:00:00Z"), "month")
+        assert next_bucket(december, "month").isoformat() == "2025-01-01T00:00:00+00:00"
+
+
+class TestEvaluate:
+    def test_count_by_day_fills_gaps(self):
+        result = evaluate(EVENTS, API_CALLS, {"func": "count"}, interval="day")
+        assert [q["quantity"] for q in result.quantities] == [2.0, 0.0, 1.0]
+        assert result.quantities[0]["timestamp"] == "2024-01-01T00:00:00+00:00"
+        assert result.total == 3.0
+        assert (result.scanned, result.matched) == (4, 3)
+
+    @pytest.mark.parametrize(("func", "quantities", "total"), [
+        ("sum", [15.0, 0.0, 7.0], 22.0),
+        ("max", [10.0, 0.0, 7.0], 10.0),
+        ("avg", [7.5, 0.0, 7.0], 22 / 3),
+        ("unique", [2.0, 0.0, 1.0], 3.0),
+    ])
+    def test_property_aggregations(self, func, quantities, total):
+        result = evaluate(EVENTS, API_CALLS, {"func": func, "property": "tokens"}, interval="day")
+        assert [q["quantity"] for q in result.quantities] == quantities
+        assert result.total == pytest.approx(total)
+
+    def test_range_limits_series(self):
+        result = evaluate(
+            EVENTS, API_CALLS, {"func": "count"}, interval="day",
+            start=datetime.fromisoformat("2024-01-02T00:00:00Z"), end=datetime.fromisoformat("2024-01-04T00:00:00Z"),
+        )
+        assert [q["quantity"] for q in result.quantities] == [0.0, 1.0, 0.0]
+        assert result.total == 1.0
+
+    def test_property_aggregation_requires_property(self):
+        with pytest.raises(CLIError, match="needs a 'property'"):
+            evaluate(EVENTS, API_CALLS, {"func": "sum"})
@@ -0,0 +1,78 @@
+"""Tests for listener metrics."""
+
+import httpx
+
+from polar_cli.metrics import Histogram, ListenerMetrics, serve_metrics
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _metrics() -> tuple[ListenerMetrics, Clock]:
+    clock = Clock()
+    metrics = ListenerMetrics(clock=clock)
+    metrics.event_received("order.created", "org-a")
+    metrics.event_received("order.created", "org-a")
+    metrics.forward_finished("http://local", "order.created", True, 0.02)
+    metrics.forward_finished("http://local", "order.created", False, 1.0)
+    metrics.forward_dropped("http://local")
+    return metrics, clock
+
+
+class TestHistogram:
+    def test_quantile_is_bucket_upper_bound(self):
+        histogram = Histogram()
+        for value in (0.001, 0.002, 0.03, 0.2):
+            histogram.observe(value)
+        assert histogram.quantile(0.5) == 0.005
+        assert histogram.quantile(0.99) == 0.25
+        assert Histogram().quantile(0.5) is None
+
+
+class TestListenerMetrics:
+    def test_render(self):
+        metrics, _ = _metrics()
+        metrics.queue_depths = lambda: {"http://local": 3}
+        text = metrics.render()
+        assert 'polar_listen_events_received_total{type="order.created",source="org-a"} 2' in text
+        assert 'polar_listen_forwards_total{target="http://local",type="order.created",outcome="failed"} 1' in text
+        assert 'polar_listen_forward_dropped_total{target="http://local"} 1' in text
+        labels = 'target="http://local",type="order.created"'
+        assert f'polar_listen_forward_latency_seconds_bucket{{{labels},le="0.01"}} 0' in text
+        assert f'polar_listen_forward_latency_seconds_bucket{{{labels},le="0.025"}} 1' in text
+        assert f'polar_listen_forward_latency_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+        assert f"polar_listen_forward_latency_seconds_count{{{labels}}} 1" in text
+        assert 'polar_listen_forward_queue_depth{target="http://local"} 3' in text
+        assert "# TYPE polar_listen_forward_latency_seconds histogram" in text
+
+    def test_escapes_label_values(self):
+        metrics = ListenerMetrics()
+        metrics.event_received('a"b\\c')
+        assert 'type="a\\"b\\\\c"' in metrics.render()
+
+    def test_summary_rates_since_last(self):
+        metrics, clock = _metrics()
+        clock.now = 2.0
+        assert metrics.summary() == (
+            "received 2 (1.0/s), forwarded 1 (0.5/s), failed 1, dropped 1, latency avg 20ms p99 ≤25ms"
+        )
+        clock.now = 4.0
+        assert metrics.summary().startswith("received 2 (0.0/s)")
+
+    def test_serves_metrics(self):
+        metrics, _ = _metrics()
+        server = serve_metrics(metrics, 0)
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            resp = httpx.get(f"{base}/metrics")
+            assert resp.status_code == 200
+            assert "polar_listen_events_received_total" in resp.text
+            assert httpx.get(f"{base}/other").status_code == 404
+        finally:
+            server.shutdown()
+            server.server_close()
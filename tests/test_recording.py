@@ -0,0 +1,69 @@
+"""Tests for webhook recording and paced replay."""
+
+from polar_cli.recording import EventRecorder, Pacing, paced, percentiles, read_recording
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _replay(events, pacing):
+    clock = FakeClock()
+    times = [clock.now for _ in paced(events, pacing, clock=clock, sleep=clock.sleep)]
+    return times
+
+
+class TestRecording:
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "rec.ndjson"
+        with EventRecorder(path) as recorder:
+            recorder.write({"key": "webhook.created", "payload": {"a": 1}})
+            recorder.write({"key": "other"})
+        assert recorder.count == 2
+        events = list(read_recording(path))
+        assert [e["key"] for e in events] == ["webhook.created", "other"]
+        assert "recorded_at" in events[0]
+
+    def test_appends_and_filters_keys_gzip(self, tmp_path):
+        path = tmp_path / "rec.ndjson.gz"
+        for key in ("a", "b"):
+            with EventRecorder(path) as recorder:
+                recorder.write({"key": key})
+        assert [e["key"] for e in read_recording(path, keys={"b"})] == ["b"]
+
+    def test_skips_torn_lines(self, tmp_path):
+        path = tmp_path / "rec.ndjson"
+        path.write_text('{"key": "a"}\n\n{"key": "b"')
+        assert [e["key"] for e in read_recording(path)] == ["a"]
+
+
+class TestPaced:
+    EVENTS = [{"recorded_at": 100.0}, {"recorded_at": 100.5}, {"recorded_at": 102.0}]
+
+    def test_original_timing(self):
+        assert _replay(self.EVENTS, Pacing()) == [0.0, 0.5, 2.0]
+
+    def test_speed_up(self):
+        assert _replay(self.EVENTS, Pacing(speed=2.0)) == [0.0, 0.25, 1.0]
+
+    def test_fixed_rate(self):
+        assert _replay(self.EVENTS, Pacing(rate=10)) == [0.0, 0.1, 0.2]
+
+    def test_unthrottled_never_sleeps(self):
+        assert _replay(self.EVENTS, Pacing(unthrottled=True)) == [0.0, 0.0, 0.0]
+
+
+def test_percentiles():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentiles(samples) == {"p50": 50.0, "p90": 90.0, "p99": 99.0, "max": 100.0}
+    assert percentiles([]) == {}
+    assert percentiles([3.0])["p99"] == 3.0
@@ -0,0 +1,62 @@
+"""Tests for the event ingestion spool."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from polar_cli.config import Environment
+from polar_cli.errors import CLIError
+from polar_cli.ingest import flush_spool, ingest_batches
+from polar_cli.spool import Spool, event_spool
+
+
+class TestSpool:
+    def test_write_read_ack(self, tmp_path):
+        spool = Spool(tmp_path)
+        first = spool.write([{"name": "a"}, {"name": "b"}])
+        second = spool.write([{"name": "c"}])
+        assert spool.segments() == [first, second]
+        assert Spool.read(first) == [{"name": "a"}, {"name": "b"}]
+        Spool.ack(first)
+        assert spool.segments() == [second]
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_writers_share_the_lock_and_flush_excludes_them(self, tmp_path):
+        spool = Spool(tmp_path)
+        with spool.lock(exclusive=False), spool.lock(exclusive=False):
+            with pytest.raises(CLIError, match="in use by an ingest"):
+                with spool.lock(exclusive=True):
+                    pass
+        with spool.lock(exclusive=True):
+            with pytest.raises(CLIError, match="in use by a flush"):
+                with spool.lock(exclusive=False):
+                    pass
+
+    def test_event_spool_is_per_organization(self):
+        production = Environment.PRODUCTION
+        assert event_spool(production, "org-1").directory != event_spool(production, "org-2").directory
+
+
+class TestSpooledIngest:
+    def test_acknowledged_batches_are_removed(self, tmp_path):
+        spool = Spool(tmp_path)
+        client = MagicMock()
+        stats = ingest_batches(client, [[{"name": "a"}], [{"name": "b"}]], spool=spool)
+        assert stats.events == 2
+        assert spool.segments() == []
+
+    def test_failed_batches_stay_and_flush_replays_them(self, tmp_path):
+        spool = Spool(tmp_path)
+        client = MagicMock()
+        client.events.ingest.side_effect = [None, ValueError("rejected")]
+        stats = ingest_batches(client, [[{"name": "a"}], [{"name": "b"}]], concurrency=1, spool=spool)
+        assert stats.failed_events == 1
+        assert [Spool.read(s) for s in spool.segments()] == [[{"name": "b"}]]
+
+        client.events.ingest.side_effect = None
+        stats = flush_spool(client, spool)
+        assert stats.events == 1
+        assert spool.segments() == []
+        client.events.ingest.assert_called_with(request={"events": [{"name": "b"}]})
@@ -0,0 +1,102 @@
+"""Tests for the reconnecting SSE stream."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from polar_cli.errors import CLIError
+from polar_cli.sse import MultiStream, ReconnectingStream
+
+
+def _sse(body: str) -> httpx.Response:
+    return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body.encode())
+
+
+class Server:
+    """Serves a scripted response per connection and records request headers."""
+
+    def __init__(self, *responses) -> None:
+        self.responses = list(responses)
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _stream(server: Server, **kwargs) -> ReconnectingStream:
+    client = httpx.Client(transport=httpx.MockTransport(server))
+    return ReconnectingStream("https://api.polar.sh/v1/cli/listen/org", {}, http_client=client, sleep=lambda s: None, **kwargs)
+
+
+def _take(stream: ReconnectingStream, count: int) -> list[str]:
+    data = []
+    for sse in stream:
+        data.append(sse.data)
+        if len(data) == count:
+            break
+    return data
+
+
+class TestReconnectingStream:
+    def test_reconnects_with_last_event_id(self):
+        server = Server(
+            httpx.Response(503),
+            _sse("id: 1\ndata: a\n\nid: 2\ndata: b\n\n"),
+            httpx.ReadTimeout("idle"),
+            _sse("id: 3\ndata: c\n\n"),
+        )
+        stream = _stream(server)
+        assert _take(stream, 3) == ["a", "b", "c"]
+        assert "last-event-id" not in server.requests[1].headers
+        assert server.requests[3].headers["last-event-id"] == "2"
+        assert stream.stats.reconnects == 3
+        assert stream.stats.gaps == 0
+
+    def test_counts_gaps_without_event_ids(self):
+        server = Server(_sse("data: a\n\n"), _sse("data: b\n\n"))
+        stream = _stream(server)
+        assert _take(stream, 2) == ["a", "b"]
+        assert stream.stats.gaps == 1
+
+    def test_auth_failure_is_fatal(self):
+        stream = _stream(Server(httpx.Response(401)))
+        with pytest.raises(CLIError, match="HTTP 401"):
+            _take(stream, 1)
+
+    def test_no_reconnect_ends_with_stream(self):
+        stream = _stream(Server(_sse("data: a\n\n")), reconnect=False)
+        assert list(sse.data for sse in stream) == ["a"]
+
+    def test_no_reconnect_reports_bad_status(self):
+        stream = _stream(Server(httpx.Response(502)), reconnect=False)
+        with pytest.raises(CLIError, match="HTTP 502"):
+            _take(stream, 1)
+
+
+class TestMultiStream:
+    def test_merges_tagged_events(self):
+        streams = {
+            "a": _stream(Server(_sse("data: a1\n\ndata: a2\n\n")), reconnect=False),
+            "b": _stream(Server(_sse("data: b1\n\n")), reconnect=False),
+        }
+        events = [(tag, sse.data) for tag, sse in MultiStream(streams)]
+        assert sorted(events) == [("a", "a1"), ("a", "a2"), ("b", "b1")]
+        # Per-stream order is kept
+        assert [data for tag, data in events if tag == "a"] == ["a1", "a2"]
+
+    def test_raises_fatal_error_from_any_stream(self):
+        streams = {
+            "ok": _stream(Server(_sse("data: x\n\n")), reconnect=False),
+            "bad": _stream(Server(httpx.Response(401))),
+        }
+        with pytest.raises(CLIError, match="HTTP 401"):
+            list(MultiStream(streams))
+
+    def test_single_stream_is_read_inline(self):
+        streams = {"only": _stream(Server(_sse("data: x\n\n")), reconnect=False)}
+        assert [(tag, sse.data) for tag, sse in MultiStream(streams)] == [("only", "x")]
@@ -0,0 +1,72 @@
+"""Tests for incremental event polling."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+from polar_cli.tail import OVERLAP, EventPoller, SeenIds
+
+T0 = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _event(i: int) -> SimpleNamespace:
+    return SimpleNamespace(id=f"evt-{i}", timestamp=T0 + timedelta(seconds=i))
+
+
+class FakeFeed:
+    """Newest-first pages over a growing list of events."""
+
+    def __init__(self, page_size: int = 3) -> None:
+        self.events: list[SimpleNamespace] = []
+        self.page_size = page_size
+        self.requests: list[tuple[datetime | None, int]] = []
+
+    def __call__(self, since: datetime | None, page: int) -> list[SimpleNamespace]:
+        self.requests.append((since, page))
+        matching = [e for e in reversed(self.events) if since is None or e.timestamp >= since]
+        return matching[(page - 1) * self.page_size: page * self.page_size]
+
+
+class TestSeenIds:
+    def test_evicts_least_recently_used(self):
+        seen = SeenIds(capacity=2)
+        seen.add("a")
+        seen.add("b")
+        assert "a" in seen  # touch "a" so "b" is the oldest
+        seen.add("c")
+        assert "b" not in seen and "a" in seen and "c" in seen
+
+
+class TestEventPoller:
+    def test_first_poll_returns_latest_page_oldest_first(self):
+        feed = FakeFeed()
+        feed.events = [_event(i) for i in range(5)]
+        poller = EventPoller(feed)
+        assert [e.id for e in poller.poll()] == ["evt-2", "evt-3", "evt-4"]
+        assert poller.high_water == T0 + timedelta(seconds=4)
+
+    def test_skips_seen_and_catches_up_on_bursts(self):
+        feed = FakeFeed()
+        feed.events = [_event(i) for i in range(3)]
+        poller = EventPoller(feed)
+        poller.poll()
+        assert poller.poll() == []
+        feed.events += [_event(i) for i in range(3, 10)]
+        assert [e.id for e in poller.poll()] == [f"evt-{i}" for i in range(3, 10)]
+        assert feed.requests[-1][0] == T0 + timedelta(seconds=2) - OVERLAP
+
+    def test_interval_backs_off_when_idle_and_resets(self):
+        feed = FakeFeed()
+        sleeps: list[float] = []
+        poller = EventPoller(feed, min_interval=1, max_interval=3, sleep=sleeps.append)
+        stream = poller.follow()
+        feed.events = [_event(0)]
+        assert next(stream).id == "evt-0"
+        feed.events.append(_event(1))
+        assert next(stream).id == "evt-1"
+        # Idle polls between evt-1 and evt-2 back off, then the interval resets
+        poller._fetch_page = lambda since, page: [] if len(sleeps) < 5 else feed(since, page)
+        feed.events.append(_event(2))
+        assert next(stream).id == "evt-2"
+        assert sleeps[:5] == [1, 1, 1.5, 2.25, 3]
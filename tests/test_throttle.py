@@ -0,0 +1,61 @@
+"""Tests for listener output throttling."""
+
+from polar_cli.throttle import DisplayMode, DisplayThrottle
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _feed(throttle: DisplayThrottle, clock: FakeClock, count: int, interval: float):
+    decisions = []
+    for _ in range(count):
+        decisions.append(throttle.decide())
+        clock.now += interval
+    return decisions
+
+
+class TestDisplayThrottle:
+    def test_slow_stream_is_full_and_unthrottled(self):
+        clock = FakeClock()
+        decisions = _feed(DisplayThrottle(clock=clock), clock, 5, 1.0)
+        assert [d.style for d in decisions] == ["full"] * 5
+
+    def test_forced_compact(self):
+        clock = FakeClock()
+        decisions = _feed(DisplayThrottle(DisplayMode.COMPACT, clock=clock), clock, 3, 1.0)
+        assert {d.style for d in decisions} == {"compact"}
+        assert not any(d.switched for d in decisions)
+
+    def test_full_mode_never_switches(self):
+        clock = FakeClock()
+        decisions = _feed(DisplayThrottle(DisplayMode.FULL, max_lines=0, clock=clock), clock, 100, 0.001)
+        assert {d.style for d in decisions} == {"full"}
+
+    def test_auto_switches_to_compact_and_back(self):
+        clock = FakeClock()
+        throttle = DisplayThrottle(compact_above=10, max_lines=0, clock=clock)
+        burst = _feed(throttle, clock, 30, 0.01)
+        assert burst[0].style == "full"
+        assert burst[-1].style == "compact"
+        assert sum(d.switched for d in burst) == 1
+        clock.now += 5
+        [after] = _feed(throttle, clock, 1, 0)
+        assert after.style == "full"
+        assert after.switched
+
+    def test_rate_limit_coalesces(self):
+        clock = FakeClock()
+        throttle = DisplayThrottle(max_lines=5, clock=clock)
+        burst = _feed(throttle, clock, 20, 0.0)
+        shown = [d for d in burst if d.style]
+        assert len(shown) == 5
+        assert throttle.suppressed == 15
+        clock.now += 1
+        [next_one] = _feed(throttle, clock, 1, 0)
+        assert next_one.coalesced == 15
+        assert throttle.drain() == 0
@@ -0,0 +1,243 @@
+"""Tests for the multipart upload helpers."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from polar_cli import upload
+from polar_cli.errors import CLIError
+from polar_cli.upload import (
+    MAX_PART_SIZE,
+    MAX_PARTS,
+    MIN_PART_SIZE,
+    MappedFile,
+    MiB,
+    PartUploadError,
+    ThroughputEstimate,
+    UploadCheckpoint,
+    UploadState,
+    choose_part_size,
+    min_part_size,
+    part_checksums,
+    plan_parts,
+    put_part,
+    sample_fingerprint,
+    upload_parts,
+)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 100)  # 25,600 bytes
+    return path
+
+
+def recording_client(received: dict[str, bytes], status: int = 200) -> httpx.Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        received[request.url.path] = request.read()
+        if status >= 400:
+            return httpx.Response(status, text="nope")
+        return httpx.Response(status, headers={"ETag": f'"etag{request.url.path}"'})
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+class TestPlanParts:
+    def test_splits_with_short_last_part(self):
+        parts = plan_parts(25, 10)
+        assert [(p.number, p.start, p.end) for p in parts] == [(1, 0, 10), (2, 10, 20), (3, 20, 25)]
+        assert parts[-1].size == 5
+
+    def test_exact_multiple(self):
+        assert [p.size for p in plan_parts(20, 10)] == [10, 10]
+
+
+class TestChoosePartSize:
+    def test_small_files_use_the_minimum(self):
+        assert choose_part_size(20 * MiB) == MIN_PART_SIZE
+
+    def test_default_throughput_target(self):
+        # 4 MiB/s for 8 s, below the 1 GiB / 16 spread cap
+        assert choose_part_size(1024 * MiB, concurrency=8) == 32 * MiB
+
+    def test_fast_links_are_capped_so_every_connection_gets_parts(self):
+        assert choose_part_size(1024 * MiB, throughput=100 * MiB, concurrency=8) == 64 * MiB
+
+    def test_respects_part_count_limit(self):
+        size = 200 * 1024 * MiB
+        part_size = choose_part_size(size, throughput=MiB // 10)
+        assert part_size == min_part_size(size) > MIN_PART_SIZE
+        assert len(plan_parts(size, part_size)) <= MAX_PARTS
+
+    def test_never_exceeds_maximum(self):
+        assert choose_part_size(4 * 1024 * 1024 * MiB, throughput=1e12) == MAX_PART_SIZE
+
+
+class TestThroughputEstimate:
+    def test_persists_smoothed_per_connection_rate(self):
+        estimate = ThroughputEstimate()
+        assert estimate.value is None
+        estimate.observe(800 * MiB, 10.0, connections=8)
+        assert ThroughputEstimate().value == pytest.approx(10 * MiB)
+        estimate.observe(800 * MiB, 10.0, connections=4)
+        assert ThroughputEstimate().value == pytest.approx(15 * MiB)
+
+    def test_ignores_small_uploads(self):
+        estimate = ThroughputEstimate()
+        estimate.observe(MiB, 0.1, connections=1)
+        assert ThroughputEstimate().value is None
+
+
+class TestMappedFile:
+    def test_rejects_empty_file(self, tmp_path):
+        path = tmp_path / "empty"
+        path.touch()
+        with pytest.raises(CLIError):
+            MappedFile(path)
+
+    def test_checksums_match_hashlib(self, data_file):
+        content = data_file.read_bytes()
+        parts = plan_parts(len(content), 10_000)
+        with MappedFile(data_file) as mapped:
+            checksums = part_checksums(mapped, parts, concurrency=2)
+        for part in parts:
+            digest = hashlib.sha256(content[part.start:part.end]).digest()
+            assert checksums[part.number] == base64.b64encode(digest).decode()
+
+
+class TestPutPart:
+    def test_streams_the_slice_and_returns_etag(self, data_file, monkeypatch):
+        monkeypatch.setattr(upload, "STREAM_CHUNK", 4096)
+        content = data_file.read_bytes()
+        part = plan_parts(len(content), 10_000)[1]
+        received: dict[str, bytes] = {}
+        progress: list[int] = []
+        with MappedFile(data_file) as mapped, recording_client(received) as http:
+            etag = put_part(http, mapped, part, "https://s3.test/p2", on_bytes=progress.append)
+        assert etag == '"etag/p2"'
+        assert received["/p2"] == content[10_000:20_000]
+        assert sum(progress) == part.size
+
+    def test_error_status_raises_and_rolls_back_progress(self, data_file):
+        part = plan_parts(data_file.stat().st_size, 10_000)[0]
+        progress: list[int] = []
+        with MappedFile(data_file) as mapped, recording_client({}, status=403) as http:
+            with pytest.raises(PartUploadError) as exc:
+                put_part(http, mapped, part, "https://s3.test/p1", on_bytes=progress.append)
+        assert exc.value.status_code == 403
+        assert sum(progress) == 0
+
+
+class TestUploadParts:
+    def test_completes_every_part(self, data_file):
+        content = data_file.read_bytes()
+        parts = plan_parts(len(content), 10_000)
+        presigned = [
+            SimpleNamespace(number=p.number, chunk_start=p.start, chunk_end=p.end, url=f"https://s3.test/{p.number}", headers={})
+            for p in parts
+        ]
+        received: dict[str, bytes] = {}
+        with MappedFile(data_file) as mapped, recording_client(received) as http:
+            checksums = part_checksums(mapped, parts)
+            completed = upload_parts(http, mapped, presigned, checksums, concurrency=3)
+        assert [c["number"] for c in completed] == [1, 2, 3]
+        assert completed[0]["checksum_etag"] == '"etag/1"'
+        assert completed[2]["checksum_sha256_base64"] == checksums[3]
+        assert b"".join(received[f"/{n}"] for n in (1, 2, 3)) == content
+
+    def test_retries_server_errors(self, data_file, mocker):
+        mocker.patch("polar_cli.bulk.time.sleep")
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            request.read()
+            calls.append(request.url.path)
+            if len(calls) == 1:
+                return httpx.Response(503)
+            return httpx.Response(200, headers={"ETag": '"ok"'})
+
+        presigned = [SimpleNamespace(number=1, chunk_start=0, chunk_end=100, url="https://s3.test/1", headers={})]
+        with MappedFile(data_file) as mapped, httpx.Client(transport=httpx.MockTransport(handler)) as http:
+            completed = upload_parts(http, mapped, presigned, {1: "sum"})
+        assert calls == ["/1", "/1"]
+        assert completed == [{"number": 1, "checksum_etag": '"ok"', "checksum_sha256_base64": "sum"}]
+
+
+class TestSampleFingerprint:
+    def fingerprint(self, path):
+        with MappedFile(path) as mapped:
+            return sample_fingerprint(mapped)
+
+    def test_stable_for_same_content(self, data_file, tmp_path):
+        copy = tmp_path / "copy.bin"
+        copy.write_bytes(data_file.read_bytes())
+        assert self.fingerprint(data_file) == self.fingerprint(copy)
+
+    def test_changes_with_sampled_content_and_size(self, data_file, monkeypatch):
+        monkeypatch.setattr(upload, "FINGERPRINT_WINDOW", 1024)
+        original = self.fingerprint(data_file)
+        content = bytearray(data_file.read_bytes())
+        content[-1] ^= 0xFF
+        data_file.write_bytes(content)
+        assert self.fingerprint(data_file) != original
+        data_file.write_bytes(content + b"x")
+        assert self.fingerprint(data_file) != original
+
+
+class TestUploadCheckpoint:
+    def state(self) -> UploadState:
+        return UploadState(
+            fingerprint="fp",
+            size=30,
+            file_id="f-1",
+            upload_id="up-1",
+            upload_path="org/f-1",
+            parts=[
+                {"number": n, "chunk_start": s, "chunk_end": s + 10, "url": f"https://s3.test/{n}", "headers": {}}
+                for n, s in ((1, 0), (2, 10), (3, 20))
+            ],
+            checksums={"1": "a", "2": "b", "3": "c"},
+        )
+
+    def test_records_parts_and_reloads(self, data_file):
+        checkpoint = UploadCheckpoint(data_file)
+        assert checkpoint.state is None
+        checkpoint.state = self.state()
+        checkpoint.save()
+        written = checkpoint.path.read_text()
+        checkpoint.record(2, '"e2"')
+
+        # Parts go to the journal; the state file is not rewritten
+        assert checkpoint.path.read_text() == written
+        reloaded = UploadCheckpoint(data_file).state
+        assert reloaded.etags == {"2": '"e2"'}
+        assert [p.number for p in reloaded.pending()] == [1, 3]
+        assert reloaded.bytes_done() == 10
+
+    def test_ignores_torn_journal_line(self, data_file):
+        checkpoint = UploadCheckpoint(data_file)
+        checkpoint.state = self.state()
+        checkpoint.save()
+        checkpoint.record(1, '"e1"')
+        with open(checkpoint.journal, "a") as f:
+            f.write('{"number": 3, "et')
+        assert UploadCheckpoint(data_file).state.etags == {"1": '"e1"'}
+
+    def test_completed_parts_and_delete(self, data_file):
+        checkpoint = UploadCheckpoint(data_file)
+        checkpoint.state = self.state()
+        checkpoint.save()
+        for number in (1, 2, 3):
+            checkpoint.record(number, f'"e{number}"')
+        assert checkpoint.state.completed_parts()[1] == {
+            "number": 2, "checksum_etag": '"e2"', "checksum_sha256_base64": "b",
+        }
+        checkpoint.delete()
+        assert UploadCheckpoint(data_file).state is None
+        assert not checkpoint.journal.exists()
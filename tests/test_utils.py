@@ -9,7 +9,9 @@ import typer
 
 from polar_cli.config import Environment, OutputFormat
 from polar_cli.context import CliContext
-from polar_cli.utils import get_output_format, resolve_org_id
+from polar_cli.errors import CLIError
+from polar_cli.id_index import IdIndex
+from polar_cli.utils import get_output_format, resolve_id, resolve_org_id
 
 
 def _make_ctx(
@@ -62,3 +64,26 @@ class TestGetOutputFormat:
     def test_yaml(self):
         ctx = _make_ctx(output=OutputFormat.YAML)
         assert get_output_format(ctx) == OutputFormat.YAML
+
+
+class TestResolveId:
+    FULL = "5c1e8f2a-1111-4000-8000-000000000001"
+    OTHER = "5c1e8f2a-2222-4000-8000-000000000002"
+
+    def test_full_uuid_passes_through(self):
+        assert resolve_id(self.FULL) == self.FULL
+
+    def test_unique_prefix_expands(self, tmp_id_index):
+        IdIndex(tmp_id_index).add([self.FULL])
+        assert resolve_id("5c1e8") == self.FULL
+
+    def test_unknown_prefix_passes_through(self):
+        assert resolve_id("abcd12") == "abcd12"
+
+    def test_non_prefix_passes_through(self):
+        assert resolve_id("cust-1") == "cust-1"
+
+    def test_ambiguous_prefix_raises(self, tmp_id_index):
+        IdIndex(tmp_id_index).add([self.FULL, self.OTHER])
+        with pytest.raises(CLIError, match="ambiguous"):
+            resolve_id("5c1e8f2a")